@@ -1,21 +1,27 @@
 """Authentication with Magic Links and Password"""
+import asyncio
+import logging
 import secrets
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy import select
+from sqlalchemy import select, update, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
-from passlib.context import CryptContext
+from sqlalchemy.orm import make_transient_to_detached
 import resend
 
 from config import get_settings
-from database import get_db, User, MagicLink
+from database import get_db, AsyncSessionLocal, User, MagicLink
+from metrics import record_cache
+from passwords import password_hasher
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 security = HTTPBearer()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # Configure Resend
 resend.api_key = settings.resend_api_key
@@ -32,16 +38,145 @@ def create_jwt_token(email: str) -> str:
     return jwt.encode(payload, settings.jwt_secret, algorithm="HS256")
 
 
-async def verify_jwt_token(token: str) -> Optional[str]:
-    """Verify JWT token and return email"""
+def _decode_jwt(token: str) -> Optional[dict]:
+    """Verified JWT payload (None if invalid, expired or without subject)"""
     try:
         payload = jwt.decode(token, settings.jwt_secret, algorithms=["HS256"])
-        email: str = payload.get("sub")
-        if email is None:
-            return None
-        return email
     except JWTError:
         return None
+    return payload if payload.get("sub") is not None else None
+
+
+async def verify_jwt_token(token: str) -> Optional[str]:
+    """Verify JWT token and return email"""
+    payload = _decode_jwt(token)
+    return payload["sub"] if payload else None
+
+
+class UserCache:
+    """Verified JWT → User for a few seconds, so authenticated requests skip the users SELECT
+
+    Per process and only touched from the event loop (no lock). Entries are detached
+    snapshots; get_current_user merges them into the request session without a query.
+    A user deleted in another worker stays valid here for at most `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+
+    def get(self, token: str) -> Optional[User]:
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[token]
+            return None
+        return user
+
+    def put(self, token: str, user: User, token_expires: float):
+        """Cache a detached copy of user (never longer than the JWT itself is valid)"""
+        ttl = min(self.ttl, token_expires - time.time())
+        if ttl <= 0:
+            return
+
+        snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+        make_transient_to_detached(snapshot)
+        self._entries[token] = (time.monotonic() + ttl, snapshot)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def forget_user(self, user_id: int):
+        """Drop all tokens of a user (account deleted)"""
+        for token in [t for t, (_, user) in self._entries.items() if user.id == user_id]:
+            del self._entries[token]
+
+
+class LastLoginTracker:
+    """Coalesces last_login writes: at most one per user and interval, flushed in background
+
+    get_current_user only records the timestamp in memory; the flush task writes all
+    pending users in one UPDATE every `flush_every` seconds (and on shutdown).
+    """
+
+    def __init__(self, interval: float, flush_every: float = 30.0):
+        self.interval = interval
+        self.flush_every = flush_every
+        self._recorded: Dict[int, float] = {}  # user_id -> monotonic time of the last recorded login
+        self._pending: Dict[int, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def touch(self, user_id: int):
+        now = time.monotonic()
+        last = self._recorded.get(user_id)
+        if last is not None and now - last < self.interval:
+            return
+        self._recorded[user_id] = now
+        self._pending[user_id] = datetime.utcnow()
+
+    def forget(self, user_id: int):
+        self._recorded.pop(user_id, None)
+        self._pending.pop(user_id, None)
+
+    async def flush(self) -> int:
+        """Write pending last_login values, returns the number of users written"""
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    update(User.__table__)
+                    .where(User.__table__.c.id == bindparam("user_id"))
+                    .values(last_login=bindparam("login_at")),
+                    [{"user_id": user_id, "login_at": login_at} for user_id, login_at in pending.items()]
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning("⚠️ Writing last_login for %d users failed, retrying later: %s", len(pending), e)
+            for user_id, login_at in pending.items():
+                self._pending.setdefault(user_id, login_at)
+            return 0
+
+        now = time.monotonic()
+        self._recorded = {user_id: t for user_id, t in self._recorded.items() if now - t < self.interval}
+        logger.debug("🕒 last_login written for %d users", len(pending))
+        return len(pending)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_every)
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the flush task and write what is left"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+# Global instances
+user_cache = UserCache(ttl=settings.auth_cache_seconds)
+last_login_tracker = LastLoginTracker(interval=settings.last_login_interval_minutes * 60)
+
+
+def forget_user(user_id: int):
+    """Invalidate cached tokens and pending last_login of a deleted user"""
+    user_cache.forget_user(user_id)
+    last_login_tracker.forget(user_id)
 
 
 async def get_current_user(
@@ -50,9 +185,18 @@ async def get_current_user(
 ) -> User:
     """Get current authenticated user from JWT token"""
     token = credentials.credentials
-    email = await verify_jwt_token(token)
+    cached = user_cache.get(token)
+    record_cache("auth_user", cached is not None)
+
+    if cached is not None:
+        # Attach to this request's session without a SELECT (db.delete(user) etc. keep working)
+        user = await db.merge(cached, load=False)
+        last_login_tracker.touch(user.id)
+        return user
 
-    if email is None:
+    payload = _decode_jwt(token)
+
+    if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
@@ -60,7 +204,7 @@ async def get_current_user(
         )
 
     # Get or create user
-    result = await db.execute(select(User).where(User.email == email))
+    result = await db.execute(select(User).where(User.email == payload["sub"]))
     user = result.scalar_one_or_none()
 
     if user is None:
@@ -69,9 +213,11 @@ async def get_current_user(
             detail="User not found"
         )
 
-    # Update last login
-    user.last_login = datetime.utcnow()
-    await db.commit()
+    if user_cache.ttl > 0:
+        user_cache.put(token, user, token_expires=payload.get("exp", 0))
+
+    # Update last login (coalesced, written by the background flush)
+    last_login_tracker.touch(user.id)
 
     return user
 
@@ -119,7 +265,7 @@ async def create_magic_link(email: str, db: AsyncSession) -> str:
             """
         })
     except Exception as e:
-        print(f"Error sending email: {e}")
+        logger.error("❌ Error sending email: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to send email"
@@ -172,14 +318,15 @@ async def verify_magic_link(token: str, db: AsyncSession) -> str:
     return jwt_token
 
 
-def hash_password(password: str) -> str:
-    """Hash password using bcrypt"""
-    return pwd_context.hash(password)
+async def hash_password(password: str) -> str:
+    """Hash password using bcrypt (in the password thread pool)"""
+    return await password_hasher.hash(password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify password against hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify password against hash (in the password thread pool)"""
+    valid, _ = await password_hasher.verify_and_update(plain_password, hashed_password)
+    return valid
 
 
 async def authenticate_user(email: str, password: str, db: AsyncSession) -> Optional[User]:
@@ -190,9 +337,17 @@ async def authenticate_user(email: str, password: str, db: AsyncSession) -> Opti
     if user is None or user.password_hash is None:
         return None
 
-    if not verify_password(password, user.password_hash):
+    # End the read transaction - bcrypt can queue for seconds in the password pool under load
+    await db.commit()
+    valid, new_hash = await password_hasher.verify_and_update(password, user.password_hash)
+    if not valid:
         return None
 
+    if new_hash is not None:
+        # Stored with other bcrypt rounds than BCRYPT_ROUNDS - upgrade transparently
+        user.password_hash = new_hash
+        logger.info("🔐 Rehashed password of user %s with %d rounds", user.id, password_hasher.rounds)
+
     # Update last login
     user.last_login = datetime.utcnow()
     await db.commit()
@@ -213,7 +368,8 @@ async def register_user(email: str, password: str, db: AsyncSession) -> User:
         )
 
     # Create new user (auto-verified for now, email verification can be added later)
-    hashed_pw = hash_password(password)
+    await db.commit()  # Don't hold a pool connection while hashing
+    hashed_pw = await hash_password(password)
     user = User(
         email=email,
         password_hash=hashed_pw,
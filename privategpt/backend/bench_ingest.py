@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Benchmark document ingestion: pages/sec, chunks/sec, embedding vs. vector write time, peak RSS
+
+Erzeugt synthetische mehrseitige PDFs (deutscher Fließtext, deterministisch per Seed),
+lädt sie durch rag.DocumentProcessor und/oder rag_llamaindex.DocumentProcessor in ein
+temporäres Chroma-Verzeichnis und misst pro Dokument:
+- extract:       PDF → Text (INGEST_SECONDS stage="extract")
+- embedding:     Zeit im Embedding-Modell
+- vector_write:  embed_store minus embedding (Chroma-Schreiben; bei LlamaIndex inkl. Chunking)
+- total, pages/s, chunks/s, Peak-RSS während des Laufs
+
+Usage:
+    python bench_ingest.py                                   # beide Engines, 10/50/200 Seiten
+    python bench_ingest.py --engine rag --pages 20 100 --runs 3
+    python bench_ingest.py --json > ingest_$(git rev-parse --short HEAD).json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from prometheus_client import REGISTRY
+
+WORDS = (
+    "Vertrag Mieter Vermieter Kündigung Frist Monat Nebenkosten Abrechnung Kaution Wohnung Zahlung "
+    "Rechnung Betrag Euro fällig Datum Vereinbarung Pflicht Recht Haftung Schaden Versicherung Gebäude "
+    "Heizung Wasser Strom Verbrauch Anpassung Erhöhung Index Jahr Quartal Bestimmung Regelung Paragraph "
+    "Anlage Unterschrift Parteien gilt jedoch sowie gemäß innerhalb spätestens schriftlich unverzüglich "
+    "der die das und oder nicht mit für auf bei nach vom zum zur ist sind wird werden hat haben kann muss"
+).split()
+
+
+def _pdf_text(text: str) -> bytes:
+    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return escaped.encode("cp1252", errors="replace")
+
+
+def make_pdf(path: Path, pages: int, words_per_page: int, seed: int = 42):
+    """Minimal PDF 1.4 with Helvetica text pages (no PDF library needed)"""
+    rng = random.Random(seed)
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # Pages, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+
+    for page in range(pages):
+        words = [rng.choice(WORDS) for _ in range(words_per_page)]
+        lines, line = [], f"Seite {page + 1}."
+        for word in words:
+            if len(line) + len(word) > 90:
+                lines.append(line)
+                line = word.capitalize() if line.endswith(".") else word
+            else:
+                line += " " + word
+            if rng.random() < 0.08:
+                line += "."
+        lines.append(line + ".")
+
+        stream = b"BT /F1 10 Tf 12 TL 50 800 Td " + b" ".join(b"(" + _pdf_text(l) + b") ' " for l in lines) + b"ET"
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % pages
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+class PeakRSS:
+    """Highest resident set size while the block runs (polls /proc, falls back to ru_maxrss)"""
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+
+    @staticmethod
+    def _rss_mb() -> float:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+        except (FileNotFoundError, ValueError):
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    def _poll(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, self._rss_mb())
+
+    def __enter__(self):
+        self.peak_mb = self._rss_mb()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = round(max(self.peak_mb, self._rss_mb()), 1)
+
+
+class _EmbeddingTimer:
+    """Wall time spent inside the embedding model"""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self.seconds += seconds
+
+
+def _stage_sum(stage: str) -> float:
+    return REGISTRY.get_sample_value("privategpt_ingest_seconds_sum", {"stage": stage}) or 0.0
+
+
+def load_engine(name: str, timer: _EmbeddingTimer):
+    """DocumentProcessor of one engine, with the embedding model timed and warmed up"""
+    if name == "rag":
+        import rag
+        from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+
+        inner = rag.embedding_function
+
+        class TimedEmbeddingFunction(EmbeddingFunction[Documents]):
+            def __call__(self, input: Documents) -> Embeddings:
+                started = time.perf_counter()
+                try:
+                    return inner(input)
+                finally:
+                    timer.add(time.perf_counter() - started)
+
+        rag.embedding_function = TimedEmbeddingFunction()
+        rag.embedding_function(["Warm-up"])
+        return rag.DocumentProcessor()
+
+    import rag_llamaindex
+    from llama_index.core import Settings
+    from llama_index.core.callbacks import CBEventType, LlamaDebugHandler
+
+    processor = rag_llamaindex.DocumentProcessor()
+    debug = LlamaDebugHandler(event_starts_to_ignore=[], event_ends_to_ignore=[])
+    Settings.embed_model.callback_manager.add_handler(debug)
+    Settings.embed_model.get_text_embedding("Warm-up")
+
+    def collect():
+        timer.add(debug.get_event_time_info(CBEventType.EMBEDDING).total_secs)
+        debug.flush_event_logs()
+
+    processor.collect_embedding_time = collect
+    debug.flush_event_logs()
+    return processor
+
+
+def run_case(engine: str, processor, timer: _EmbeddingTimer, pdf: Path, pages: int, document_id: int) -> Dict:
+    timer.seconds = 0.0
+    extract_before, embed_store_before = _stage_sum("extract"), _stage_sum("embed_store")
+
+    with PeakRSS() as rss:
+        started = time.perf_counter()
+        chunks = asyncio.run(processor.process_document(str(pdf), document_id))
+        total = time.perf_counter() - started
+
+    if hasattr(processor, "collect_embedding_time"):
+        processor.collect_embedding_time()
+    embed_store = _stage_sum("embed_store") - embed_store_before
+
+    return {
+        "engine": engine,
+        "pages": pages,
+        "bytes": pdf.stat().st_size,
+        "chunks": chunks,
+        "extract_s": round(_stage_sum("extract") - extract_before, 3),
+        "embedding_s": round(timer.seconds, 3),
+        "vector_write_s": round(max(embed_store - timer.seconds, 0.0), 3),
+        "total_s": round(total, 3),
+        "pages_per_s": round(pages / total, 2),
+        "chunks_per_s": round(chunks / total, 2),
+        "peak_rss_mb": rss.peak_mb,
+    }
+
+
+def median_of(runs: List[Dict]) -> Dict:
+    """Median per metric over repeated runs (peak RSS: maximum)"""
+    result = dict(runs[0])
+    for key in ("extract_s", "embedding_s", "vector_write_s", "total_s", "pages_per_s", "chunks_per_s"):
+        result[key] = round(statistics.median(run[key] for run in runs), 3)
+    result["peak_rss_mb"] = max(run["peak_rss_mb"] for run in runs)
+    result["runs"] = len(runs)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engine", choices=["rag", "llamaindex", "both"], default="both")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--words-per-page", type=int, default=400)
+    parser.add_argument("--runs", type=int, default=2, help="Runs per size (median is reported)")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    # Separate Chroma directory - must be set before the engines are imported (load_engine)
+    bench_dir = tempfile.mkdtemp(prefix="privategpt-bench-ingest-")
+    os.environ["CHROMA_DB_PATH"] = os.path.join(bench_dir, "chroma")
+
+    engines = ["rag", "llamaindex"] if args.engine == "both" else [args.engine]
+    pdf_dir = Path(bench_dir) / "pdfs"
+    pdf_dir.mkdir()
+    pdfs = {}
+    for pages in args.pages:
+        pdfs[pages] = pdf_dir / f"synthetic_{pages}p.pdf"
+        make_pdf(pdfs[pages], pages, args.words_per_page)
+
+    results = []
+    document_id = 900_000  # Far away from real document ids
+    for engine in engines:
+        timer = _EmbeddingTimer()
+        processor = load_engine(engine, timer)
+        for pages in args.pages:
+            runs = []
+            for _ in range(args.runs):
+                document_id += 1
+                runs.append(run_case(engine, processor, timer, pdfs[pages], pages, document_id))
+            results.append(median_of(runs))
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "words_per_page": args.words_per_page,
+        },
+        "results": results,
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Chroma: {os.environ['CHROMA_DB_PATH']}  ({args.words_per_page} words/page, median of {args.runs} runs)")
+    header = ("engine", "pages", "chunks", "extract s", "embed s", "write s", "total s", "pages/s", "chunks/s", "RSS MB")
+    print("".join(f"{h:>11}" for h in header))
+    for r in results:
+        row = (r["engine"], r["pages"], r["chunks"], r["extract_s"], r["embedding_s"], r["vector_write_s"],
+               r["total_s"], r["pages_per_s"], r["chunks_per_s"], r["peak_rss_mb"])
+        print("".join(f"{v:>11}" for v in row))
+
+
+if __name__ == "__main__":
+    main()
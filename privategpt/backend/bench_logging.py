@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark logging overhead on the chat path: print() vs queue-based logging
+
+Spielt die Log-Aufrufe einer Chat-Anfrage (main.chat + RAGEngine.query) ab - einmal
+mit den früheren print()-Zeilen, einmal mit logging über den QueueHandler - und misst
+die Zeit, die der Request-Thread dafür blockiert. stdout ist dabei ein langsamer
+Stream, der einen Log-Collector mit Backpressure simuliert (--write-latency-ms).
+
+Usage:
+    python bench_logging.py                          # 5 Dokumente, 5 Chunks je Dokument
+    python bench_logging.py --documents 20 --write-latency-ms 0.5
+    python bench_logging.py --json
+"""
+import argparse
+import io
+import json
+import logging
+import statistics
+import sys
+import time
+
+from logging_config import setup_logging, shutdown_logging
+
+QUESTION = "Wie hoch ist die Kaltmiete laut Mietvertrag und wann ist sie fällig?"
+ANSWER = "Die Kaltmiete beträgt 850 Euro und ist bis zum dritten Werktag eines Monats fällig. " * 4
+
+
+class SlowStream(io.TextIOBase):
+    """stdout replacement: every write blocks like a pipe to a busy log collector"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.lines = 0
+
+    def write(self, text: str) -> int:
+        if self.latency:
+            time.sleep(self.latency)
+        self.lines += text.count("\n")
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def chat_with_print(document_ids, chunks_per_document):
+    """Log lines of a chat request before the logging change"""
+    print(f"📊 Found {len(document_ids)} processed documents for assistant 1")
+    print(f"📋 Document IDs: {document_ids}")
+    for doc_id in document_ids:
+        print(f"   - Doc {doc_id}: vertrag_{doc_id}.pdf (processed: True)")
+    print(f"🔍 Searching in {len(document_ids)} document(s) for: {QUESTION}")
+    for doc_id in document_ids:
+        print(f"✅ Found collection: doc_{doc_id} ({chunks_per_document * 20} chunks)")
+        print(f"📄 Retrieved {chunks_per_document} chunks from doc_{doc_id}")
+    print(f"🤖 [WITH CONTEXT] Generated response ({len(ANSWER)} chars): {ANSWER[:100]}...")
+    print(f"🔍 [QUALITY] No Web-Search needed (has_docs=True, len={len(ANSWER)})")
+
+
+def chat_with_logging(document_ids, chunks_per_document):
+    """Log calls of the same request now (main.chat, rag.py, web_search.py)"""
+    main_logger = logging.getLogger("main")
+    rag_logger = logging.getLogger("rag")
+    web_logger = logging.getLogger("web_search")
+
+    main_logger.debug("📊 %d processed documents for assistant %s: %s", len(document_ids), 1, document_ids)
+    rag_logger.debug("🔍 Searching in %d document(s)", len(document_ids))
+    for doc_id in document_ids:
+        rag_logger.debug("📄 Retrieved %d chunks from %s", chunks_per_document, f"doc_{doc_id}")
+    rag_logger.debug("🤖 [WITH CONTEXT] Generated response (%d chars)", len(ANSWER))
+    web_logger.debug("🔍 [QUALITY] No Web-Search needed (has_docs=%s, len=%d)", True, len(ANSWER))
+
+
+def measure(fn, requests: int, *args) -> list:
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        fn(*args)
+        timings.append((time.perf_counter() - started) * 1e6)
+    return timings
+
+
+def summarize(name: str, timings: list, lines: int) -> dict:
+    ordered = sorted(timings)
+    return {
+        "variant": name,
+        "mean_us": round(statistics.mean(ordered), 1),
+        "p50_us": round(ordered[len(ordered) // 2], 1),
+        "p99_us": round(ordered[int(len(ordered) * 0.99) - 1], 1),
+        "lines_per_request": round(lines / len(timings), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=5)
+    parser.add_argument("--chunks", type=int, default=5, help="Retrieved chunks per document")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--write-latency-ms", type=float, default=0.2, help="Blocking time per stdout write")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    document_ids = list(range(1, args.documents + 1))
+    real_stdout = sys.stdout
+    stream = SlowStream(args.write_latency_ms / 1000)
+    results = []
+
+    # print(): every line is a synchronous write in the request thread
+    sys.stdout = stream
+    try:
+        timings = measure(chat_with_print, args.requests, document_ids, args.chunks)
+    finally:
+        sys.stdout = real_stdout
+    results.append(summarize("print", timings, stream.lines))
+
+    # logging: request thread only enqueues, the listener thread writes
+    for level in ("INFO", "DEBUG"):
+        stream.lines = 0
+        sys.stdout = stream
+        try:
+            setup_logging(level=level)
+            timings = measure(chat_with_logging, args.requests, document_ids, args.chunks)
+            shutdown_logging()  # Drain the queue before counting lines
+        finally:
+            sys.stdout = real_stdout
+        results.append(summarize(f"logging {level}", timings, stream.lines))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Chat path: {args.documents} documents x {args.chunks} chunks, {args.requests} requests, "
+          f"{args.write_latency_ms} ms per stdout write")
+    print(f"{'variant':<16} {'mean µs':>10} {'p50 µs':>10} {'p99 µs':>10} {'lines/req':>10}")
+    for r in results:
+        print(f"{r['variant']:<16} {r['mean_us']:>10} {r['p50_us']:>10} {r['p99_us']:>10} {r['lines_per_request']:>10}")
+    baseline = results[0]["mean_us"]
+    for r in results[1:]:
+        print(f"{r['variant']}: {baseline - r['mean_us']:.1f} µs less blocking per request "
+              f"({baseline / max(r['mean_us'], 0.1):.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark login throughput and event-loop blocking: bcrypt inline vs. PasswordHasher pool
+
+Simuliert einen Login-Burst (--logins gleichzeitige Passwort-Prüfungen) in einem Event-Loop,
+einmal mit bcrypt direkt im Handler (wie bisher in authenticate_user) und einmal über den
+begrenzten Thread-Pool aus passwords.py. Gemessen werden Logins/s, Login-Latenz und der
+Event-Loop-Lag (wie lange ein 10-ms-Sleep zu spät aufwacht) - der Lag ist die Zeit, die
+alle anderen Anfragen (Chat, Polling) während des Bursts warten.
+
+Usage:
+    python bench_login.py                                    # 12 Runden, Pool mit 1/2/4 Threads
+    python bench_login.py --rounds 10 12 --concurrency 2 --logins 100
+    python bench_login.py --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import time
+from typing import Dict, List
+
+from passwords import PasswordHasher
+
+PASSWORD = "Loadtest-Passwort-123"
+TICK = 0.01
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+async def heartbeat(lags: List[float], stop: asyncio.Event):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(max(time.perf_counter() - started - TICK, 0.0))
+
+
+async def burst(verify, logins: int) -> Dict:
+    """Run `logins` concurrent verifications while measuring event-loop lag"""
+    lags: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(TICK * 2)  # Monitor is running before the burst starts
+
+    latencies: List[float] = []
+
+    async def login():
+        started = time.perf_counter()
+        assert await verify()
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    wall = time.perf_counter() - started
+    stop.set()
+    await monitor
+
+    return {
+        "logins_per_s": round(logins / wall, 2),
+        "login_p50_ms": round(percentile(latencies, 0.5) * 1000, 1),
+        "login_p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "loop_lag_p99_ms": round(percentile(lags, 0.99) * 1000, 1) if lags else None,
+        "loop_lag_max_ms": round(max(lags) * 1000, 1) if lags else None,
+    }
+
+
+async def run(rounds: int, concurrency: List[int], logins: int) -> List[Dict]:
+    results = []
+    inline = PasswordHasher(rounds=rounds, concurrency=1)
+    stored = inline.context.hash(PASSWORD)
+
+    async def verify_inline():
+        return inline.context.verify(PASSWORD, stored)  # Blocks the event loop
+
+    results.append({"rounds": rounds, "variant": "inline", **await burst(verify_inline, logins)})
+
+    for workers in concurrency:
+        hasher = PasswordHasher(rounds=rounds, concurrency=workers)
+
+        async def verify_pool(hasher=hasher):
+            valid, _ = await hasher.verify_and_update(PASSWORD, stored)
+            return valid
+
+        results.append({"rounds": rounds, "variant": f"pool({workers})", **await burst(verify_pool, logins)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[12], help="bcrypt cost factors")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4], help="Pool sizes")
+    parser.add_argument("--logins", type=int, default=20, help="Concurrent logins per burst")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    results = []
+    for rounds in args.rounds:
+        results.extend(asyncio.run(run(rounds, args.concurrency, args.logins)))
+
+    if args.json:
+        print(json.dumps({
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "cpus": os.cpu_count(),
+                "logins": args.logins,
+            },
+            "results": results,
+        }, indent=2))
+        return
+
+    print(f"Burst of {args.logins} concurrent logins, {os.cpu_count()} CPUs")
+    header = ("rounds", "variant", "logins/s", "p50 ms", "p95 ms", "lag p99", "lag max")
+    print("".join(f"{h:>11}" for h in header))
+    for r in results:
+        row = (r["rounds"], r["variant"], r["logins_per_s"], r["login_p50_ms"], r["login_p95_ms"],
+               r["loop_lag_p99_ms"], r["loop_lag_max_ms"])
+        print("".join(f"{v:>11}" for v in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDF text extraction backends: pages/sec and text equivalence against PyPDF2
+
+Korpus = synthetische PDFs aus bench_ingest.make_pdf (deterministisch, verschiedene Größen)
+plus optional alle PDFs aus --corpus (eigene Verträge, Scans mit Textlayer, ...). Jedes
+installierte Backend aus pdf_backends.py extrahiert jede Datei --runs mal; berichtet werden
+Seiten/s (Median) und wie gleich der Text dem von PyPDF2 ist:
+- similarity:  Wort-Ähnlichkeit pro Seite (difflib, Whitespace normalisiert), Mittel und Minimum
+- identical:   Anteil Seiten mit gleichem Text nach Whitespace-Normalisierung
+- pages_match: gleiche Seitenzahl wie PyPDF2
+Erst wenn similarity nahe 1.0 liegt, lässt sich PDF_BACKEND ohne neue Embeddings umstellen.
+
+Usage:
+    python bench_pdf_extract.py                               # synthetisch, 10/100 Seiten
+    python bench_pdf_extract.py --corpus ./fixtures/pdfs --runs 5
+    python bench_pdf_extract.py --backends pypdf2 pypdfium2 --json
+"""
+import argparse
+import difflib
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List
+
+from bench_ingest import make_pdf
+from pdf_backends import DEFAULT_BACKEND, PDF_BACKENDS, available_backends
+
+
+def normalize(text: str) -> List[str]:
+    return unicodedata.normalize("NFC", text).split()
+
+
+def similarity(reference: List[str], candidate: List[str]) -> float:
+    if not reference and not candidate:
+        return 1.0
+    return difflib.SequenceMatcher(None, reference, candidate, autojunk=False).ratio()
+
+
+def extract(backend: str, path: Path) -> List[str]:
+    return list(PDF_BACKENDS[backend](str(path)))
+
+
+def build_corpus(pages: List[int], corpus_dir: str = None) -> List[Path]:
+    fixture_dir = Path(tempfile.mkdtemp(prefix="privategpt-pdf-bench-"))
+    files = []
+    for count in pages:
+        path = fixture_dir / f"synthetic_{count}p.pdf"
+        make_pdf(path, count, words_per_page=400)
+        files.append(path)
+    if corpus_dir:
+        files.extend(sorted(Path(corpus_dir).glob("**/*.pdf")))
+    return files
+
+
+def run_file(path: Path, backends: List[str], runs: int) -> List[Dict]:
+    reference = [normalize(text) for text in extract(DEFAULT_BACKEND, path)]
+    results = []
+
+    for backend in backends:
+        durations = []
+        pages: List[str] = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            pages = extract(backend, path)
+            durations.append(time.perf_counter() - started)
+
+        candidate = [normalize(text) for text in pages]
+        scores = [similarity(ref, cand) for ref, cand in zip(reference, candidate)]
+        identical = sum(1 for ref, cand in zip(reference, candidate) if ref == cand)
+        seconds = statistics.median(durations)
+
+        results.append({
+            "file": path.name,
+            "backend": backend,
+            "pages": len(pages),
+            "seconds": round(seconds, 4),
+            "pages_per_s": round(len(pages) / seconds, 1) if seconds else None,
+            "similarity_mean": round(statistics.mean(scores), 4) if scores else None,
+            "similarity_min": round(min(scores), 4) if scores else None,
+            "identical_pages": round(identical / len(reference), 4) if reference else None,
+            "pages_match": len(pages) == len(reference),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=None, help="Default: all installed backends")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100], help="Synthetic PDF sizes")
+    parser.add_argument("--corpus", help="Directory with additional PDFs (searched recursively)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per file and backend (median is reported)")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    installed = available_backends()
+    if DEFAULT_BACKEND not in installed:
+        raise SystemExit(f"❌ {DEFAULT_BACKEND} is the reference and must be installed")
+    backends = args.backends or installed
+    missing = [b for b in backends if b not in installed]
+    if missing:
+        raise SystemExit(f"❌ Not installed: {', '.join(missing)} (installed: {', '.join(installed)})")
+
+    results = []
+    for path in build_corpus(args.pages, args.corpus):
+        results.extend(run_file(path, backends, args.runs))
+
+    if args.json:
+        print(json.dumps({
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "cpus": os.cpu_count(),
+                "reference": DEFAULT_BACKEND,
+                "runs": args.runs,
+            },
+            "results": results,
+        }, indent=2))
+        return
+
+    header = ("file", "backend", "pages", "pages/s", "sim mean", "sim min", "identical", "pages ok")
+    widths = (24, 11, 7, 10, 10, 10, 10, 10)
+    print("".join(f"{h:>{w}}" for h, w in zip(header, widths)))
+    for r in results:
+        row = (r["file"][:23], r["backend"], r["pages"], r["pages_per_s"], r["similarity_mean"],
+               r["similarity_min"], r["identical_pages"], "yes" if r["pages_match"] else "NO")
+        print("".join(f"{str(v):>{w}}" for v, w in zip(row, widths)))
+
+    # Overall speed-up per backend (all pages of the corpus)
+    print()
+    totals: Dict[str, List[float]] = {}
+    for r in results:
+        totals.setdefault(r["backend"], [0.0, 0.0])
+        totals[r["backend"]][0] += r["pages"]
+        totals[r["backend"]][1] += r["seconds"]
+    reference_rate = totals[DEFAULT_BACKEND][0] / totals[DEFAULT_BACKEND][1] if DEFAULT_BACKEND in totals else None
+    for backend, (pages, seconds) in totals.items():
+        rate = pages / seconds if seconds else 0.0
+        speedup = f" ({rate / reference_rate:.1f}x {DEFAULT_BACKEND})" if reference_rate else ""
+        print(f"{backend}: {rate:.1f} pages/s{speedup}")
+
+
+if __name__ == "__main__":
+    main()
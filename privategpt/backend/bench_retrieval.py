@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Benchmark retrieval latency vs. number of documents per assistant (LLM stubbed out)
+
+Jedes Dokument ist eine eigene Chroma-Collection (doc_{id}), RAGEngine.query fragt
+alle Collections des Assistenten ab. Dieses Skript füllt ein temporäres Chroma-
+Verzeichnis schrittweise mit 1…200 Dokumenten und misst pro Größe p50/p95 von
+- retrieval: Chroma-Abfragen über alle Collections (RAG_STAGE_SECONDS stage="retrieval")
+- query:     RAGEngine.query komplett, Generierung durch einen Stub ersetzt
+für rag.py und rag_llamaindex.py. Daraus ergibt sich ein sinnvolles max_files_per_user.
+
+Usage:
+    python bench_retrieval.py                                  # beide Engines, 1…200 Dokumente
+    python bench_retrieval.py --engine rag --sizes 1 10 50 --queries 50
+    python bench_retrieval.py --budget-ms 250 --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+from typing import Dict, List
+
+# Separate Chroma directory - must be set before the engines are imported
+os.environ["CHROMA_DB_PATH"] = tempfile.mkdtemp(prefix="privategpt-bench-retrieval-")
+
+from prometheus_client import REGISTRY
+
+from config import get_settings
+
+settings = get_settings()
+
+QUESTIONS = [
+    "Wie hoch ist die Kaltmiete und wann ist sie fällig?",
+    "Welche Kündigungsfrist gilt für den Mieter?",
+    "Wer trägt die Kosten für Reparaturen an der Heizung?",
+    "Wie wird die Nebenkostenabrechnung erstellt?",
+    "Ab wann darf die Miete erhöht werden?",
+    "Welche Versicherung muss der Mieter abschließen?",
+]
+
+WORDS = (
+    "Vertrag Mieter Vermieter Kündigung Frist Monat Nebenkosten Abrechnung Kaution Wohnung Zahlung "
+    "Rechnung Betrag Euro fällig Datum Vereinbarung Pflicht Recht Haftung Schaden Versicherung Gebäude "
+    "Heizung Wasser Strom Verbrauch Anpassung Erhöhung Index Jahr Quartal Bestimmung Regelung Paragraph "
+    "der die das und oder nicht mit für auf bei nach ist sind wird werden hat haben kann muss"
+).split()
+
+STUB_ANSWER = "Laut Vertrag beträgt die Kaltmiete 850 Euro."
+
+
+def make_chunks(count: int, words: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(words)) for _ in range(count)]
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def _stage_sum(stage: str) -> float:
+    return REGISTRY.get_sample_value("privategpt_rag_stage_seconds_sum", {"stage": stage}) or 0.0
+
+
+def load_engine(name: str):
+    """RAGEngine with generation stubbed out
+
+    Returns (engine, chroma client, embed(texts), embedding function the engine creates collections with)
+    """
+    if name == "rag":
+        import rag
+
+        async def complete_stub(prompt, cancel_token=None, **params):
+            return {"choices": [{"text": STUB_ANSWER}], "usage": {"completion_tokens": 0}}
+
+        rag._complete = complete_stub
+        rag._llm_available = lambda: True
+        return rag.rag_engine, rag.chroma_client, rag.embedding_function, rag.embedding_function
+
+    import rag_llamaindex
+    from llama_index.core import Settings
+
+    rag_llamaindex._synthesize = lambda question, nodes, token: STUB_ANSWER
+    return (
+        rag_llamaindex.rag_engine,
+        rag_llamaindex.get_chroma_client(),
+        lambda texts: Settings.embed_model.get_text_embedding_batch(list(texts)),
+        None,  # process_file uses get_or_create_collection(name) without one
+    )
+
+
+def populate(chroma_client, collection_ef, first_id: int, count: int, pool: List[str],
+             pool_embeddings: List, chunks_per_doc: int, seed: int):
+    """Create `count` doc_{id} collections with chunks from the embedded pool (same layout as rag.py)"""
+    rng = random.Random(seed)
+    extra = {"embedding_function": collection_ef} if collection_ef is not None else {}
+    for document_id in range(first_id, first_id + count):
+        picks = rng.sample(range(len(pool)), chunks_per_doc)
+        collection = chroma_client.create_collection(
+            name=f"doc_{document_id}",
+            metadata={"document_id": document_id},
+            **extra
+        )
+        collection.add(
+            ids=[f"chunk_{i}" for i in range(chunks_per_doc)],
+            documents=[pool[p] for p in picks],
+            embeddings=[pool_embeddings[p] for p in picks],
+            metadatas=[{"chunk_index": i, "document_id": document_id} for i in range(chunks_per_doc)],
+        )
+
+
+async def measure(engine, document_ids: List[int], queries: int) -> Dict:
+    # First query loads collections / indices (cold), the rest are warm
+    started = time.perf_counter()
+    await engine.query(question=QUESTIONS[0], assistant_id=1, document_ids=document_ids)
+    cold_ms = (time.perf_counter() - started) * 1000
+
+    retrieval_ms, query_ms = [], []
+    for i in range(queries):
+        before = _stage_sum("retrieval")
+        started = time.perf_counter()
+        await engine.query(question=QUESTIONS[i % len(QUESTIONS)], assistant_id=1, document_ids=document_ids)
+        query_ms.append((time.perf_counter() - started) * 1000)
+        retrieval_ms.append((_stage_sum("retrieval") - before) * 1000)
+
+    return {
+        "cold_ms": round(cold_ms, 1),
+        "retrieval_p50_ms": round(percentile(retrieval_ms, 0.5), 1),
+        "retrieval_p95_ms": round(percentile(retrieval_ms, 0.95), 1),
+        "query_p50_ms": round(percentile(query_ms, 0.5), 1),
+        "query_p95_ms": round(percentile(query_ms, 0.95), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engine", choices=["rag", "llamaindex", "both"], default="both")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 10, 25, 50, 100, 200])
+    parser.add_argument("--chunks-per-doc", type=int, default=20)
+    parser.add_argument("--chunk-words", type=int, default=150)
+    parser.add_argument("--queries", type=int, default=20, help="Warm queries per size")
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="p95 retrieval budget for the suggestion")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    settings.enable_web_search = False  # Only retrieval + stubbed generation
+    engines = ["rag", "llamaindex"] if args.engine == "both" else [args.engine]
+    sizes = sorted(set(args.sizes))
+    pool = make_chunks(max(args.chunks_per_doc * 10, 200), args.chunk_words)
+
+    results = []
+    first_id = 900_000  # Far away from real document ids
+    for name in engines:
+        engine, chroma_client, embed, collection_ef = load_engine(name)
+        pool_embeddings = [list(map(float, e)) for e in embed(pool)]
+
+        populated = 0
+        for size in sizes:
+            populate(chroma_client, collection_ef, first_id + populated, size - populated,
+                     pool, pool_embeddings, args.chunks_per_doc, seed=size)
+            populated = size
+            document_ids = list(range(first_id, first_id + size))
+            results.append({"engine": name, "documents": size, **asyncio.run(measure(engine, document_ids, args.queries))})
+
+        first_id += 100_000  # Fresh collections for the next engine
+
+    suggestions = {}
+    for name in engines:
+        within = [r["documents"] for r in results if r["engine"] == name and r["retrieval_p95_ms"] <= args.budget_ms]
+        suggestions[name] = max(within) if within else None
+
+    if args.json:
+        print(json.dumps({
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "cpus": os.cpu_count(),
+                "chunks_per_doc": args.chunks_per_doc,
+                "queries": args.queries,
+                "budget_ms": args.budget_ms,
+            },
+            "results": results,
+            "max_documents_within_budget": suggestions,
+        }, indent=2))
+        return
+
+    print(f"{args.chunks_per_doc} chunks/document, {args.queries} warm queries per size, LLM stubbed")
+    header = ("engine", "docs", "cold ms", "retr p50", "retr p95", "query p50", "query p95")
+    print("".join(f"{h:>11}" for h in header))
+    for r in results:
+        row = (r["engine"], r["documents"], r["cold_ms"], r["retrieval_p50_ms"], r["retrieval_p95_ms"],
+               r["query_p50_ms"], r["query_p95_ms"])
+        print("".join(f"{v:>11}" for v in row))
+    print()
+    for name, size in suggestions.items():
+        verdict = f"up to {size} documents" if size else "not even the smallest size"
+        print(f"{name}: p95 retrieval ≤ {args.budget_ms:.0f} ms for {verdict} "
+              f"(max_files_per_user is {settings.max_files_per_user})")
+
+
+if __name__ == "__main__":
+    main()
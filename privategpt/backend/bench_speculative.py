@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark speculative decoding: tokens/sec and draft acceptance rate on German RAG prompts
+
+Lädt das Zielmodell einmal ohne und einmal mit Draft-Modell (draft_model_id aus
+llm_models.py) und generiert mit denselben Sampling-Parametern wie rag.py.
+
+Usage:
+    python bench_speculative.py                              # qwen3-4b + registry draft
+    python bench_speculative.py --model qwen2.5-3b --draft-tokens 4 6 8
+    python bench_speculative.py --json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from llama_cpp import Llama
+
+from config import get_settings
+from llm_models import get_model, get_model_path, DEFAULT_MODEL
+from llm_memory import llama_memory_kwargs
+from speculative import SmallModelDraft, tokenizers_match
+
+settings = get_settings()
+
+# Same sampling parameters as RAGEngine.query (with context)
+GENERATION_PARAMS = {
+    "temperature": 0.3,
+    "top_p": 0.9,
+    "top_k": 40,
+    "repeat_penalty": 1.15,
+    "stop": ["<|im_end|>", "<|im_start|>"],
+}
+
+RAG_CASES = [
+    (
+        "Der Mietvertrag beginnt am 1. März 2024 und läuft auf unbestimmte Zeit. Die Kündigungsfrist "
+        "beträgt drei Monate zum Monatsende. Die Kaltmiete beträgt 850 Euro, die Nebenkostenvorauszahlung "
+        "180 Euro monatlich. Die Kaution in Höhe von drei Kaltmieten ist bis zum Einzug zu zahlen.",
+        "Wie hoch ist die Kaution und bis wann muss sie gezahlt werden?",
+    ),
+    (
+        "Gemäß Abschnitt 4.2 der Reiserichtlinie werden Bahnfahrten in der 2. Klasse erstattet. Flüge "
+        "sind nur bei Strecken über 500 km zulässig und müssen vorab von der Abteilungsleitung genehmigt "
+        "werden. Hotelkosten werden bis 120 Euro pro Nacht übernommen, in München und Frankfurt bis 150 Euro.",
+        "Welche Hotelkosten werden in Frankfurt erstattet und wann darf ich fliegen?",
+    ),
+    (
+        "Die Wartung der Heizungsanlage erfolgt jährlich im Oktober durch die Firma Müller Haustechnik. "
+        "Störungen außerhalb der Geschäftszeiten sind über die Notfallnummer 0800 123456 zu melden. "
+        "Kosten für Notfalleinsätze trägt der Vermieter, sofern kein Verschulden des Mieters vorliegt.",
+        "Wer trägt die Kosten für einen Notfalleinsatz am Wochenende?",
+    ),
+]
+
+
+def build_prompt(context: str, question: str) -> str:
+    """Same prompt layout as RAGEngine.query"""
+    return f"""<|im_start|>system
+Du bist ein hilfreicher KI-Assistent.
+
+WICHTIGE REGELN:
+1. Beantworte AUSSCHLIESSLICH auf Deutsch
+2. Nutze NUR Informationen aus den Dokumenten
+3. Zitiere direkt aus den Quellen wenn möglich
+4. Wenn die Information nicht vorhanden ist, sage das ehrlich
+5. Schreibe in vollständigen, korrekten deutschen Sätzen
+6. Sei präzise, sachlich und professionell<|im_end|>
+<|im_start|>user
+DOKUMENTEN-AUSZÜGE:
+{context}
+
+FRAGE: {question}
+
+ANTWORT (auf Deutsch, basierend auf den Quellen):<|im_end|>
+<|im_start|>assistant
+"""
+
+
+def load(model_id: str, draft=None) -> Llama:
+    kwargs = {"draft_model": draft} if draft is not None else {}
+    return Llama(
+        model_path=get_model_path(model_id),
+        n_ctx=settings.llm_context_size,
+        n_threads=settings.llm_threads,
+        seed=42,
+        verbose=False,
+        **llama_memory_kwargs(),
+        **kwargs
+    )
+
+
+def run(llm: Llama, max_tokens: int, runs: int) -> dict:
+    """Generate every case `runs` times, return throughput"""
+    llm("Hallo", max_tokens=1)  # Warm-up: page in weights
+
+    tokens = 0
+    seconds = 0.0
+    for _ in range(runs):
+        for context, question in RAG_CASES:
+            llm.reset()  # No prompt cache reuse between cases
+            started = time.perf_counter()
+            output = llm(build_prompt(context, question), max_tokens=max_tokens, **GENERATION_PARAMS)
+            seconds += time.perf_counter() - started
+            tokens += output["usage"]["completion_tokens"]
+
+    return {
+        "completion_tokens": tokens,
+        "seconds": round(seconds, 2),
+        "tokens_per_second": round(tokens / seconds, 2) if seconds else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Target model id")
+    parser.add_argument("--draft", default=None, help="Draft model id (default: draft_model_id from registry)")
+    parser.add_argument("--draft-tokens", type=int, nargs="+", default=[settings.llm_draft_tokens])
+    parser.add_argument("--max-tokens", type=int, default=256)
+    parser.add_argument("--runs", type=int, default=2)
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    draft_id = args.draft or get_model(args.model).draft_model_id
+    if not draft_id:
+        sys.exit(f"❌ {args.model} has no draft_model_id in llm_models.py (use --draft)")
+    for model_id in (args.model, draft_id):
+        if not os.path.exists(get_model_path(model_id)):
+            sys.exit(f"❌ Model file missing: {get_model_path(model_id)} (python download_model.py {model_id})")
+
+    print(f"🚀 Baseline: {args.model} without draft...", file=sys.stderr)
+    target = load(args.model)
+    results = [{"draft_tokens": 0, **run(target, args.max_tokens, args.runs)}]
+    del target
+
+    draft_llama = load(draft_id)
+    if not tokenizers_match(get_model_path(args.model), draft_llama):
+        sys.exit(f"❌ Tokenizer of {draft_id} differs from {args.model}")
+
+    for draft_tokens in args.draft_tokens:
+        print(f"🚀 Speculative: {args.model} + {draft_id}, {draft_tokens} draft tokens...", file=sys.stderr)
+        draft = SmallModelDraft(draft_id, draft_llama, draft_tokens)
+        target = load(args.model, draft=draft)
+        result = run(target, args.max_tokens, args.runs)
+        del target
+        results.append({"draft_tokens": draft_tokens, **result, **draft.stats()})
+
+    baseline = results[0]["tokens_per_second"]
+    for result in results:
+        result["speedup"] = round(result["tokens_per_second"] / baseline, 2) if baseline else None
+
+    if args.json:
+        print(json.dumps({"model_id": args.model, "draft_model_id": draft_id, "results": results}, indent=2))
+        return
+
+    print("=" * 70)
+    print(f"{args.model} + draft {draft_id} ({len(RAG_CASES)} prompts x {args.runs} runs, max {args.max_tokens} tokens)")
+    print("-" * 70)
+    print(f"{'Draft tok':>9} {'Tokens':>8} {'Seconds':>9} {'Tok/s':>8} {'Speedup':>8} {'Accepted':>9}")
+    for result in results:
+        rate = result.get("acceptance_rate")
+        print(f"{result['draft_tokens'] or '-':>9} {result['completion_tokens']:>8} {result['seconds']:>9.1f} "
+              f"{result['tokens_per_second']:>8.2f} {result['speedup']:>7.2f}x "
+              f"{f'{rate:.0%}' if rate is not None else '-':>9}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
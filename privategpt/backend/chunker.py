@@ -0,0 +1,215 @@
+"""Token Chunker - Chunks in Tokens des Embedding-Modells, geschnitten an Satz- und Absatzgrenzen
+
+paraphrase-multilingual-MiniLM-L12-v2 (SentencePiece-Tokenizer von XLM-R) sieht nur die ersten
+128 Tokens - alles darüber wird beim Embedding abgeschnitten, landet aber trotzdem im LLM-Prompt.
+Der Chunker packt ganze Sätze, bis das Token-Budget voll ist (überlange Sätze an Wortgrenzen
+geteilt, überlange Wörter in Zeichenfenster, die nachgezählt werden), über Seiten-/Absatzgrenzen
+hinweg, und speichert pro Chunk:
+- char_start/char_end: Offsets im extrahierten Dokumenttext (Einheiten mit "\\n\\n" verbunden)
+- page/page_end bzw. paragraph/line/heading der Einheiten, aus denen der Chunk stammt
+- token_count: Tokens ohne <s>/</s>
+So wird genau das eingebettet, was später als Kontext im Prompt steht.
+"""
+import math
+import re
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from config import get_settings
+from extractors import TextUnit, extract
+from llm_runtime import EMBEDDING_MAX_TOKENS, get_embedding_tokenizer
+from metrics import INGEST_SECONDS
+
+settings = get_settings()
+
+UNIT_SEPARATOR = "\n\n"  # Between pages/paragraphs when computing character offsets
+SPECIAL_TOKENS = 2  # <s> ... </s>
+CHARS_PER_TOKEN = 3.0  # Fallback without tokenizer (conservative for German SentencePiece tokens)
+INGEST_BATCH_CHUNKS = 64  # Chunks embedded + written together
+
+# Candidate boundaries: after . ! ? (incl. closing quotes/brackets) or at blank lines
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])[\"'»“”)\]]*\s+|\n\s*\n")
+_WORD = re.compile(r"\S+")
+
+
+@dataclass
+class Chunk:
+    text: str
+    metadata: Dict[str, object]
+
+
+@dataclass
+class _Piece:
+    """Sentence (or part of an overlong one) with its position in the document text"""
+    text: str
+    start: int
+    end: int
+    tokens: int
+    gap: str  # Document text between the previous piece and this one
+    unit: Dict[str, object]
+
+
+def _count_tokens_with(tokenizer) -> Callable[[List[str]], List[int]]:
+    if tokenizer is None:
+        return lambda texts: [math.ceil(len(text) / CHARS_PER_TOKEN) for text in texts]
+    return lambda texts: [len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]] if texts else []
+
+
+class TokenChunker:
+    """Packs sentences of a stream of TextUnits into chunks of at most max_tokens tokens"""
+
+    def __init__(self, max_tokens: int, overlap_tokens: int, count_tokens: Callable[[List[str]], List[int]]):
+        self.budget = max(min(max_tokens, EMBEDDING_MAX_TOKENS) - SPECIAL_TOKENS, 8)
+        self.overlap = max(min(overlap_tokens, self.budget // 2), 0)
+        self.count_tokens = count_tokens
+
+    def _spans(self, text: str) -> List[tuple]:
+        """(start, end) of the sentences of one unit, whitespace stripped"""
+        spans = []
+        start = 0
+        for match in _SENTENCE_BREAK.finditer(text):
+            spans.append((start, match.start() + len(match.group(0).rstrip())))
+            start = match.end()
+        spans.append((start, len(text)))
+        return [(s, e) for s, e in spans if text[s:e].strip()]
+
+    def _pieces(self, unit: TextUnit, offset: int, lead: str) -> Iterator[_Piece]:
+        """lead: document text between the previous piece and the start of this unit"""
+        spans = self._spans(unit.text)
+        counts = self.count_tokens([unit.text[s:e] for s, e in spans])
+        previous_end = None
+
+        for (start, end), tokens in zip(spans, counts):
+            parts = [(start, end, tokens)] if tokens <= self.budget else self._split_words(unit.text, start, end)
+            for part_start, part_end, part_tokens in parts:
+                gap = lead + unit.text[:part_start] if previous_end is None else unit.text[previous_end:part_start]
+                yield _Piece(unit.text[part_start:part_end], offset + part_start, offset + part_end,
+                             part_tokens, gap, unit.metadata)
+                previous_end = part_end
+
+    def _split_words(self, text: str, start: int, end: int) -> List[tuple]:
+        """Overlong sentence (tables, lists without punctuation) - cut at word boundaries"""
+        words = [(m.start() + start, m.end() + start) for m in _WORD.finditer(text[start:end])]
+        counts = self.count_tokens([text[s:e] for s, e in words])
+
+        # A single "word" over the budget (URLs, hashes, tables without spaces): character windows
+        pieces = []
+        for (word_start, word_end), tokens in zip(words, counts):
+            if tokens <= self.budget:
+                pieces.append((word_start, word_end, tokens))
+            else:
+                pieces.extend(self._windows(text, word_start, word_end))
+
+        parts = []
+        part_start, part_tokens, part_end = None, 0, None
+        for word_start, word_end, tokens in pieces:
+            if part_start is not None and part_tokens + tokens > self.budget:
+                parts.append((part_start, part_end, part_tokens))
+                part_start, part_tokens = None, 0
+            if part_start is None:
+                part_start = word_start
+            part_end = word_end
+            part_tokens += tokens
+        if part_start is not None:
+            parts.append((part_start, part_end, part_tokens))
+        return parts
+
+    def _windows(self, text: str, start: int, end: int) -> List[tuple]:
+        """(start, end, tokens) of equal character windows, shrunk until each fits the budget
+
+        Windows are re-tokenized: a character can take more than one token (the SentencePiece
+        word prefix, characters outside the vocabulary), so budget characters may not fit.
+        """
+        size = self.budget
+        while True:
+            windows = [(s, min(s + size, end)) for s in range(start, end, size)]
+            counts = self.count_tokens([text[s:e] for s, e in windows])
+            largest = max(counts)
+            if largest <= self.budget or size == 1:
+                return [(s, e, tokens) for (s, e), tokens in zip(windows, counts)]
+            size = max(min(size - 1, size * self.budget // largest), 1)
+
+    @staticmethod
+    def _chunk(pieces: List[_Piece], index: int) -> Chunk:
+        text = pieces[0].text + "".join(piece.gap + piece.text for piece in pieces[1:])
+        first, last = pieces[0].unit, pieces[-1].unit
+        metadata = dict(first)
+        for key in ("page", "paragraph", "line"):
+            if key in last and last[key] != first.get(key):
+                metadata[f"{key}_end"] = last[key]
+        metadata.update({
+            "chunk_index": index,
+            "char_start": pieces[0].start,
+            "char_end": pieces[-1].end,
+            "token_count": sum(piece.tokens for piece in pieces),
+        })
+        return Chunk(text, metadata)
+
+    def chunks(self, units: Iterable[TextUnit]) -> Iterator[Chunk]:
+        """Chunks in document order; only the current unit and chunk are held in memory"""
+        current: List[_Piece] = []
+        tokens = 0
+        offset = 0
+        index = 0
+        lead = ""  # Trailing text of the previous unit + separator (keeps char offsets exact)
+
+        for unit in units:
+            unit_end = None
+            for piece in self._pieces(unit, offset, lead):
+                if current and tokens + piece.tokens > self.budget:
+                    yield self._chunk(current, index)
+                    index += 1
+                    # Overlap: trailing whole sentences of the previous chunk
+                    carried: List[_Piece] = []
+                    carried_tokens = 0
+                    for previous in reversed(current):
+                        if carried_tokens + previous.tokens > self.overlap or carried_tokens + previous.tokens + piece.tokens > self.budget:
+                            break
+                        carried.insert(0, previous)
+                        carried_tokens += previous.tokens
+                    current, tokens = carried, carried_tokens
+                current.append(piece)
+                tokens += piece.tokens
+                unit_end = piece.end - offset
+            lead = (lead + unit.text if unit_end is None else unit.text[unit_end:]) + UNIT_SEPARATOR
+            offset += len(unit.text) + len(UNIT_SEPARATOR)
+
+        if current:
+            yield self._chunk(current, index)
+
+
+_chunker: Optional[TokenChunker] = None
+
+
+def get_chunker() -> TokenChunker:
+    """Shared chunker of both engines (tokenizer loaded on first use)"""
+    global _chunker
+    if _chunker is None:
+        _chunker = TokenChunker(
+            max_tokens=settings.chunk_max_tokens,
+            overlap_tokens=settings.chunk_overlap_tokens,
+            count_tokens=_count_tokens_with(get_embedding_tokenizer()),
+        )
+    return _chunker
+
+
+def ingest_batches(file_path: str, file_type: str, batch_size: int = INGEST_BATCH_CHUNKS) -> Iterator[List[Chunk]]:
+    """Chunks of a stored document in batches - shared ingestion loop of both engines
+
+    Extraction and chunking interleave with embedding, so their time is summed and
+    observed once per document as the "extract" stage.
+    """
+    chunks = get_chunker().chunks(extract(file_path, file_type))
+    seconds = 0.0
+    try:
+        while True:
+            started = time.perf_counter()
+            batch = list(islice(chunks, batch_size))
+            seconds += time.perf_counter() - started
+            if not batch:
+                return
+            yield batch
+    finally:
+        INGEST_SECONDS.labels(stage="extract").observe(seconds)
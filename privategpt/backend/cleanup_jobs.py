@@ -0,0 +1,207 @@
+"""Cleanup Jobs - Vektor-Collections und Upload-Dateien gelöschter Nutzer im Hintergrund entfernen
+
+Der Job steht als Zeile in deletion_jobs (database.py) und wird in derselben Transaktion
+angelegt, die die Nutzerdaten löscht. Jeder Worker arbeitet offene Jobs ab (sofort nach der
+Löschung, beim Start und periodisch): ein Crash mitten im Cleanup oder ein Neustart lässt
+keine Vektoren/Dateien verwaist zurück. Die Arbeit ist idempotent, fehlgeschlagene Jobs
+werden bis MAX_ATTEMPTS wiederholt.
+"""
+import asyncio
+import json
+import logging
+import os
+import shutil
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import and_, or_, select, update
+
+from database import AsyncSessionLocal, DeletionJob
+
+logger = logging.getLogger(__name__)
+
+# Job states in order
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+MAX_ATTEMPTS = 5  # Failed jobs are retried by the sweep until then
+SWEEP_INTERVAL = 300  # Seconds between scans for queued, failed or abandoned jobs
+LEASE = timedelta(minutes=10)  # A running job not finished by then is taken over (worker crashed)
+
+
+def _collection_missing(error: Exception) -> bool:
+    """Chroma's "collection does not exist" (ValueError before 0.6, InvalidCollectionException/NotFoundError since)"""
+    return type(error).__name__ in ("InvalidCollectionException", "NotFoundError") or "does not exist" in str(error)
+
+
+def new_job(user_id: int, document_ids: List[int], upload_dir: str) -> DeletionJob:
+    """Job row to add in the transaction that deletes the user - it exists iff the rows are gone"""
+    return DeletionJob(
+        id=uuid.uuid4().hex,
+        user_id=user_id,
+        document_ids=json.dumps(list(document_ids)),
+        upload_dir=upload_dir,
+        state=QUEUED,
+    )
+
+
+def public_status(job: DeletionJob) -> Dict:
+    """What the unauthenticated status route shows - no ids or counts of the deleted account"""
+    return {
+        "job_id": job.id,
+        "state": job.state,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+class CleanupJobManager:
+    """Claims deletion jobs from the database and runs the blocking Chroma/filesystem work in a thread
+
+    Claiming is a conditional UPDATE, so with several uvicorn workers each job runs once.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+        self._delete_vectors: Optional[Callable[[int], None]] = None
+
+    def start(self, delete_vectors: Callable[[int], None]):
+        """Resume pending jobs now and every SWEEP_INTERVAL (call on startup)
+
+        Args:
+            delete_vectors: blocking function dropping the collection of one document
+        """
+        self._delete_vectors = delete_vectors
+        self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def stop(self):
+        """Give running jobs back (another worker or the next start resumes them)"""
+        tasks = [task for task in (self._sweeper, *self._tasks.values()) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def run(self, job_id: str):
+        """Start a committed job right away in this worker"""
+        if job_id not in self._tasks:
+            task = asyncio.create_task(self._run(job_id))
+            self._tasks[job_id] = task
+            task.add_done_callback(lambda t: self._tasks.pop(job_id, None))
+
+    async def _sweep_forever(self):
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    result = await db.execute(select(DeletionJob.id).where(self._claimable()))
+                    job_ids = result.scalars().all()
+                for job_id in job_ids:
+                    self.run(job_id)
+            except Exception as e:
+                logger.warning("⚠️ [CLEANUP] Scanning for pending deletion jobs failed: %s", e)
+            await asyncio.sleep(SWEEP_INTERVAL)
+
+    @staticmethod
+    def _claimable():
+        return and_(
+            DeletionJob.attempts < MAX_ATTEMPTS,
+            or_(
+                DeletionJob.state.in_((QUEUED, FAILED)),
+                and_(DeletionJob.state == RUNNING, DeletionJob.claimed_at < datetime.utcnow() - LEASE),
+            ),
+        )
+
+    async def _claim(self, job_id: str) -> Optional[DeletionJob]:
+        """Mark the job running for this worker, None if it is done or held by another one"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(DeletionJob)
+                .where(DeletionJob.id == job_id, self._claimable())
+                .values(state=RUNNING, claimed_at=datetime.utcnow(), attempts=DeletionJob.attempts + 1)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            if not result.rowcount:
+                return None
+            return await db.get(DeletionJob, job_id)
+
+    async def _finish(self, job_id: str, **values):
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(DeletionJob)
+                .where(DeletionJob.id == job_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+    async def _run(self, job_id: str):
+        job = await self._claim(job_id)
+        if job is None:
+            return
+
+        document_ids = json.loads(job.document_ids)
+        collections_deleted = warnings = None
+        try:
+            collections_deleted, warnings = await asyncio.to_thread(
+                self._cleanup, document_ids, job.upload_dir, self._delete_vectors
+            )
+            state = DONE
+            await self._finish(
+                job_id, state=DONE, error=None, finished_at=datetime.utcnow(),
+                collections_deleted=collections_deleted, warnings=warnings,
+            )
+        except asyncio.CancelledError:
+            # Shutdown - hand the job back instead of waiting for the lease to expire
+            await asyncio.shield(self._finish(job_id, state=QUEUED, attempts=job.attempts - 1))
+            raise
+        except Exception as e:
+            state = FAILED
+            await self._finish(job_id, state=FAILED, error=str(e), finished_at=datetime.utcnow())
+            logger.exception("❌ [CLEANUP %s] Deleting data of user %s failed (attempt %s/%s): %s",
+                             job_id[:8], job.user_id, job.attempts, MAX_ATTEMPTS, e)
+
+        # Audit trail: one line per attempt, ids and counts only
+        logger.info("🗑️ [CLEANUP %s] User %s: %s", job_id[:8], job.user_id, state, extra={
+            "cleanup_job_id": job_id,
+            "user_id": job.user_id,
+            "state": state,
+            "attempt": job.attempts,
+            "documents": len(document_ids),
+            "collections_deleted": collections_deleted,
+            "warnings": warnings,
+        })
+
+    @staticmethod
+    def _cleanup(document_ids: List[int], upload_dir: str, delete_vectors) -> tuple:
+        """Idempotent - a collection already dropped by an earlier attempt only counts as warning
+
+        Any other error (Chroma unreachable, permissions) fails the attempt, the vectors are
+        still there and the job is retried.
+        """
+        collections_deleted = 0
+        warnings = 0
+        for document_id in document_ids:
+            try:
+                delete_vectors(document_id)
+                collections_deleted += 1
+            except Exception as e:
+                if not _collection_missing(e):
+                    raise
+                warnings += 1
+                logger.debug("Collection doc_%s not deleted: %s", document_id, e)
+
+        if os.path.exists(upload_dir):
+            shutil.rmtree(upload_dir)
+        return collections_deleted, warnings
+
+    async def get(self, job_id: str) -> Optional[DeletionJob]:
+        async with AsyncSessionLocal() as db:
+            return await db.get(DeletionJob, job_id)
+
+
+# Global instance
+cleanup_jobs = CleanupJobManager()
@@ -24,6 +24,10 @@ class Settings(BaseSettings):
     from_email: str = "noreply@dabrock.eu"
     magic_link_expiry_minutes: int = 15
     session_expiry_days: int = 30
+    auth_cache_seconds: int = 60  # Verifizierte JWTs → User im Prozess cachen (0 = aus, jede Anfrage fragt die DB)
+    last_login_interval_minutes: int = 5  # last_login höchstens so oft pro User schreiben (gesammelt im Hintergrund)
+    bcrypt_rounds: int = 12  # Kosten pro Hash (~250 ms bei 12); abweichende Hashes werden beim Login neu gehasht
+    password_hash_concurrency: int = 2  # Max. parallele bcrypt-Hashes (Thread-Pool, blockiert nicht den Event-Loop)
 
     # LLM Config - llama-cpp-python mit Qwen2.5-0.5B
     llm_model_path: str = "./models/qwen2.5-0.5b-instruct-q4_k_m.gguf"
@@ -31,6 +35,33 @@ class Settings(BaseSettings):
     llm_max_tokens: int = 512  # Max Output Tokens
     llm_temperature: float = 0.7
     llm_threads: int = 4  # CPU Threads (Railway: 8 vCPUs)
+    llm_use_mmap: bool = True  # GGUF per mmap laden -> Page Cache wird von allen Workern geteilt
+    llm_use_mlock: bool = False  # Gemappte Gewichte im RAM pinnen (braucht ulimit -l / CAP_IPC_LOCK)
+    llm_speculative_decoding: bool = False  # Draft-Modell (draft_model_id in llm_models.py) schlägt Tokens vor
+    llm_draft_tokens: int = 8  # Tokens pro Draft-Runde
+    # Inference Service - leer = Modell im API-Prozess; sonst z.B. "http://127.0.0.1:8001" oder "unix:/tmp/privategpt-inference.sock"
+    inference_url: str | None = None
+    inference_timeout: float = 600.0  # Sekunden pro Generation (CPU-Inferenz ist langsam)
+    web_concurrency: int = 1  # uvicorn-Worker (railway_startup.sh); > 1 ohne Inference-Service = kein Admin-Modellwechsel
+    warmup_on_startup: bool = True  # Modell + Embeddings beim Start im Hintergrund vorladen (/ready)
+    warmup_model_wait_seconds: int = 900  # Warm-up wartet so lange auf den Modell-Download im Hintergrund (wie healthcheckTimeout)
+    chat_history_tokens: int = 1024  # Budget für den Gesprächsverlauf im Prompt (Zusammenfassung + letzte Turns, 0 = aus)
+    chat_summary_tokens: int = 256  # Max. Länge der rollierenden Zusammenfassung (Teil des Budgets)
+    chat_history_messages: int = 20  # Max. Nachrichten, die pro Chat-Anfrage geladen werden
+
+    # Tracing - Server-Timing Header immer; Export als OTLP/JSON nur wenn Ziel gesetzt
+    trace_export_path: str | None = None  # z.B. "/tmp/traces.jsonl" (eine Zeile pro Request)
+    trace_otlp_endpoint: str | None = None  # z.B. "http://127.0.0.1:4318/v1/traces" (OTel Collector)
+
+    # Logging - strukturiert über eine Queue (log I/O blockiert nie den Request)
+    log_level: str = "INFO"  # DEBUG zeigt u.a. einzelne Chunks und Dokumente pro Anfrage
+    log_format: str = "text"  # "text" oder "json" (eine JSON-Zeile pro Event)
+    db_echo: bool = False  # Jedes SQL-Statement loggen (nur zum Debuggen)
+    db_pool_size: int = 5  # Dauerhafte Verbindungen pro Worker (nur PostgreSQL)
+    db_max_overflow: int = 10  # Zusätzliche Verbindungen unter Last
+    db_pool_timeout: float = 30.0  # Sekunden warten auf eine freie Verbindung
+    db_pool_recycle: int = 1800  # Verbindungen nach N Sekunden erneuern (vor Server-/Proxy-Timeouts)
+    db_pool_pre_ping: bool = True  # Verbindung vor Benutzung prüfen (tote Verbindungen nach DB-Neustart)
 
     # Admin Config
     superadmin_email: str = "michael.dabrock@gmx.es"  # Superadmin für Admin-Panel
@@ -44,6 +75,10 @@ class Settings(BaseSettings):
     # Limits
     max_file_size_mb: int = 10
     max_files_per_user: int = 50
+    pdf_backend: str = "pypdf2"  # PDF-Textextraktion: "pypdf2", "pypdfium2" (schneller, C) oder "pymupdf" (AGPL, extra installieren)
+    chunk_max_tokens: int = 128  # Chunk-Größe in Tokens des Embedding-Modells (SentencePiece, max. 128 inkl. <s>/</s>)
+    chunk_overlap_tokens: int = 16  # Überlappung (ganze Sätze) zwischen aufeinanderfolgenden Chunks
+    retrieval_max_chunks: int = 8  # Beste Chunks über alle Dokumente im Prompt (8 x ~126 Tokens ≈ früher 3 x 1000 Zeichen)
 
     # Hybrid RAG - Web Search mit SearxNG
     searxng_url: str = "https://searx.be"  # Öffentliche SearxNG-Instanz (kann geändert werden)
@@ -0,0 +1,229 @@
+"""Conversation Memory - letzte Chat-Turns im Token-Budget, ältere Turns als rollierende Zusammenfassung
+
+Der Prompt bekommt die Zusammenfassung (Assistant.history_summary) plus so viele der neuesten
+Nachrichten nach Assistant.summary_until_id, wie ins Budget passen - die Prompt-Länge bleibt
+begrenzt, egal wie lange das Gespräch läuft. Wächst der nicht zusammengefasste Teil über das
+Budget, fasst ein Hintergrund-Task die älteren Turns zusammen (nach der Antwort, nicht im Request).
+"""
+import asyncio
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import exists, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import get_settings
+from database import AsyncSessionLocal, Assistant, Message
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 3.5  # Qwen2.5 tokenizer on German text (estimate, no tokenizer call per request)
+SUMMARIZE_AT = 0.75  # Summarize once unsummarized turns fill this share of the turn budget
+KEEP_SHARE = 0.5  # Turns kept verbatim after a summary (share of the turn budget)
+SUMMARY_TEMPERATURE = 0.2  # Summaries stick to what was said
+
+ROLE_LABELS = {"user": "Nutzer", "assistant": "Assistent"}
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, tokens: int) -> str:
+    limit = int(tokens * CHARS_PER_TOKEN)
+    return text if len(text) <= limit else text[:limit].rstrip() + " …"
+
+
+def render_turns(turns: List[Tuple[str, str]]) -> str:
+    return "\n".join(f"{ROLE_LABELS.get(role, role)}: {content}" for role, content in turns)
+
+
+@dataclass
+class ConversationHistory:
+    """What the prompt sees of the conversation before the current question"""
+    summary: Optional[str] = None
+    turns: List[Tuple[str, str]] = field(default_factory=list)  # (role, content), oldest first
+    needs_summary: bool = False  # Unsummarized turns outgrow the budget - schedule a summary
+
+    @property
+    def empty(self) -> bool:
+        return not self.summary and not self.turns
+
+    def render(self) -> str:
+        parts = []
+        if self.summary:
+            parts.append(f"Zusammenfassung des früheren Gesprächs:\n{self.summary}")
+        if self.turns:
+            parts.append(f"Letzte Nachrichten:\n{render_turns(self.turns)}")
+        return "\n\n".join(parts)
+
+    def prompt_question(self, question: str) -> str:
+        """Question with the conversation in front of it (follow-ups like "und was kostet das?")"""
+        if self.empty:
+            return question
+        return f"Bisheriger Gesprächsverlauf:\n{self.render()}\n\nAktuelle Frage: {question}"
+
+    def retrieval_query(self, question: str) -> str:
+        """Text to embed / search for: the previous user question gives follow-ups their topic"""
+        previous = [content for role, content in self.turns if role == "user"]
+        if not previous:
+            return question
+        return f"{truncate_to_tokens(previous[-1], 64)}\n{question}"
+
+
+def summary_prompt(previous_summary: Optional[str], turns: List[Tuple[str, str]], max_tokens: int) -> str:
+    """Instruction for folding older turns into the rolling summary"""
+    previous = f"Bisherige Zusammenfassung:\n{previous_summary}\n\n" if previous_summary else ""
+    return f"""Fasse das folgende Gespräch zwischen Nutzer und Assistent kurz auf Deutsch zusammen.
+Behalte Fakten, Zahlen, Namen und offene Fragen, lass Höflichkeiten weg.
+Höchstens {int(max_tokens * 0.75)} Wörter.
+
+{previous}Neue Nachrichten:
+{render_turns(turns)}
+
+Zusammenfassung:"""
+
+
+class ConversationMemory:
+    """Loads the history window for a chat request and keeps the rolling summary up to date"""
+
+    def __init__(self, history_tokens: int, summary_tokens: int, max_messages: int):
+        self.history_tokens = history_tokens
+        self.summary_tokens = summary_tokens
+        self.max_messages = max_messages
+        self._tasks: Dict[int, asyncio.Task] = {}  # One summary per assistant at a time
+
+    @property
+    def enabled(self) -> bool:
+        return self.history_tokens > 0
+
+    @property
+    def turn_budget(self) -> int:
+        return max(self.history_tokens - self.summary_tokens, 0)
+
+    @staticmethod
+    def _unsummarized(assistant_id: int, after_id: int):
+        return select(Message.id, Message.role, Message.content).where(
+            Message.assistant_id == assistant_id,
+            Message.id > after_id,
+            or_(Message.source_type.is_(None), Message.source_type != "error"),  # Error texts are no context
+        )
+
+    async def load(self, db: AsyncSession, assistant: Assistant) -> ConversationHistory:
+        """Summary plus the newest turns that fit the budget (one indexed query, newest first)"""
+        if not self.enabled:
+            return ConversationHistory()
+
+        result = await db.execute(
+            self._unsummarized(assistant.id, assistant.summary_until_id or 0)
+            .order_by(Message.id.desc())
+            .limit(self.max_messages)
+        )
+        rows = result.all()
+
+        summary = truncate_to_tokens(assistant.history_summary, self.summary_tokens) if assistant.history_summary else None
+        budget = self.history_tokens - (estimate_tokens(summary) if summary else 0)
+        turns = []
+        for row in rows:
+            tokens = estimate_tokens(row.content)
+            if tokens > budget:
+                if not turns and budget > 0:
+                    turns.append((row.role, truncate_to_tokens(row.content, budget)))  # Newest turn, shortened
+                break
+            turns.append((row.role, row.content))
+            budget -= tokens
+
+        pending = sum(estimate_tokens(row.content) for row in rows)
+        return ConversationHistory(
+            summary=summary,
+            turns=list(reversed(turns)),
+            needs_summary=pending > self.turn_budget * SUMMARIZE_AT or len(rows) == self.max_messages,
+        )
+
+    def schedule_summary(self, assistant_id: int, generate: Callable[..., Awaitable[str]]):
+        """Fold older turns into the summary in the background (skipped if one is running)
+
+        generate: RAGEngine.complete - called with the summary's max_tokens and temperature
+        """
+        if not self.enabled or assistant_id in self._tasks:
+            return
+        task = asyncio.create_task(self._summarize(assistant_id, generate))
+        self._tasks[assistant_id] = task
+        task.add_done_callback(lambda t: self._tasks.pop(assistant_id) if self._tasks.get(assistant_id) is t else None)
+
+    def forget(self, assistant_id: int):
+        """Chat history deleted - a running summary must not write it back"""
+        task = self._tasks.pop(assistant_id, None)
+        if task is not None:
+            task.cancel()
+
+    async def _summarize(self, assistant_id: int, generate: Callable[..., Awaitable[str]]):
+        try:
+            # Short read, the connection is back in the pool before the LLM runs
+            async with AsyncSessionLocal() as db:
+                assistant = await db.get(Assistant, assistant_id)
+                if assistant is None:
+                    return
+                previous, until_id = assistant.history_summary, assistant.summary_until_id or 0
+                result = await db.execute(self._unsummarized(assistant_id, until_id).order_by(Message.id))
+                rows = result.all()
+
+            # Keep the newest turns verbatim, fold everything before them - also everything
+            # beyond the message share, otherwise short messages past max_messages would drop
+            # out of the prompt without ever reaching the summary
+            keep_budget = self.turn_budget * KEEP_SHARE
+            keep_messages = int(self.max_messages * KEEP_SHARE)
+            split = len(rows)
+            while (split > 0 and len(rows) - split < keep_messages
+                   and estimate_tokens(rows[split - 1].content) <= keep_budget):
+                keep_budget -= estimate_tokens(rows[split - 1].content)
+                split -= 1
+            while split < len(rows) and rows[split].role != "user":
+                split += 1  # Fold whole turns - the kept part starts with a question
+            fold = rows[:split]
+            if not fold:
+                return
+
+            turns = [(row.role, truncate_to_tokens(row.content, self.turn_budget)) for row in fold]
+            summary = await generate(
+                summary_prompt(previous, turns, self.summary_tokens),
+                max_tokens=self.summary_tokens,
+                temperature=SUMMARY_TEMPERATURE,
+            )
+            summary = summary.strip()
+            if not summary:
+                return
+            summary = truncate_to_tokens(summary, self.summary_tokens)
+
+            # Only if nobody summarized in between and the history was not deleted meanwhile
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    update(Assistant)
+                    .where(
+                        Assistant.id == assistant_id,
+                        Assistant.summary_until_id == until_id,
+                        exists(select(Message.id).where(Message.id == fold[-1].id)),
+                    )
+                    .values(history_summary=summary, summary_until_id=fold[-1].id)
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+
+            if result.rowcount:
+                logger.info("🧠 [MEMORY] Assistant %s: %d messages folded into summary (%d tokens)",
+                            assistant_id, len(fold), estimate_tokens(summary))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("⚠️ [MEMORY] Summary for assistant %s failed: %s", assistant_id, e)
+
+
+# Global instance
+conversation_memory = ConversationMemory(
+    history_tokens=settings.chat_history_tokens,
+    summary_tokens=settings.chat_summary_tokens,
+    max_messages=settings.chat_history_messages,
+)
@@ -1,9 +1,11 @@
 """Database models and setup"""
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, String, Integer, BigInteger, Float, DateTime, ForeignKey, Text, Boolean, Index, event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
+from typing import Optional
 from config import get_settings
+from metrics import DB_CONNECTIONS_IN_USE
 
 settings = get_settings()
 
@@ -12,13 +14,36 @@ database_url = settings.database_url
 if database_url.startswith("postgresql://"):
     database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
 
+# Pool settings (SQLite: SQLAlchemy's default pool, a single file has no server connections to pool)
+pool_kwargs = {"pool_pre_ping": settings.db_pool_pre_ping}
+if not database_url.startswith("sqlite"):
+    pool_kwargs.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+
 # Create async engine
 engine = create_async_engine(
     database_url,
-    echo=True,
-    future=True
+    echo=settings.db_echo,
+    future=True,
+    **pool_kwargs
 )
 
+
+# Connections held by requests (/metrics, loadtest.py) - checkout/checkin fire for every pool class
+@event.listens_for(engine.sync_engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_CONNECTIONS_IN_USE.inc()
+
+
+@event.listens_for(engine.sync_engine, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    DB_CONNECTIONS_IN_USE.dec()
+
+
 # Create session maker
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -48,11 +73,17 @@ class User(Base):
 class Assistant(Base):
     """Assistant model (one per user for PoC)"""
     __tablename__ = "assistants"
+    __table_args__ = (
+        Index("ix_assistants_user_id", "user_id"),  # Ownership checks, list/create per user
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     name = Column(String, default="Mein Assistent")
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Rolling summary of the chat history older than summary_until_id (conversation_memory.py)
+    history_summary = Column(Text, nullable=True)
+    summary_until_id = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Relationships
     user = relationship("User", back_populates="assistants")
@@ -63,6 +94,9 @@ class Assistant(Base):
 class Document(Base):
     """Document model"""
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_assistant_id_processed", "assistant_id", "processed"),  # Document list, chat retrieval
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     assistant_id = Column(Integer, ForeignKey("assistants.id", ondelete="CASCADE"), nullable=False)
@@ -70,6 +104,7 @@ class Document(Base):
     file_path = Column(String, nullable=False)
     file_type = Column(String, nullable=False)  # pdf, txt, docx
     file_size = Column(Integer, nullable=False)  # in bytes
+    sha256 = Column(String(64), nullable=True)  # Of the uploaded file, computed while streaming (uploads.py)
     uploaded_at = Column(DateTime, default=datetime.utcnow)
     processed = Column(Boolean, default=False)
 
@@ -80,17 +115,33 @@ class Document(Base):
 class Message(Base):
     """Chat message model"""
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_assistant_id_id", "assistant_id", "id"),  # History pages (keyset on id), delete chat
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     assistant_id = Column(Integer, ForeignKey("assistants.id", ondelete="CASCADE"), nullable=False)
     role = Column(String, nullable=False)  # user or assistant
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    source_type = Column(String, nullable=True)  # llm_only, rag, hybrid, error (assistant messages)
+    source_details = Column(String, nullable=True)  # e.g. "2 Dokumente", in the language of the request
 
     # Relationships
     assistant = relationship("Assistant", back_populates="messages")
 
 
+def legacy_source_type(content: str) -> Optional[str]:
+    """source_type of assistant messages stored before the column existed (old "📚 Quellen:" footer)"""
+    if "📚 Quellen:" not in content:
+        return "llm_only"  # No source info = likely llm_only
+    if "Web-Suche" in content:
+        return "hybrid"
+    if "Dokument" in content:
+        return "rag"
+    return None
+
+
 class MagicLink(Base):
     """Magic link tokens for authentication"""
     __tablename__ = "magic_links"
@@ -114,6 +165,48 @@ class SystemSettings(Base):
     updated_by = Column(String, nullable=True)  # Email of admin who changed it
 
 
+class ModelSwitchJob(Base):
+    """Admin model switch (model_jobs.py) - in the database so every worker can report its progress"""
+    __tablename__ = "model_switch_jobs"
+
+    id = Column(String(32), primary_key=True)
+    model_id = Column(String, nullable=False)
+    requested_by = Column(String, nullable=False)  # Email of the admin
+    state = Column(String(16), nullable=False, default="queued", index=True)  # queued, downloading, verifying, loading, done, failed
+    bytes_downloaded = Column(BigInteger, nullable=False, default=0)
+    total_bytes = Column(BigInteger, nullable=False, default=0)
+    resumed_bytes = Column(BigInteger, nullable=False, default=0)  # Already on disk when the download started
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)  # Heartbeat of the worker running the job
+    download_started_at = Column(DateTime, nullable=True)
+    load_started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    load_seconds = Column(Float, nullable=True)
+    error = Column(Text, nullable=True)
+
+
+class DeletionJob(Base):
+    """Cleanup of vectors and files after an account deletion (cleanup_jobs.py)
+
+    Inserted in the same transaction that deletes the user's rows, so a crash or restart
+    never loses track of data still to remove. No email or file names - ids and counts only.
+    """
+    __tablename__ = "deletion_jobs"
+
+    id = Column(String(32), primary_key=True)  # Random id, the receipt returned to the user
+    user_id = Column(Integer, nullable=False)  # Of the deleted account (no foreign key, the row is gone)
+    document_ids = Column(Text, nullable=False, default="[]")  # JSON list, one Chroma collection each
+    upload_dir = Column(String, nullable=False)
+    state = Column(String(16), nullable=False, default="queued", index=True)  # queued, running, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    collections_deleted = Column(Integer, nullable=False, default=0)
+    warnings = Column(Integer, nullable=False, default=0)  # e.g. collection of an unprocessed document missing
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    claimed_at = Column(DateTime, nullable=True)  # Lease of the worker running it
+    finished_at = Column(DateTime, nullable=True)
+
+
 async def init_db():
     """Initialize database"""
     async with engine.begin() as conn:
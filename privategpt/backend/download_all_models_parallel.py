@@ -1,10 +1,17 @@
 """Download ALL models in parallel for maximum speed (250 GB Railway Volume)"""
 import asyncio
+import logging
 import httpx
 from pathlib import Path
 from llm_models import AVAILABLE_MODELS
+from logging_config import Sampler, setup_logging
 import os
 
+logger = logging.getLogger(__name__)
+
+# One progress line per model every 5s instead of one per 8 KB chunk
+progress_sampler = Sampler(interval=5.0)
+
 # Use Railway Volume path if available, otherwise local path
 if Path("/app/models").exists():
     MODEL_DIR = Path("/app/models")
@@ -23,13 +30,10 @@ async def download_model_async(model_id: str, semaphore: asyncio.Semaphore):
         model_path = MODEL_DIR / model.filename
 
         if model_path.exists():
-            print(f"✅ [OK] {model.name} already exists ({model.size_gb:.2f} GB)")
+            logger.info("✅ [OK] %s already exists (%.2f GB)", model.name, model.size_gb)
             return True
 
-        print(f"\n📥 [DOWNLOAD] {model.name}")
-        print(f"   Size: {model.size_gb:.2f} GB")
-        print(f"   URL: {model.download_url}")
-        print(f"   This may take a few minutes...")
+        logger.info("📥 [DOWNLOAD] %s (%.2f GB) from %s", model.name, model.size_gb, model.download_url)
 
         try:
             async with httpx.AsyncClient(timeout=600.0, follow_redirects=True) as client:
@@ -45,15 +49,14 @@ async def download_model_async(model_id: str, semaphore: asyncio.Semaphore):
                             f.write(chunk)
                             downloaded += len(chunk)
 
-                            if total_size > 0:
-                                percent = (downloaded / total_size) * 100
-                                print(f"\r   {model.name}: {percent:.1f}%", end="", flush=True)
+                            if total_size > 0 and progress_sampler.ready(model_id):
+                                logger.info("   %s: %.1f%%", model.name, downloaded * 100 / total_size)
 
-                print(f"\n✅ [OK] {model.name} downloaded successfully!")
+                logger.info("✅ [OK] %s downloaded successfully!", model.name)
                 return True
 
         except Exception as e:
-            print(f"\n❌ [ERROR] Error downloading {model.name}: {e}")
+            logger.error("❌ [ERROR] Error downloading %s: %s", model.name, e)
             if model_path.exists():
                 model_path.unlink()  # Remove partial download
             return False
@@ -147,6 +150,7 @@ async def download_recommended_models():
 
 
 if __name__ == "__main__":
+    setup_logging()
     import sys
 
     if len(sys.argv) > 1:
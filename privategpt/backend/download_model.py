@@ -1,10 +1,28 @@
 """Download LLM models for Railway deployment"""
 import os
+import json
+import logging
+import time
+import hashlib
+import threading
+import http.client
+import urllib.error
 import urllib.request
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
 from llm_models import AVAILABLE_MODELS
+from logging_config import Sampler, setup_logging
 
+try:
+    import fcntl
+except ImportError:  # Windows (local development)
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
 
 # Use Railway Volume path if available, otherwise local path
 if Path("/app/models").exists():
@@ -13,28 +31,336 @@ else:
     MODEL_DIR = Path("./models")
 
 
-def download_model(model_id: str):
-    """Download a specific model if not exists"""
-    model = AVAILABLE_MODELS[model_id]
+# Downloader tuning
+CHUNK_SIZE = 1024 * 1024  # 1 MB reads
+SEGMENT_COUNT = 4  # Parallel HTTP Range segments for large files
+MIN_SEGMENT_SIZE = 64 * 1024 * 1024  # Files below 4 x 64 MB use fewer segments
+MAX_RETRIES = 8  # Reconnects per segment before giving up
+RETRY_DELAY = 2.0  # Seconds, doubled per retry (max 60)
+STATE_SAVE_INTERVAL = 16 * 1024 * 1024  # Persist segment progress every 16 MB
+LOCK_POLL_INTERVAL = 1.0  # Seconds between attempts to take another process's download lock
 
-    # Ensure model directory exists
-    MODEL_DIR.mkdir(parents=True, exist_ok=True)
+ProgressCallback = Callable[[int, int], None]  # (downloaded_bytes, total_bytes)
 
-    model_path = MODEL_DIR / model.filename
 
-    if model_path.exists():
-        print(f"✅ [OK] {model.name} already exists at {model_path}")
+class ChecksumMismatchError(RuntimeError):
+    """Downloaded file does not match the expected sha256"""
+
+
+class _LinkedEtagRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """Remember HuggingFace's X-Linked-Etag (sha256 of LFS files) from the redirect response"""
+
+    def __init__(self):
+        super().__init__()
+        self.linked_etag: Optional[str] = None
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        etag = headers.get("X-Linked-Etag")
+        if etag:
+            self.linked_etag = etag.strip('"')
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+def _is_sha256(value: Optional[str]) -> bool:
+    return bool(value) and len(value) == 64 and all(c in "0123456789abcdef" for c in value.lower())
+
+
+def _probe(url: str, timeout: float) -> Dict:
+    """Request the first byte to learn total size, Range support and the HF sha256"""
+    handler = _LinkedEtagRedirectHandler()
+    opener = urllib.request.build_opener(handler)
+    request = urllib.request.Request(url, headers={"Range": "bytes=0-0"})
+
+    with opener.open(request, timeout=timeout) as response:
+        headers = response.headers
+        accepts_ranges = response.status == 206
+        if accepts_ranges:
+            # Content-Range: bytes 0-0/12345
+            total_size = int(headers["Content-Range"].rsplit("/", 1)[1])
+        else:
+            total_size = int(headers.get("Content-Length") or 0)
+
+    linked_etag = handler.linked_etag or (headers.get("X-Linked-Etag") or "").strip('"')
+    return {
+        "total_size": total_size,
+        "accepts_ranges": accepts_ranges,
+        "sha256": linked_etag.lower() if _is_sha256(linked_etag) else None,
+    }
+
+
+def _plan_segments(total_size: int, segments: int, min_segment_size: int) -> List[Dict]:
+    """Split [0, total_size) into contiguous byte ranges"""
+    count = max(1, min(segments, total_size // max(min_segment_size, 1)))
+    size = total_size // count
+    plan = []
+    for i in range(count):
+        start = i * size
+        end = total_size - 1 if i == count - 1 else start + size - 1
+        plan.append({"start": start, "end": end, "done": 0})
+    return plan
+
+
+def _try_lock(f) -> bool:
+    """Non-blocking exclusive lock on an open file (released by the OS if the process dies)"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
         return True
+    except OSError:
+        return False
+
+
+@contextmanager
+def _download_lock(dest: Path) -> Iterator[bool]:
+    """Exclusive lock on <dest>.lock - one process per target owns <dest>.part and .part.json
+
+    railway_startup.sh and an admin model job (model_jobs.py) can download the same
+    model at the same time; the second one waits here instead of truncating the
+    first one's .part file. Yields True if another process held the lock.
+    """
+    lock_path = dest.with_name(dest.name + ".lock")
+    with open(lock_path, "a+b") as f:
+        waited = False
+        while not _try_lock(f):
+            if not waited:
+                logger.info("⏳ %s is being downloaded by another process, waiting...", dest.name)
+                waited = True
+            time.sleep(LOCK_POLL_INTERVAL)
+        try:
+            yield waited
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class _ResumableDownload:
+    """One file download into <dest>.part with a JSON state file for resume (caller holds _download_lock)"""
+
+    def __init__(
+        self,
+        url: str,
+        dest: Path,
+        segments: int,
+        min_segment_size: int,
+        max_retries: int,
+        retry_delay: float,
+        timeout: float,
+        progress: Optional[ProgressCallback],
+    ):
+        self.url = url
+        self.dest = dest
+        self.part_path = dest.with_name(dest.name + ".part")
+        self.state_path = dest.with_name(dest.name + ".part.json")
+        self.segments = segments
+        self.min_segment_size = min_segment_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self.progress = progress
+        self.lock = threading.Lock()
+        self.state: Dict = {}
+        self.downloaded = 0
+
+    def _load_state(self, total_size: int) -> Optional[Dict]:
+        """Previous progress, if it belongs to the same URL/size and the .part file still exists"""
+        if not (self.state_path.exists() and self.part_path.exists()):
+            return None
+        try:
+            state = json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if state.get("url") != self.url or state.get("total_size") != total_size:
+            return None
+        if self.part_path.stat().st_size != total_size:
+            return None
+        return state
+
+    def _save_state(self):
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        with self.lock:
+            tmp_path.write_text(json.dumps(self.state))
+            os.replace(tmp_path, self.state_path)
+
+    def _report(self, nbytes: int):
+        with self.lock:
+            self.downloaded += nbytes
+            downloaded = self.downloaded
+        if self.progress:
+            self.progress(downloaded, self.state["total_size"])
+
+    def _download_segment(self, segment: Dict):
+        """Fetch one byte range, reconnecting from the current offset on errors"""
+        attempt = 0
+        unsaved = 0
+
+        while segment["start"] + segment["done"] <= segment["end"]:
+            offset = segment["start"] + segment["done"]
+            request = urllib.request.Request(self.url, headers={"Range": f"bytes={offset}-{segment['end']}"})
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    if response.status != 206:
+                        raise IOError(f"Server ignored Range request (HTTP {response.status})")
+                    with open(self.part_path, "r+b") as f:
+                        f.seek(offset)
+                        while True:
+                            remaining = segment["end"] + 1 - (segment["start"] + segment["done"])
+                            if remaining <= 0:
+                                break
+                            chunk = response.read(min(CHUNK_SIZE, remaining))
+                            if not chunk:
+                                break
+                            f.write(chunk)
+                            with self.lock:
+                                segment["done"] += len(chunk)
+                            self._report(len(chunk))
+                            attempt = 0  # Progress resets the retry budget
+                            unsaved += len(chunk)
+                            if unsaved >= STATE_SAVE_INTERVAL:
+                                f.flush()
+                                self._save_state()
+                                unsaved = 0
+                if segment["start"] + segment["done"] <= segment["end"]:
+                    raise IOError("Connection closed before end of segment")
+            except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+                attempt += 1
+                self._save_state()
+                if attempt > self.max_retries:
+                    raise IOError(f"Segment {segment['start']}-{segment['end']} failed after {self.max_retries} retries: {e}")
+                delay = min(self.retry_delay * (2 ** (attempt - 1)), 60)
+                logger.warning("⚠️ Segment @ %s interrupted (%s), retry %s/%s in %.0fs...", offset, e, attempt, self.max_retries, delay)
+                time.sleep(delay)
+
+        self._save_state()
+
+    def _download_single_stream(self):
+        """Fallback for servers without Range support: plain GET, no resume"""
+        with urllib.request.urlopen(self.url, timeout=self.timeout) as response:
+            with open(self.part_path, "wb") as f:
+                for chunk in iter(lambda: response.read(CHUNK_SIZE), b""):
+                    f.write(chunk)
+                    self._report(len(chunk))
+
+    def run(self, expected_sha256: Optional[str]) -> Path:
+        probe = _probe(self.url, self.timeout)
+        total_size = probe["total_size"]
+        expected_sha256 = (expected_sha256 or probe["sha256"] or "").lower() or None
+
+        if probe["accepts_ranges"] and total_size > 0:
+            state = self._load_state(total_size)
+            if state:
+                logger.info("↩️ Resuming from %.2f GB", sum(seg['done'] for seg in state['segments']) / (1024**3))
+            else:
+                state = {
+                    "url": self.url,
+                    "total_size": total_size,
+                    "segments": _plan_segments(total_size, self.segments, self.min_segment_size),
+                }
+                with open(self.part_path, "wb") as f:
+                    f.truncate(total_size)  # Sparse preallocation, segments write at their offsets
+            self.state = state
+            self._save_state()
+
+            self.downloaded = 0
+            self._report(sum(seg["done"] for seg in state["segments"]))
+
+            pending = [seg for seg in state["segments"] if seg["start"] + seg["done"] <= seg["end"]]
+            with ThreadPoolExecutor(max_workers=max(1, len(pending))) as pool:
+                for future in [pool.submit(self._download_segment, seg) for seg in pending]:
+                    future.result()
+        else:
+            logger.warning("⚠️ Server does not support resume, downloading in a single stream")
+            self.state = {"url": self.url, "total_size": total_size, "segments": []}
+            self._download_single_stream()
+
+        if expected_sha256:
+            logger.info("🔐 Verifying sha256...")
+            actual = _sha256_file(self.part_path)
+            if actual != expected_sha256:
+                # Corrupt data cannot be resumed - start over next time
+                self.part_path.unlink(missing_ok=True)
+                self.state_path.unlink(missing_ok=True)
+                raise ChecksumMismatchError(f"sha256 mismatch: expected {expected_sha256}, got {actual}")
+        else:
+            logger.warning("⚠️ No sha256 known for this file, skipping verification")
+
+        os.replace(self.part_path, self.dest)  # Atomic: dest only ever contains a complete file
+        self.state_path.unlink(missing_ok=True)
+        return self.dest
+
+
+def fetch_file(
+    url: str,
+    dest: Path,
+    expected_sha256: Optional[str] = None,
+    segments: int = SEGMENT_COUNT,
+    min_segment_size: int = MIN_SEGMENT_SIZE,
+    max_retries: int = MAX_RETRIES,
+    retry_delay: float = RETRY_DELAY,
+    timeout: float = 60.0,
+    progress: Optional[ProgressCallback] = None,
+) -> Path:
+    """Resumable, segmented, checksum-verified download
+
+    Downloads into <dest>.part using HTTP Range requests (parallel segments for large
+    files), persists progress in <dest>.part.json so an interrupted download continues
+    where it stopped, verifies the sha256 (argument, or HuggingFace X-Linked-Etag) and
+    atomically renames to dest on success. A lock file per target keeps concurrent
+    downloads of the same file (other processes) from sharing the .part file; if
+    another process finished dest while we waited, its file is used.
+
+    Raises:
+        ChecksumMismatchError: sha256 does not match (partial file is discarded)
+        IOError: a segment failed after max_retries reconnects (partial file is kept)
+    """
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    with _download_lock(dest) as waited:
+        if waited and dest.exists():
+            logger.info("✅ %s was completed by the other process", dest.name)
+            return dest
+        download = _ResumableDownload(
+            url, dest, segments, min_segment_size, max_retries, retry_delay, timeout, progress
+        )
+        return download.run(expected_sha256)
+
+
+def partial_download_size(model_id: str) -> int:
+    """Bytes already present in a model's .part file"""
+    model = AVAILABLE_MODELS[model_id]
+    state_path = MODEL_DIR / (model.filename + ".part.json")
+    try:
+        state = json.loads(state_path.read_text())
+        return sum(seg["done"] for seg in state["segments"])
+    except (OSError, ValueError, KeyError):
+        return 0
+
+
+def check_disk_space(model_id: str):
+    """Raise RuntimeError if the model (minus already downloaded bytes) does not fit on disk"""
+    model = AVAILABLE_MODELS[model_id]
+    MODEL_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Check available disk space
     try:
         stat = shutil.disk_usage(MODEL_DIR)
         available_gb = stat.free / (1024**3)
-        required_gb = model.size_gb + 0.5  # Add 500MB buffer
+        # Sparse .part file: already downloaded bytes are on disk, the rest is still needed
+        required_gb = model.size_gb - partial_download_size(model_id) / (1024**3) + 0.5  # Add 500MB buffer
 
-        print(f"📥 [DOWNLOAD] {model.name} from HuggingFace...")
-        print(f"   Model Size: ~{model.size_gb:.2f} GB")
-        print(f"   Available Space: {available_gb:.2f} GB")
+        logger.debug("💾 Available disk space: %.2f GB", available_gb)
 
         if available_gb < required_gb:
             error_msg = (
@@ -43,33 +369,50 @@ def download_model(model_id: str):
                 f"Railway Volume ist zu klein. Bitte nutze ein kleineres Modell (z.B. Qwen2.5-3B oder DeepSeek-R1-1.5B) "
                 f"oder erhöhe das Railway Volume auf mindestens {int(required_gb + 1)} GB."
             )
-            print(f"\n❌ [ERROR] {error_msg}")
+            logger.error("❌ [ERROR] %s", error_msg)
             raise RuntimeError(error_msg)
 
-        print(f"   This may take a few minutes...")
-
     except RuntimeError:
         raise  # Re-raise disk space error
     except Exception as e:
-        print(f"   ⚠️  Could not check disk space: {e}")
-        print(f"   Attempting download anyway...")
+        logger.warning("⚠️ Could not check disk space: %s - attempting download anyway", e)
+
 
-    def progress(block_num, block_size, total_size):
-        downloaded = block_num * block_size
-        if total_size > 0:
-            percent = min(downloaded * 100 / total_size, 100)
-            print(f"\r   Progress: {percent:.1f}%", end="", flush=True)
+def download_model(model_id: str, progress: Optional[ProgressCallback] = None):
+    """Download a specific model if not exists"""
+    model = AVAILABLE_MODELS[model_id]
+
+    # Ensure model directory exists
+    MODEL_DIR.mkdir(parents=True, exist_ok=True)
+
+    model_path = MODEL_DIR / model.filename
+
+    if model_path.exists():
+        logger.info("✅ [OK] %s already exists at %s", model.name, model_path)
+        return True
+
+    logger.info("📥 [DOWNLOAD] %s from HuggingFace (~%.2f GB)...", model.name, model.size_gb)
+    check_disk_space(model_id)
+
+    # Progress callback runs per 1 MB read - log at most every 5s
+    progress_sampler = Sampler(interval=5.0)
+
+    def log_progress(downloaded, total_size):
+        if total_size > 0 and progress_sampler.ready():
+            logger.info("   %s: %.1f%%", model.name, min(downloaded * 100 / total_size, 100.0))
+        if progress:
+            progress(downloaded, total_size)
 
     try:
-        urllib.request.urlretrieve(model.download_url, model_path, progress)
-        print(f"\n✅ [OK] {model.name} downloaded successfully!")
+        fetch_file(model.download_url, model_path, expected_sha256=model.sha256, progress=log_progress)
+        logger.info("✅ [OK] %s downloaded successfully!", model.name)
         return True
+    except ChecksumMismatchError as e:
+        logger.error("❌ [ERROR] %s is corrupt: %s - partial download discarded, next attempt starts from scratch", model.name, e)
+        return False
     except Exception as e:
-        print(f"\n❌ [ERROR] Error downloading {model.name}: {e}")
-        print(f"   Please download manually from:")
-        print(f"   {model.download_url}")
-        if model_path.exists():
-            model_path.unlink()  # Remove partial download
+        logger.error("❌ [ERROR] Error downloading %s: %s - partial download kept, run again to resume "
+                     "(or download manually from %s)", model.name, e, model.download_url)
         return False
 
 
@@ -174,6 +517,7 @@ def download_railway_safe_models():
 
 
 if __name__ == "__main__":
+    setup_logging()
     import sys
     if len(sys.argv) > 1:
         if sys.argv[1] == "--all":
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Query-plan check: EXPLAIN for every hot query of main.py/auth.py (SQLite and PostgreSQL)
+
+Baut die Abfragen mit denselben SQLAlchemy-Ausdrücken wie die Endpoints, lässt sie von der
+Datenbank erklären und markiert Full Table Scans:
+- SQLite:     EXPLAIN QUERY PLAN, "SCAN <table>" ohne Index = Full Scan
+- PostgreSQL: EXPLAIN mit enable_seqscan = off (auf kleinen Tabellen wählt der Planer
+              sonst immer Seq Scan) - ein verbleibender "Seq Scan" heißt: kein passender Index
+Zusätzlich wird angezeigt, wenn ORDER BY nicht über den Index läuft (Sortierung im Speicher).
+
+Usage:
+    python explain_queries.py                                   # DATABASE_URL aus .env
+    python explain_queries.py --database-url sqlite+aiosqlite:///./privategpt.db
+    python explain_queries.py --database-url postgresql://user:pw@localhost/privategpt --json
+Exit code 1, wenn eine Abfrage ohne Index läuft (für CI).
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+from typing import Dict, List, Tuple
+
+from sqlalchemy import and_, delete, or_, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from config import get_settings
+from database import Base, User, Assistant, Document, Message, MagicLink, SystemSettings
+
+settings = get_settings()
+
+
+def hot_queries() -> List[Tuple[str, object]]:
+    """(name, statement) - keep in sync with the endpoints"""
+    assistant_ids = select(Assistant.id).where(Assistant.user_id == 1).scalar_subquery()
+    return [
+        ("auth: user by email", select(User).where(User.email == "user@example.org")),
+        ("assistants of user", select(Assistant).where(Assistant.user_id == 1)),
+        ("assistant ownership", select(Assistant).where(Assistant.id == 1, Assistant.user_id == 1)),
+        ("documents of assistant", select(Document).where(Document.assistant_id == 1)
+            .order_by(Document.uploaded_at.desc())),
+        ("chat: owned assistant + processed documents", select(Assistant, Document.id)
+            .outerjoin(Document, and_(Document.assistant_id == Assistant.id, Document.processed == True))
+            .where(Assistant.id == 1, Assistant.user_id == 1)),
+        ("chat: history window", select(Message.id, Message.role, Message.content)
+            .where(Message.assistant_id == 1, Message.id > 0,
+                   or_(Message.source_type.is_(None), Message.source_type != "error"))
+            .order_by(Message.id.desc()).limit(20)),
+        ("history: latest page", select(Message).where(Message.assistant_id == 1)
+            .order_by(Message.id.desc()).limit(51)),
+        ("history: page before cursor", select(Message).where(Message.assistant_id == 1, Message.id < 1000)
+            .order_by(Message.id.desc()).limit(51)),
+        ("delete chat history", delete(Message).where(Message.assistant_id == 1)),
+        ("delete user: document ids", select(Document.id).where(Document.assistant_id.in_(assistant_ids))),
+        ("delete user: messages", delete(Message).where(Message.assistant_id.in_(assistant_ids))),
+        ("magic link by token", select(MagicLink).where(MagicLink.token == "t", MagicLink.used == False)),
+        ("llm model setting", select(SystemSettings).where(SystemSettings.key == "llm_model")),
+    ]
+
+
+def full_scans(dialect: str, plan: List[str]) -> List[str]:
+    """Tables read without an index"""
+    if dialect == "sqlite":
+        # "SCAN messages" is a full scan, "SCAN messages USING INDEX ..." is not
+        return [m.group(1) for line in plan
+                if (m := re.search(r"\bSCAN (\w+)(?!.*USING (?:COVERING )?INDEX)", line))]
+    return [m.group(1) for line in plan if (m := re.search(r"Seq Scan on (\w+)", line))]
+
+
+async def explain_all(database_url: str) -> List[Dict]:
+    if database_url.startswith("postgresql://"):
+        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    engine = create_async_engine(database_url)
+    dialect = engine.dialect.name
+    results = []
+
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)  # Same as init_db - only missing tables
+
+        # Never committed - the transaction is rolled back when the connection closes
+        async with engine.connect() as conn:
+            if dialect == "postgresql":
+                await conn.execute(text("SET LOCAL enable_seqscan = off"))
+
+            for name, statement in hot_queries():
+                sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+                prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+                rows = (await conn.execute(text(prefix + sql))).fetchall()
+                # SQLite: (id, parent, notused, detail), PostgreSQL: (QUERY PLAN,)
+                plan = [str(row[-1]) for row in rows]
+                results.append({
+                    "query": name,
+                    "plan": plan,
+                    "full_scans": full_scans(dialect, plan),
+                    "sorts": [line for line in plan if "TEMP B-TREE" in line or line.lstrip().startswith("Sort ")],
+                    "sql": sql,
+                })
+    finally:
+        await engine.dispose()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of plans")
+    args = parser.parse_args()
+
+    results = asyncio.run(explain_all(args.database_url))
+    missing = [r for r in results if r["full_scans"]]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for r in results:
+            marker = f"❌ full scan: {', '.join(r['full_scans'])}" if r["full_scans"] else "✅"
+            if r["sorts"]:
+                marker += " (sorts in memory)"
+            print(f"{marker}  {r['query']}")
+            for line in r["plan"]:
+                print(f"      {line}")
+        print(f"\n{len(results) - len(missing)}/{len(results)} queries use an index")
+
+    sys.exit(1 if missing else 0)
+
+
+if __name__ == "__main__":
+    main()
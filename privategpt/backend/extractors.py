@@ -0,0 +1,156 @@
+"""Extractor Registry - Text aus hochgeladenen Dateien stückweise lesen (PDF, DOCX, TXT, Markdown)
+
+Jeder Extractor liefert TextUnits (Seite, Absatz) mit Positions-Metadaten als Generator -
+das Dokument liegt nie komplett als ein String im Speicher. chunker.py zerlegt den Strom in
+Chunks, die beide Engines (rag.py, rag_llamaindex.py) batchweise einbetten.
+Neues Format = neue Funktion mit @register_extractor.
+"""
+import os
+import zipfile
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from config import get_settings
+from pdf_backends import get_pdf_backend
+
+settings = get_settings()
+
+MAX_UNIT_CHARS = 8000  # Longer paragraphs (e.g. a TXT without blank lines) are cut into pieces
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+pdf_pages = get_pdf_backend(settings.pdf_backend)  # PyPDF2, pypdfium2 or pymupdf (pdf_backends.py)
+
+
+@dataclass
+class TextUnit:
+    """One page/paragraph of a document, metadata = position (page, paragraph, line, heading)"""
+    text: str
+    metadata: Dict[str, object] = field(default_factory=dict)
+
+
+Extractor = Callable[[str], Iterator[TextUnit]]
+
+_extractors: Dict[str, Extractor] = {}
+_suffixes: Dict[str, str] = {}  # ".md" -> "md"
+
+
+def register_extractor(file_type: str, suffixes: Tuple[str, ...]):
+    """Decorator: extractor for file_type (stored in Document.file_type), chosen by file suffix"""
+    def decorator(extractor: Extractor) -> Extractor:
+        _extractors[file_type] = extractor
+        for suffix in suffixes:
+            _suffixes[suffix.lower()] = file_type
+        return extractor
+    return decorator
+
+
+def file_type_for(filename: str) -> Optional[str]:
+    """Registered file type of an upload, None if unsupported"""
+    return _suffixes.get(os.path.splitext(filename)[1].lower())
+
+
+def supported_suffixes() -> List[str]:
+    return sorted(_suffixes)
+
+
+def extract(file_path: str, file_type: str) -> Iterator[TextUnit]:
+    """Text units of a stored document, skipping empty ones"""
+    if file_type not in _extractors:
+        raise ValueError(f"No extractor for file type {file_type!r}")
+    for unit in _extractors[file_type](file_path):
+        if unit.text.strip():
+            yield unit
+
+
+def _split_long(text: str, metadata: Dict[str, object]) -> Iterator[TextUnit]:
+    for start in range(0, len(text), MAX_UNIT_CHARS):
+        yield TextUnit(text[start:start + MAX_UNIT_CHARS], dict(metadata))
+
+
+def _paragraphs(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """(first line number, text) of blank-line separated paragraphs"""
+    buffer: List[str] = []
+    start = 1
+    size = 0
+    for number, line in enumerate(lines, start=1):
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            if buffer:
+                yield start, "\n".join(buffer)
+                buffer, size = [], 0
+            continue
+        if not buffer:
+            start = number
+        buffer.append(line)
+        size += len(line) + 1
+        if size >= MAX_UNIT_CHARS:
+            yield start, "\n".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield start, "\n".join(buffer)
+
+
+@register_extractor("pdf", (".pdf",))
+def extract_pdf(file_path: str) -> Iterator[TextUnit]:
+    """One unit per page (every backend parses page content on access)"""
+    for number, text in enumerate(pdf_pages(file_path), start=1):
+        yield TextUnit(text, {"page": number})
+
+
+@register_extractor("docx", (".docx",))
+def extract_docx(file_path: str) -> Iterator[TextUnit]:
+    """One unit per paragraph, streamed from word/document.xml (iterparse, no full DOM)
+
+    Table cells are paragraphs too; the current heading (Heading*/Überschrift* style)
+    goes into the metadata.
+    """
+    heading = None
+    number = 0
+    with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as xml:
+        for _, element in ElementTree.iterparse(xml, events=("end",)):
+            if element.tag != f"{WORD_NS}p":
+                continue
+            text = "".join(
+                (node.text or "") if node.tag == f"{WORD_NS}t" else ("\t" if node.tag == f"{WORD_NS}tab" else "\n")
+                for node in element.iter()
+                if node.tag in (f"{WORD_NS}t", f"{WORD_NS}tab", f"{WORD_NS}br")
+            )
+            style = element.find(f"{WORD_NS}pPr/{WORD_NS}pStyle")
+            style_name = style.get(f"{WORD_NS}val", "") if style is not None else ""
+            element.clear()  # Keep memory flat on large documents
+
+            if not text.strip():
+                continue
+            number += 1
+            # Style ids: "Heading1", German Word "berschrift1" (Ü dropped from the id), "Title"
+            if style_name.lower().startswith(("heading", "berschrift", "überschrift", "title")):
+                heading = text.strip()[:200]
+            metadata = {"paragraph": number}
+            if heading:
+                metadata["heading"] = heading
+            yield from _split_long(text, metadata)
+
+
+@register_extractor("txt", (".txt",))
+def extract_txt(file_path: str) -> Iterator[TextUnit]:
+    """One unit per blank-line separated paragraph, read line by line"""
+    with open(file_path, encoding="utf-8", errors="replace") as file:
+        for number, (line, text) in enumerate(_paragraphs(file), start=1):
+            yield TextUnit(text, {"paragraph": number, "line": line})
+
+
+@register_extractor("md", (".md", ".markdown"))
+def extract_markdown(file_path: str) -> Iterator[TextUnit]:
+    """Like TXT, plus the nearest "#" heading as metadata (headings stay in the text)"""
+    heading = None
+    with open(file_path, encoding="utf-8", errors="replace") as file:
+        for number, (line, text) in enumerate(_paragraphs(file), start=1):
+            first_line = text.lstrip().split("\n", 1)[0]
+            if first_line.startswith("#"):
+                heading = first_line.lstrip("#").strip()[:200] or heading
+            metadata = {"paragraph": number, "line": line}
+            if heading:
+                metadata["heading"] = heading
+            yield TextUnit(text, metadata)
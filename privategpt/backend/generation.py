@@ -0,0 +1,146 @@
+"""Generation Control - Abbrechbare Generierung und Inference-Slot für das geteilte llama.cpp Modell
+
+Ein Chat-Request bekommt ein CancellationToken. Trennt der Client die Verbindung
+(Tab geschlossen, Frage erneut gesendet), wird das Token gesetzt und die
+Generierung stoppt vor dem nächsten Token - der Slot ist sofort wieder frei.
+"""
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Iterable, Iterator, Optional
+
+from metrics import INFERENCE_BUSY, INFERENCE_WAITING, observe_generation
+
+
+class GenerationCancelled(Exception):
+    """Generation was stopped because the token was cancelled"""
+
+
+class CancellationToken:
+    """Thread-safe cancel flag shared by the request handler and the generation thread"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str = "cancelled"):
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise GenerationCancelled(self.reason)
+
+
+class InferenceSlot:
+    """One generation at a time on the shared llama.cpp context (contexts are not thread-safe)"""
+
+    def __init__(self, poll_interval: float = 0.1):
+        self._lock = threading.Lock()
+        self._poll_interval = poll_interval
+        self._state_lock = threading.Lock()
+        self.waiting = 0
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    @contextmanager
+    def acquire(self, token: Optional[CancellationToken] = None):
+        """Hold the slot; a request cancelled while queued gives up without generating"""
+        with self._state_lock:
+            self.waiting += 1
+            INFERENCE_WAITING.inc()
+        try:
+            while not self._lock.acquire(timeout=self._poll_interval):
+                if token is not None:
+                    token.raise_if_cancelled()
+        finally:
+            with self._state_lock:
+                self.waiting -= 1
+                INFERENCE_WAITING.dec()
+
+        INFERENCE_BUSY.set(1)
+        try:
+            if token is not None:
+                token.raise_if_cancelled()
+            yield
+        finally:
+            INFERENCE_BUSY.set(0)
+            self._lock.release()
+
+
+# Global instance - shared by rag engines, warm-up and the inference service
+inference_slot = InferenceSlot()
+
+
+def iter_chunks(chunks: Iterable[Dict], token: Optional[CancellationToken]) -> Iterator[Dict]:
+    """Yield llama-cpp stream chunks, stopping between tokens once the token is cancelled"""
+    try:
+        for chunk in chunks:
+            if token is not None:
+                token.raise_if_cancelled()
+            yield chunk
+    finally:
+        # Closing the llama-cpp generator ends generation immediately
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def stream_local(llm, prompt: str, token: Optional[CancellationToken], **params) -> Iterator[Dict]:
+    """Stream a completion from an in-process llama_cpp.Llama while holding the inference slot"""
+    params.pop("stream", None)
+    with inference_slot.acquire(token):
+        prompt_tokens = len(llm.tokenize(prompt.encode("utf-8")))
+        yield from iter_chunks(observe_generation(llm(prompt, stream=True, **params), prompt_tokens), token)
+
+
+def collect_completion(chunks: Iterable[Dict], token: Optional[CancellationToken] = None) -> Dict:
+    """Join stream chunks into the dict llama_cpp.Llama returns for stream=False"""
+    text = []
+    finish_reason = None
+    completion_tokens = 0
+
+    for chunk in iter_chunks(chunks, token):
+        choice = chunk["choices"][0]
+        text.append(choice["text"])
+        finish_reason = choice.get("finish_reason") or finish_reason
+        completion_tokens += 1
+
+    return {
+        "object": "text_completion",
+        "choices": [{"text": "".join(text), "index": 0, "logprobs": None, "finish_reason": finish_reason}],
+        "usage": {"completion_tokens": completion_tokens},
+    }
+
+
+async def watch_disconnect(request, token: CancellationToken, interval: float = 0.25):
+    """Cancel the token as soon as the HTTP client goes away"""
+    while not token.cancelled:
+        if await request.is_disconnected():
+            token.cancel("client disconnected")
+            return
+        await asyncio.sleep(interval)
+
+
+@asynccontextmanager
+async def cancel_on_disconnect(request):
+    """Token that is cancelled when the client of `request` disconnects
+
+    Leaving the block cancels the token too: if the request task itself is cancelled
+    (server shutdown, timeout), the generation thread behind asyncio.to_thread would
+    otherwise keep running and hold the inference slot.
+    """
+    token = CancellationToken()
+    watcher = asyncio.create_task(watch_disconnect(request, token))
+    try:
+        yield token
+    finally:
+        watcher.cancel()
+        token.cancel("request ended")
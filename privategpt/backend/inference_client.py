@@ -0,0 +1,149 @@
+"""Inference Client - Generation & Embeddings über den lokalen Inference-Service (inference_server.py)"""
+import json
+import logging
+import time
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+
+from config import get_settings
+from readiness import readiness
+from tracing import traceparent_headers
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class InferenceClient:
+    """HTTP client for inference_server.py over localhost TCP or a Unix socket"""
+
+    def __init__(self, url: Optional[str] = None, timeout: Optional[float] = None):
+        """
+        Args:
+            url: "http://127.0.0.1:8001" or "unix:/path/to/socket" (default: aus config)
+            timeout: Request timeout in seconds (default: aus config)
+        """
+        self.url = url if url is not None else settings.inference_url
+        self.timeout = timeout or settings.inference_timeout
+        self.model_id: Optional[str] = None  # Last model reported by the service
+        self._client: Optional[httpx.Client] = None
+
+    @property
+    def enabled(self) -> bool:
+        """True if generation/embeddings are delegated to the inference service"""
+        return bool(self.url)
+
+    def _client_kwargs(self) -> Dict:
+        if self.url.startswith("unix:"):
+            socket_path = self.url[len("unix:"):]
+            return {
+                "base_url": "http://inference",
+                "transport": httpx.HTTPTransport(uds=socket_path),
+                "timeout": self.timeout,
+            }
+        return {"base_url": self.url, "timeout": self.timeout}
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            self._client = httpx.Client(**self._client_kwargs())
+        return self._client
+
+    def health(self) -> Dict:
+        """Service status: model_id, loaded, ready, components"""
+        response = self.client.get("/health", timeout=5.0)
+        response.raise_for_status()
+        data = response.json()
+        self.model_id = data.get("model_id")
+        return data
+
+    def wait_until_ready(self, timeout: float = 900.0, interval: float = 2.0) -> Dict:
+        """Block until the service reports ready (model loaded and warm)"""
+        deadline = time.time() + timeout
+        last_error = None
+
+        while time.time() < deadline:
+            try:
+                data = self.health()
+                if data.get("ready"):
+                    return data
+            except httpx.HTTPError as e:
+                last_error = e
+            time.sleep(interval)
+
+        raise TimeoutError(f"Inference service at {self.url} not ready after {timeout:.0f}s: {last_error}")
+
+    def complete(self, prompt: str, **params) -> Dict:
+        """Completion with llama-cpp parameters, returns the llama-cpp completion dict"""
+        response = self.client.post(
+            "/v1/completions", json={"prompt": prompt, **params}, headers=traceparent_headers()
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def stream_complete(self, prompt: str, **params) -> Iterator[Dict]:
+        """Stream llama-cpp chunks; closing the generator closes the connection and stops generation"""
+        params.pop("echo", None)
+        with self.client.stream(
+            "POST", "/v1/completions",
+            json={"prompt": prompt, "stream": True, **params},
+            headers=traceparent_headers(),
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise RuntimeError(f"Inference service error: {chunk['error']}")
+                yield chunk
+
+    def embed(self, texts: List[str], normalize: bool = False) -> List[List[float]]:
+        """Embed texts with the service's sentence-transformers model"""
+        response = self.client.post("/v1/embeddings", json={"texts": texts, "normalize": normalize})
+        response.raise_for_status()
+        return response.json()["embeddings"]
+
+    def set_model(self, model_id: str) -> Dict:
+        """Ask the service to switch models (it loads in background and keeps serving the old one)"""
+        response = self.client.post("/v1/model", json={"model_id": model_id})
+        response.raise_for_status()
+        return response.json()
+
+    def switch_model(self, model_id: str, timeout: float = 1800.0, interval: float = 2.0) -> Dict:
+        """Switch models and block until model_id is active on the service"""
+        self.set_model(model_id)
+        deadline = time.time() + timeout
+
+        while time.time() < deadline:
+            time.sleep(interval)
+            data = self.health()
+            if data.get("switching_to"):
+                continue
+            if data.get("model_id") == model_id:
+                return data
+            raise RuntimeError(data.get("switch_error") or f"Inference service did not switch to {model_id}")
+
+        raise TimeoutError(f"Inference service did not load {model_id} within {timeout:.0f}s")
+
+    def is_model_loaded(self) -> bool:
+        """Check if the service has a model in RAM (False if unreachable)"""
+        try:
+            return bool(self.health().get("loaded"))
+        except httpx.HTTPError:
+            return False
+
+    def warm_up(self):
+        """Wait for the service and run a one-token completion (blocking)"""
+        try:
+            with readiness.track("llm", detail=f"remote: {self.url}"):
+                # The service itself waits up to WARMUP_MODEL_WAIT_SECONDS for the model download
+                self.wait_until_ready(timeout=settings.warmup_model_wait_seconds + self.timeout)
+                self.complete("Hallo", max_tokens=1)
+            logger.info("🔥 [WARM-UP] Inference service %s ready (%s)", self.url, self.model_id)
+        except Exception as e:
+            logger.exception("❌ [WARM-UP] Inference service failed: %s", e)
+
+
+# Global instance
+inference_client = InferenceClient()
@@ -0,0 +1,216 @@
+"""Local Inference Service - Besitzt LLM + Embedding-Modell, geteilt von allen API-Workern
+
+Start (Unix Socket):
+    uvicorn inference_server:app --uds /tmp/privategpt-inference.sock
+    INFERENCE_URL=unix:/tmp/privategpt-inference.sock uvicorn main:app --workers 4
+
+Start (localhost HTTP):
+    uvicorn inference_server:app --host 127.0.0.1 --port 8001
+    INFERENCE_URL=http://127.0.0.1:8001 uvicorn main:app --workers 4
+
+Immer nur EINEN Inference-Prozess starten (keine --workers), sonst wird das Modell dupliziert.
+"""
+import asyncio
+import contextvars
+import json
+import logging
+import os
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
+
+from config import get_settings
+from logging_config import setup_logging
+
+setup_logging()  # Before llm_runtime is imported - its startup logs already go through the queue
+
+from readiness import readiness
+from llm_memory import process_memory, describe_memory_strategy
+from speculative import speculative_status
+import metrics
+from tracing import TracingMiddleware
+from generation import (
+    GenerationCancelled, CancellationToken, inference_slot, stream_local, collect_completion, watch_disconnect
+)
+from llm_models import AVAILABLE_MODELS
+import llm_runtime
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+app = FastAPI(
+    title="Dabrock PrivateGxT Inference Service",
+    description="Lokaler LLM- und Embedding-Service für die API-Worker",
+    version="0.1.0"
+)
+
+# Tracing - continues the API trace via traceparent (spans prompt_eval/generation)
+app.add_middleware(TracingMiddleware, service_name="privategpt-inference")
+
+# Running model switch (target model id and last error)
+_switch = {"target": None, "error": None}
+
+
+class CompletionRequest(BaseModel):
+    # Defaults match llama_cpp.Llama.__call__
+    prompt: str
+    max_tokens: int = 16
+    temperature: float = 0.8
+    top_p: float = 0.95
+    top_k: int = 40
+    repeat_penalty: float = 1.1
+    stop: Optional[List[str]] = None
+    stream: bool = False  # NDJSON chunks; closing the connection stops generation
+
+
+class EmbeddingRequest(BaseModel):
+    texts: List[str]
+    normalize: bool = False
+
+
+class ModelRequest(BaseModel):
+    model_id: str
+
+
+@app.on_event("startup")
+async def startup():
+    """Load model and embeddings in background"""
+    # Database and vector store belong to the API workers
+    readiness.skip("database", "not owned by inference service")
+    readiness.skip("vector_store", "not owned by inference service")
+
+    if settings.warmup_on_startup:
+        app.state.warmup_task = asyncio.create_task(asyncio.to_thread(_warm_up))
+    else:
+        readiness.skip("embeddings", "warm-up disabled")
+        readiness.skip("llm", "warm-up disabled, loads on first request")
+
+
+def _warm_up():
+    llm_runtime.warm_up_embeddings()
+    llm_runtime.warm_up_llm()
+
+
+@app.get("/health")
+async def health():
+    """Service status (model, readiness, memory)"""
+    return {
+        "model_id": llm_runtime.get_current_model_id(),
+        "loaded": llm_runtime.is_llm_loaded(),
+        "ready": readiness.is_ready(),
+        "busy": inference_slot.busy,
+        "waiting": inference_slot.waiting,
+        "switching_to": _switch["target"],
+        "switch_error": _switch["error"],
+        "pid": os.getpid(),
+        "components": readiness.snapshot(),
+        "memory_strategy": describe_memory_strategy(),
+        "memory": process_memory(),
+        "speculative": speculative_status()
+    }
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus metrics of the inference process (prompt eval, generation, tokens, queue depth)"""
+    content, content_type = metrics.render()
+    return Response(content=content, media_type=content_type)
+
+
+@app.post("/v1/completions")
+async def completions(request: CompletionRequest, http_request: Request):
+    """Run a completion; generation stops between tokens when the client disconnects"""
+    llm = await asyncio.to_thread(llm_runtime.get_llm)
+    if llm is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="No LLM available (model file missing or llama-cpp-python not installed)"
+        )
+
+    params = request.model_dump(exclude={"prompt", "stream"})
+    token = CancellationToken()
+    watcher = asyncio.create_task(watch_disconnect(http_request, token))
+
+    if not request.stream:
+        try:
+            return await asyncio.to_thread(
+                collect_completion, stream_local(llm, request.prompt, token, echo=False, **params), token
+            )
+        except GenerationCancelled:
+            logger.info("🛑 [INFERENCE] Generation cancelled: %s", token.reason)
+            return JSONResponse(status_code=499, content={"detail": token.reason})
+        finally:
+            watcher.cancel()
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def produce():
+        # Runs in a thread: owns the slot and releases it as soon as the token is cancelled
+        try:
+            for chunk in stream_local(llm, request.prompt, token, echo=False, **params):
+                loop.call_soon_threadsafe(queue.put_nowait, chunk)
+        except GenerationCancelled:
+            logger.info("🛑 [INFERENCE] Generation cancelled: %s", token.reason)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, {"error": str(e)})
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    async def body():
+        # Copy the context so prompt_eval/generation spans land in this request's trace
+        loop.run_in_executor(None, contextvars.copy_context().run, produce)
+        try:
+            while (chunk := await queue.get()) is not None:
+                yield json.dumps(chunk) + "\n"
+        finally:
+            token.cancel("client disconnected")
+            watcher.cancel()
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@app.post("/v1/embeddings")
+def embeddings(request: EmbeddingRequest):
+    """Embed texts with the shared sentence-transformers model"""
+    return {"embeddings": llm_runtime.embed(request.texts, normalize=request.normalize)}
+
+
+@app.post("/v1/model")
+async def set_model(request: ModelRequest):
+    """Switch model: load the new one in background, keep serving the current one until it is ready"""
+    if request.model_id not in AVAILABLE_MODELS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid model_id: {request.model_id}"
+        )
+    if _switch["target"]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Already switching to {_switch['target']}"
+        )
+
+    _switch.update(target=request.model_id, error=None)
+    app.state.switch_task = asyncio.create_task(_run_switch(request.model_id))
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={"model_id": request.model_id, "loaded": False}
+    )
+
+
+async def _run_switch(model_id: str):
+    try:
+        await asyncio.to_thread(llm_runtime.switch_llm, model_id)
+    except Exception as e:
+        _switch["error"] = str(e)
+        logger.error("❌ [SWITCH] Loading %s failed: %s", model_id, e)
+    finally:
+        _switch["target"] = None
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="127.0.0.1", port=8001)
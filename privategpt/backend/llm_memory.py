@@ -0,0 +1,68 @@
+"""LLM Memory Strategy - mmap/mlock Loading und RSS-Reporting (shared vs. private)"""
+import os
+from typing import Dict, Optional
+
+from config import get_settings
+
+settings = get_settings()
+
+# smaps_rollup fields (kB) that we report
+_SMAPS_FIELDS = {
+    "Rss": "rss_mb",
+    "Pss": "pss_mb",
+    "Shared_Clean": "shared_clean_mb",
+    "Shared_Dirty": "shared_dirty_mb",
+    "Private_Clean": "private_clean_mb",
+    "Private_Dirty": "private_dirty_mb",
+    "Swap": "swap_mb",
+}
+
+
+def llama_memory_kwargs() -> Dict[str, bool]:
+    """Keyword arguments for llama_cpp.Llama that control how GGUF weights are held in RAM
+
+    With use_mmap the weights are mapped read-only from the model file, so they live
+    in the kernel page cache and are shared by every worker process that maps the
+    same file. use_mlock additionally pins those pages so they are never swapped out.
+    """
+    return {
+        "use_mmap": settings.llm_use_mmap,
+        "use_mlock": settings.llm_use_mlock,
+    }
+
+
+def describe_memory_strategy() -> str:
+    """Human readable memory strategy (for logs / admin panel)"""
+    if not settings.llm_use_mmap:
+        return "private (weights copied into each process)"
+    if settings.llm_use_mlock:
+        return "mmap + mlock (shared page cache, pinned)"
+    return "mmap (shared page cache)"
+
+
+def process_memory(pid: Optional[int] = None) -> Dict[str, float]:
+    """Memory usage of a process split into shared and private pages (MB)
+
+    Reads /proc/<pid>/smaps_rollup (Linux >= 4.14). mmap'ed model weights show up
+    as shared_clean once a second worker maps the same file; private_dirty is the
+    memory that really belongs to one process (KV cache, Python heap, torch weights).
+    """
+    pid = pid or os.getpid()
+    stats: Dict[str, float] = {}
+
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].rstrip(":") in _SMAPS_FIELDS:
+                    stats[_SMAPS_FIELDS[parts[0].rstrip(":")]] = round(int(parts[1]) / 1024, 1)
+    except (FileNotFoundError, PermissionError):
+        # Non-Linux or restricted /proc: only peak RSS of this process is available
+        import resource
+        max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {"max_rss_mb": round(max_rss_kb / 1024, 1)}
+
+    if stats:
+        stats["shared_mb"] = round(stats.get("shared_clean_mb", 0) + stats.get("shared_dirty_mb", 0), 1)
+        stats["private_mb"] = round(stats.get("private_clean_mb", 0) + stats.get("private_dirty_mb", 0), 1)
+    return stats
@@ -1,7 +1,9 @@
 """LLM Model Registry - Verfügbare Modelle für Admin-Panel"""
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
 from dataclasses import dataclass
 from pathlib import Path
+import os
+import time
 
 
 @dataclass
@@ -15,6 +17,8 @@ class LLMModel:
     quality: str  # Quality rating: "Low", "Medium", "High", "Excellent"
     description: str  # Short description
     download_url: str  # HuggingFace download URL
+    sha256: Optional[str] = None  # Expected file hash; None = use HuggingFace X-Linked-Etag
+    draft_model_id: Optional[str] = None  # Small model with the same tokenizer for speculative decoding
 
 
 # Registry of available LLM models
@@ -50,7 +54,8 @@ AVAILABLE_MODELS: Dict[str, LLMModel] = {
         params="3B",
         quality="High",
         description="6x größer als 0.5B, deutlich besseres Deutsch",
-        download_url="https://huggingface.co/Qwen/Qwen2.5-3B-Instruct-GGUF/resolve/main/qwen2.5-3b-instruct-q4_k_m.gguf"
+        download_url="https://huggingface.co/Qwen/Qwen2.5-3B-Instruct-GGUF/resolve/main/qwen2.5-3b-instruct-q4_k_m.gguf",
+        draft_model_id="qwen2.5-0.5b"
     ),
     "qwen3-4b": LLMModel(
         id="qwen3-4b",
@@ -60,7 +65,8 @@ AVAILABLE_MODELS: Dict[str, LLMModel] = {
         params="4B",
         quality="Excellent",
         description="Qwen3 Gen: Verbesserte Reasoning, 100+ Sprachen, Multilingual-Deutsch",
-        download_url="https://huggingface.co/Aldaris/Qwen3-4B-Q4_K_M-GGUF/resolve/main/qwen3-4b-q4_k_m.gguf"
+        download_url="https://huggingface.co/Aldaris/Qwen3-4B-Q4_K_M-GGUF/resolve/main/qwen3-4b-q4_k_m.gguf",
+        draft_model_id="qwen2.5-0.5b"
     ),
     "deepseek-r1-7b": LLMModel(
         id="deepseek-r1-7b",
@@ -82,7 +88,8 @@ AVAILABLE_MODELS: Dict[str, LLMModel] = {
         params="8B",
         quality="Excellent",
         description="Qwen3 Gen: Top Reasoning, 100+ Sprachen, perfektes Deutsch",
-        download_url="https://huggingface.co/Triangle104/Qwen3-8B-Q4_K_M-GGUF/resolve/main/qwen3-8b-q4_k_m.gguf"
+        download_url="https://huggingface.co/Triangle104/Qwen3-8B-Q4_K_M-GGUF/resolve/main/qwen3-8b-q4_k_m.gguf",
+        draft_model_id="qwen2.5-0.5b"
     ),
     "deepseek-r1-qwen3-8b": LLMModel(
         id="deepseek-r1-qwen3-8b",
@@ -122,6 +129,9 @@ AVAILABLE_MODELS: Dict[str, LLMModel] = {
 # Default model - Qwen3-4B (beste Balance: Qualität, Größe, Speed)
 DEFAULT_MODEL = "qwen3-4b"
 
+# Fallback if the configured model is missing - smallest model, downloaded first by download_model.py --railway
+FALLBACK_MODEL = "qwen2.5-0.5b"
+
 
 def get_model(model_id: str) -> LLMModel:
     """Get model by ID"""
@@ -138,7 +148,8 @@ def get_all_models() -> List[Dict]:
             "size_gb": model.size_gb,
             "params": model.params,
             "quality": model.quality,
-            "description": model.description
+            "description": model.description,
+            "draft_model_id": model.draft_model_id
         }
         for model in AVAILABLE_MODELS.values()
     ]
@@ -153,3 +164,21 @@ def get_model_path(model_id: str) -> str:
         return f"/app/models/{model.filename}"
     else:
         return f"./models/{model.filename}"
+
+
+def wait_for_model_file(model_ids: Iterable[str], timeout: float, interval: float = 5.0) -> str:
+    """Block until the file of one of model_ids exists, return that id
+
+    railway_startup.sh downloads the models in the background while the server starts;
+    downloads are renamed into place only when complete, so an existing file is usable.
+    Raises TimeoutError if none appears within timeout seconds.
+    """
+    model_ids = list(model_ids)
+    deadline = time.monotonic() + timeout
+    while True:
+        for model_id in model_ids:
+            if os.path.exists(get_model_path(model_id)):
+                return model_id
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"No model file for {', '.join(model_ids)} after {timeout:.0f}s (download still running?)")
+        time.sleep(interval)
@@ -0,0 +1,241 @@
+"""LLM Runtime - Besitzt das llama-cpp Modell und das Embedding-Modell (im API-Prozess oder im Inference-Service)"""
+import os
+
+# CRITICAL: Set cache directories BEFORE any imports that use them
+os.environ.setdefault('SENTENCE_TRANSFORMERS_HOME', '/tmp/.cache')
+os.environ.setdefault('HF_HOME', '/tmp/.cache')
+os.environ.setdefault('TRANSFORMERS_CACHE', '/tmp/.cache')
+
+from typing import List
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+try:
+    from llama_cpp import Llama
+    LLAMA_CPP_AVAILABLE = True
+except ImportError:
+    Llama = None
+    LLAMA_CPP_AVAILABLE = False
+    logger.warning("⚠️ llama-cpp-python not installed. Falling back to Ollama.")
+
+from config import get_settings
+from llm_models import get_model_path, wait_for_model_file, DEFAULT_MODEL, FALLBACK_MODEL
+from readiness import readiness
+from llm_memory import llama_memory_kwargs, describe_memory_strategy, process_memory
+from speculative import draft_model_kwargs
+from generation import inference_slot
+from metrics import set_loaded_model
+
+settings = get_settings()
+
+EMBEDDING_MODEL_NAME = "paraphrase-multilingual-MiniLM-L12-v2"
+EMBEDDING_MAX_TOKENS = 128  # max_seq_length incl. <s>/</s> - the model silently drops everything after it
+
+# Global variable to track current model
+_current_model_id = DEFAULT_MODEL
+
+# NEU: Global LLM Instance (lazy loading)
+_llm_instance = None
+_llm_lock = threading.Lock()  # Warm-up thread and requests must not load the model twice
+
+
+def get_llm() -> Llama:
+    """Get or create LLM instance (singleton)"""
+    if not LLAMA_CPP_AVAILABLE:
+        return None
+
+    with _llm_lock:
+        return _get_or_load_llm()
+
+
+def _build_llm(model_id: str) -> Llama:
+    """Create the llama-cpp model with our settings (plus draft model if speculative decoding is on)"""
+    return Llama(
+        model_path=get_model_path(model_id),
+        n_ctx=settings.llm_context_size,
+        n_threads=settings.llm_threads,
+        verbose=False,
+        **llama_memory_kwargs(),
+        **draft_model_kwargs(model_id)
+    )
+
+
+def _get_or_load_llm() -> Llama:
+    """Load LLM if needed (caller holds _llm_lock)"""
+    global _llm_instance, _current_model_id
+
+    if _llm_instance is None:
+        model_path = get_model_path(_current_model_id)
+
+        if not os.path.exists(model_path):
+            logger.warning("⚠️ Model not found at %s", model_path)
+
+            # Try fallback to qwen2.5-0.5b (smallest model)
+            fallback_model_id = FALLBACK_MODEL
+            fallback_path = get_model_path(fallback_model_id)
+
+            if os.path.exists(fallback_path):
+                logger.info("🔄 Falling back to %s...", fallback_model_id)
+                _current_model_id = fallback_model_id
+                model_path = fallback_path
+            else:
+                logger.error("❌ No models available (tried %s and %s), falling back to Ollama", _current_model_id, fallback_model_id)
+                return None
+
+        logger.info("🔄 Loading LLM model: %s from %s (%s)...", _current_model_id, model_path, describe_memory_strategy())
+        started = time.perf_counter()
+        _llm_instance = _build_llm(_current_model_id)
+        # Also after a failed warm-up or a reload_llm(): /ready follows the model actually in RAM
+        readiness.ready("llm", time.perf_counter() - started, detail=_current_model_id)
+        set_loaded_model(_current_model_id)
+        logger.info("✅ LLM model %s loaded successfully! Memory: %s", _current_model_id, process_memory())
+    return _llm_instance
+
+
+def reload_llm(model_id: str):
+    """Reload LLM with different model"""
+    global _llm_instance, _current_model_id
+
+    logger.info("🔄 [RELOAD] Switching LLM from %s to %s...", _current_model_id, model_id)
+
+    with _llm_lock:
+        # Explicitly unload current model from memory
+        if _llm_instance is not None:
+            logger.info("🗑️ [RELOAD] Unloading %s from memory...", _current_model_id)
+            old_instance = _llm_instance
+            _llm_instance = None
+
+            # Force garbage collection to free RAM immediately
+            del old_instance
+            import gc
+            gc.collect()
+            logger.info("✅ [RELOAD] %s unloaded from RAM", _current_model_id)
+
+        _current_model_id = model_id
+        readiness.skip("llm", f"{model_id} loads on next request")
+        set_loaded_model(model_id, loaded=False)
+
+    # Load new model (will be loaded on next get_llm() call)
+    logger.info("✅ [RELOAD] LLM model switched to %s (will load on next request)", model_id)
+
+
+def switch_llm(model_id: str):
+    """Load and warm model_id, then make it active (blocking, run in a thread)
+
+    Unlike reload_llm(), requests keep using the current model until the new
+    one is ready. Both models are in RAM during the switch.
+    """
+    global _llm_instance, _current_model_id
+
+    if not LLAMA_CPP_AVAILABLE:
+        raise RuntimeError("llama-cpp-python not installed")
+
+    model_path = get_model_path(model_id)
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model not found at {model_path}")
+
+    logger.info("🔄 [SWITCH] Loading %s next to %s...", model_id, _current_model_id)
+    started = time.perf_counter()
+    new_instance = _build_llm(model_id)
+    new_instance("Hallo", max_tokens=1)  # Page in weights before taking traffic
+
+    with _llm_lock:
+        old_instance = _llm_instance
+        _llm_instance = new_instance
+        _current_model_id = model_id
+    readiness.ready("llm", time.perf_counter() - started, detail=model_id)
+    set_loaded_model(model_id)
+
+    if old_instance is not None:
+        # In-flight generations keep their reference until they finish
+        del old_instance
+        import gc
+        gc.collect()
+
+    logger.info("✅ [SWITCH] Switched to %s. Memory: %s", model_id, process_memory())
+
+
+def get_current_model_id() -> str:
+    """Get current model ID"""
+    return _current_model_id
+
+
+def is_llm_loaded() -> bool:
+    """Check if the LLM is currently loaded in RAM"""
+    return _llm_instance is not None
+
+
+def warm_up_llm():
+    """Load LLM and run a tiny generation to page in the weights (blocking)"""
+    try:
+        with readiness.track("llm"):
+            if not LLAMA_CPP_AVAILABLE:
+                raise RuntimeError("llama-cpp-python not installed")
+            # On a fresh deploy the model is still downloading in the background
+            wait_for_model_file([_current_model_id, FALLBACK_MODEL], settings.warmup_model_wait_seconds)
+            llm = get_llm()
+            if llm is None:
+                raise RuntimeError("No local LLM available (llama-cpp-python or model file missing)")
+            with inference_slot.acquire():
+                llm("Hallo", max_tokens=1)
+        logger.info("🔥 [WARM-UP] LLM %s ready", _current_model_id)
+    except Exception as e:
+        logger.exception("❌ [WARM-UP] LLM failed: %s", e)
+
+
+# Embedding model (lazy loading) - used by the inference service
+_embedding_model = None
+_embedding_lock = threading.Lock()
+
+
+def get_embedding_model():
+    """Get or create the sentence-transformers embedding model (singleton)"""
+    global _embedding_model
+
+    with _embedding_lock:
+        if _embedding_model is None:
+            from sentence_transformers import SentenceTransformer
+            logger.info("🔄 Loading embedding model: %s...", EMBEDDING_MODEL_NAME)
+            _embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+            logger.info("✅ Embedding model loaded!")
+    return _embedding_model
+
+
+# Tokenizer only (no weights) - the chunker needs it in the API process, also with the inference service
+_embedding_tokenizer = None
+
+
+def get_embedding_tokenizer():
+    """SentencePiece tokenizer (XLM-R) of the embedding model (singleton, None if transformers is missing)"""
+    global _embedding_tokenizer
+
+    with _embedding_lock:
+        if _embedding_tokenizer is None:
+            if _embedding_model is not None:
+                _embedding_tokenizer = _embedding_model.tokenizer
+            else:
+                try:
+                    from transformers import AutoTokenizer
+                    _embedding_tokenizer = AutoTokenizer.from_pretrained(f"sentence-transformers/{EMBEDDING_MODEL_NAME}")
+                except Exception as e:
+                    logger.warning("⚠️ Embedding tokenizer unavailable (%s) - estimating tokens from length", e)
+                    _embedding_tokenizer = False  # Don't retry on every document
+    return _embedding_tokenizer or None
+
+
+def embed(texts: List[str], normalize: bool = False) -> List[List[float]]:
+    """Embed texts (normalize=True matches LlamaIndex HuggingFaceEmbedding)"""
+    vectors = get_embedding_model().encode(texts, normalize_embeddings=normalize)
+    return vectors.tolist()
+
+
+def warm_up_embeddings():
+    """Load embedding model and embed one string (blocking)"""
+    try:
+        with readiness.track("embeddings", detail=EMBEDDING_MODEL_NAME):
+            embed(["Warm-up"])
+    except Exception as e:
+        logger.exception("❌ [WARM-UP] Embeddings failed: %s", e)
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test of the chat API with a fake LLM, embedder and SearxNG (no model needed)
+
+Startet main.app mit uvicorn und daneben einen Fake-Inference-Service (gleiches Protokoll
+wie inference_server.py, angebunden über INFERENCE_URL), der deterministische Antworten
+mit einstellbarer Prompt-Eval-Zeit und Tokens/s liefert, deterministische Embeddings
+(Hash-Bag-of-Words, 384 Dimensionen) und eine SearxNG-kompatible /search-Route.
+Virtuelle Nutzer durchlaufen register → assistant → upload → chat; gemessen werden
+Durchsatz, Latenz-Perzentile und Fehlerquote pro Schritt sowie der Event-Loop-Lag der API
+und die belegten DB-Verbindungen (privategpt_db_connections_in_use) je Anzahl laufender Chats.
+Da das "Modell" nur schläft, zeigen lange Latenzen/hoher Lag Blockaden im Event-Loop
+und Contention auf der Datenbank - unabhängig von der Modellgeschwindigkeit.
+
+Usage:
+    python loadtest.py                                         # 10 Nutzer, je 3 Chats
+    python loadtest.py --users 50 --chats 5 --ramp-up 10 --tokens-per-second 30
+    python loadtest.py --llm-slots 4 --prompt-ms 50 --json
+    python loadtest.py --database-url postgresql+asyncpg://user:pw@localhost/loadtest
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import uvicorn
+from prometheus_client import REGISTRY
+
+from bench_ingest import make_pdf
+
+EMBEDDING_DIM = 384  # paraphrase-multilingual-MiniLM-L12-v2
+LAG_INTERVAL = 0.05
+
+QUESTIONS = [
+    "Wie hoch ist die Kaltmiete und wann ist sie fällig?",
+    "Welche Kündigungsfrist gilt für den Mieter?",
+    "Wer trägt die Kosten für Reparaturen an der Heizung?",
+    "Wie wird die Nebenkostenabrechnung erstellt?",
+    "Wie ist das aktuelle Wetter in Berlin?",  # Triggers the web search heuristic
+]
+
+ANSWER_WORDS = (
+    "Laut dem Mietvertrag beträgt die Kaltmiete 850 Euro und ist bis zum dritten Werktag "
+    "eines Monats fällig. Die Kündigungsfrist beträgt drei Monate zum Monatsende."
+).split()
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def fake_embedding(text: str) -> List[float]:
+    """Deterministic hashed bag-of-words vector (similar texts → similar vectors), L2-normalized"""
+    vector = [0.0] * EMBEDDING_DIM
+    for word in text.lower().split():
+        vector[zlib.crc32(word.strip(".,;:!?()").encode()) % EMBEDDING_DIM] += 1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def build_fake_service(args):
+    """Stand-in for inference_server.py (LLM + embeddings) and SearxNG"""
+    from fastapi import FastAPI, Request
+    from fastapi.responses import StreamingResponse
+
+    service = FastAPI(title="PrivateGxT load-test stand-ins")
+    slots = {}  # asyncio.Semaphore must be created in the service's event loop
+
+    def slot() -> asyncio.Semaphore:
+        if "llm" not in slots:
+            slots["llm"] = asyncio.Semaphore(args.llm_slots)
+        return slots["llm"]
+
+    def tokens(max_tokens: int) -> List[str]:
+        count = min(args.completion_tokens, max_tokens)
+        return [(" " if i else "") + ANSWER_WORDS[i % len(ANSWER_WORDS)] for i in range(count)]
+
+    @service.get("/health")
+    async def health():
+        return {"model_id": "fake", "loaded": True, "ready": True, "busy": False, "waiting": 0}
+
+    @service.post("/v1/model")
+    async def set_model(request: Request):
+        body = await request.json()
+        return {"model_id": body.get("model_id"), "loaded": True}
+
+    @service.post("/v1/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        pieces = tokens(body.get("max_tokens", 16))
+        delay = 1.0 / args.tokens_per_second
+
+        if not body.get("stream"):
+            async with slot():
+                await asyncio.sleep(args.prompt_ms / 1000 + delay * len(pieces))
+            return {
+                "object": "text_completion",
+                "model": "fake",
+                "choices": [{"text": "".join(pieces), "index": 0, "finish_reason": "length"}],
+                "usage": {"prompt_tokens": len(body.get("prompt", "").split()), "completion_tokens": len(pieces)},
+            }
+
+        async def stream():
+            async with slot():
+                await asyncio.sleep(args.prompt_ms / 1000)
+                for piece in pieces:
+                    await asyncio.sleep(delay)
+                    yield json.dumps({"choices": [{"text": piece, "index": 0, "finish_reason": None}]}) + "\n"
+                yield json.dumps({"choices": [{"text": "", "index": 0, "finish_reason": "length"}]}) + "\n"
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    @service.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        texts = body.get("texts", [])
+        await asyncio.sleep(args.embed_ms / 1000 * len(texts))
+        return {"embeddings": [fake_embedding(text) for text in texts]}
+
+    @service.get("/search")
+    async def search(q: str = ""):
+        await asyncio.sleep(args.search_ms / 1000)
+        return {"results": [
+            {"title": f"Ergebnis {i} zu {q[:40]}", "url": f"https://example.org/{i}",
+             "content": " ".join(ANSWER_WORDS[:20]), "engine": "fake"}
+            for i in range(1, 4)
+        ]}
+
+    return service
+
+
+class _ThreadedServer(uvicorn.Server):
+    def install_signal_handlers(self):
+        pass  # Not the main thread
+
+
+def serve_in_thread(app, port: int) -> uvicorn.Server:
+    """Run an ASGI app with uvicorn in a daemon thread and wait until it accepts connections"""
+    server = _ThreadedServer(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    deadline = time.time() + 60
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError(f"Server on port {port} did not start")
+        time.sleep(0.05)
+    return server
+
+
+def prepare_environment(args, work_dir: Path, inference_port: int):
+    """Settings for main.py - must be set before config/main are imported"""
+    os.environ["INFERENCE_URL"] = f"http://127.0.0.1:{inference_port}"
+    os.environ["SEARXNG_URL"] = f"http://127.0.0.1:{inference_port}"
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite+aiosqlite:///{work_dir / 'loadtest.db'}"
+    os.environ["CHROMA_DB_PATH"] = str(work_dir / "chroma")
+    os.environ["WARMUP_ON_STARTUP"] = "false"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("JWT_SECRET", "loadtest-secret")
+    os.environ.setdefault("RESEND_API_KEY", "loadtest")
+    os.chdir(work_dir)  # main.py writes uploads/ relative to the working directory
+
+
+def install_lag_monitor(app, samples: List[float]):
+    """Background task in the API's event loop: how late does a 50 ms sleep wake up?"""
+    async def monitor():
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(LAG_INTERVAL)
+            samples.append(max(time.perf_counter() - started - LAG_INTERVAL, 0.0))
+
+    async def start_monitor():
+        app.state.lag_monitor = asyncio.create_task(monitor())
+
+    app.router.on_startup.append(start_monitor)
+
+
+async def pool_monitor(samples: List[Tuple[int, float]], in_flight: Dict[str, int], stop: asyncio.Event):
+    """(chats in flight, DB connections checked out) every 50 ms - the API runs in this process"""
+    while not stop.is_set():
+        connections = REGISTRY.get_sample_value("privategpt_db_connections_in_use") or 0.0
+        samples.append((in_flight["chats"], connections))
+        await asyncio.sleep(LAG_INTERVAL)
+
+
+def pool_summary(samples: List[Tuple[int, float]]) -> Dict:
+    """Connections should stay flat while the number of running generations grows"""
+    if not samples:
+        return {}
+    by_chats: Dict[int, float] = {}
+    for chats, connections in samples:
+        by_chats[chats] = max(by_chats.get(chats, 0.0), connections)
+    connections = [c for _, c in samples]
+    return {
+        "max_chats_in_flight": max(chats for chats, _ in samples),
+        "db_connections_max": int(max(connections)),
+        "db_connections_mean": round(sum(connections) / len(connections), 2),
+        "db_connections_max_by_chats_in_flight": {str(k): int(v) for k, v in sorted(by_chats.items())},
+    }
+
+
+class StepStats:
+    """Latencies and errors of one step (register, assistant, upload, chat)"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors: Dict[str, int] = {}
+
+    def error(self, reason: str):
+        self.errors[reason] = self.errors.get(reason, 0) + 1
+
+    def summary(self, wall_seconds: float) -> Dict:
+        count = len(self.latencies)
+        failed = sum(self.errors.values())
+        result = {
+            "requests": count,
+            "errors": failed,
+            "error_rate": round(failed / count, 4) if count else 0.0,
+            "per_second": round(count / wall_seconds, 2) if wall_seconds else 0.0,
+            "error_reasons": self.errors,
+        }
+        if count:
+            result.update({
+                "p50_ms": round(percentile(self.latencies, 0.5) * 1000, 1),
+                "p95_ms": round(percentile(self.latencies, 0.95) * 1000, 1),
+                "p99_ms": round(percentile(self.latencies, 0.99) * 1000, 1),
+                "max_ms": round(max(self.latencies) * 1000, 1),
+            })
+        return result
+
+
+async def timed(stats: Dict[str, StepStats], step: str, request) -> Optional[httpx.Response]:
+    """Await one HTTP call, record latency and classify errors"""
+    started = time.perf_counter()
+    try:
+        response = await request
+    except httpx.HTTPError as e:
+        stats[step].latencies.append(time.perf_counter() - started)
+        stats[step].error(type(e).__name__)
+        return None
+    stats[step].latencies.append(time.perf_counter() - started)
+
+    if response.status_code >= 400:
+        stats[step].error(f"HTTP {response.status_code}")
+        return None
+    if step == "chat" and response.json().get("source_type") == "error":
+        stats[step].error("rag_error")  # main.chat answers 200 with the error text
+        return None
+    return response
+
+
+async def virtual_user(client: httpx.AsyncClient, index: int, args, run_id: str, pdf_bytes: bytes,
+                       stats: Dict[str, StepStats], in_flight: Dict[str, int], delay: float):
+    await asyncio.sleep(delay)
+
+    response = await timed(stats, "register", client.post("/auth/register", json={
+        "email": f"load-{run_id}-{index}@privategpt-loadtest.de",
+        "password": "Loadtest-Passwort-123",
+    }))
+    if response is None:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await timed(stats, "assistant", client.post("/assistants", headers=headers))
+    if response is None:
+        return
+    assistant_id = response.json()["id"]
+
+    await timed(stats, "upload", client.post(
+        f"/assistants/{assistant_id}/documents",
+        headers=headers,
+        files={"file": ("mietvertrag.pdf", pdf_bytes, "application/pdf")},
+    ))
+
+    for turn in range(args.chats):
+        in_flight["chats"] += 1
+        try:
+            await timed(stats, "chat", client.post(
+                f"/assistants/{assistant_id}/chat",
+                headers=headers,
+                json={"content": QUESTIONS[(index + turn) % len(QUESTIONS)]},
+            ))
+        finally:
+            in_flight["chats"] -= 1
+
+
+async def run_load(base_url: str, args, pdf_bytes: bytes) -> Dict:
+    stats = {step: StepStats() for step in ("register", "assistant", "upload", "chat")}
+    run_id = uuid.uuid4().hex[:8]
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    in_flight = {"chats": 0}
+    pool_samples: List[Tuple[int, float]] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(pool_monitor(pool_samples, in_flight, stop))
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            virtual_user(client, i, args, run_id, pdf_bytes, stats, in_flight,
+                         delay=args.ramp_up * i / args.users)
+            for i in range(args.users)
+        ))
+        wall = time.perf_counter() - started
+
+    stop.set()
+    await monitor
+
+    return {
+        "wall_seconds": round(wall, 2),
+        "steps": {step: s.summary(wall) for step, s in stats.items()},
+        "db_pool": pool_summary(pool_samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--chats", type=int, default=3, help="Chat messages per user")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds until all users have started")
+    parser.add_argument("--pages", type=int, default=5, help="Pages of the uploaded PDF")
+    parser.add_argument("--prompt-ms", type=float, default=200.0, help="Fake prompt evaluation time")
+    parser.add_argument("--tokens-per-second", type=float, default=20.0, help="Fake generation speed")
+    parser.add_argument("--completion-tokens", type=int, default=64, help="Tokens per fake answer")
+    parser.add_argument("--llm-slots", type=int, default=1, help="Parallel fake generations (llama-cpp: 1)")
+    parser.add_argument("--embed-ms", type=float, default=2.0, help="Fake embedding time per text")
+    parser.add_argument("--search-ms", type=float, default=300.0, help="Fake SearxNG latency")
+    parser.add_argument("--database-url", help="Default: fresh SQLite file in a temp directory")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Client timeout per request")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="privategpt-loadtest-"))
+    pdf_path = work_dir / "mietvertrag.pdf"
+    make_pdf(pdf_path, args.pages, words_per_page=300)
+
+    inference_port, api_port = free_port(), free_port()
+    serve_in_thread(build_fake_service(args), inference_port)
+
+    prepare_environment(args, work_dir, inference_port)
+    report = sys.stdout
+    if args.json:
+        sys.stdout = sys.stderr  # API logs go to stdout (logging_config.py) - keep the JSON parseable
+    from main import app  # Imports config, database and the RAG engine with the settings above
+
+    lag_samples: List[float] = []
+    install_lag_monitor(app, lag_samples)
+    serve_in_thread(app, api_port)
+
+    result = asyncio.run(run_load(f"http://127.0.0.1:{api_port}", args, pdf_path.read_bytes()))
+    chats = result["steps"]["chat"]
+    lag = {
+        "p99_ms": round(percentile(lag_samples, 0.99) * 1000, 1) if lag_samples else None,
+        "max_ms": round(max(lag_samples) * 1000, 1) if lag_samples else None,
+    }
+
+    if args.json:
+        print(json.dumps({
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "cpus": os.cpu_count(),
+                "database": os.environ["DATABASE_URL"].split(":")[0],
+                **{k: v for k, v in vars(args).items() if k not in ("json", "database_url")},
+            },
+            **result,
+            "event_loop_lag": lag,
+        }, indent=2), file=report)
+        return
+
+    print(f"{args.users} users x {args.chats} chats, fake LLM {args.prompt_ms:.0f} ms + "
+          f"{args.completion_tokens} tokens @ {args.tokens_per_second:.0f} tok/s, {args.llm_slots} slot(s), "
+          f"{os.environ['DATABASE_URL'].split(':')[0]}")
+    header = ("step", "requests", "errors", "err %", "req/s", "p50 ms", "p95 ms", "p99 ms", "max ms")
+    print("".join(f"{h:>11}" for h in header))
+    for step, s in result["steps"].items():
+        row = (step, s["requests"], s["errors"], round(s["error_rate"] * 100, 1), s["per_second"],
+               s.get("p50_ms", "-"), s.get("p95_ms", "-"), s.get("p99_ms", "-"), s.get("max_ms", "-"))
+        print("".join(f"{v:>11}" for v in row))
+    print()
+    print(f"Wall time {result['wall_seconds']} s, {chats['requests'] - chats['errors']} successful chats "
+          f"({(chats['requests'] - chats['errors']) / max(result['wall_seconds'], 1e-6):.2f}/s)")
+    print(f"Event-loop lag (API): p99 {lag['p99_ms']} ms, max {lag['max_ms']} ms")
+    pool = result["db_pool"]
+    if pool:
+        print(f"DB connections in use: max {pool['db_connections_max']}, mean {pool['db_connections_mean']} "
+              f"at up to {pool['max_chats_in_flight']} concurrent chats")
+        print("  chats in flight -> max connections: " + ", ".join(
+            f"{chats}->{connections}" for chats, connections in pool["db_connections_max_by_chats_in_flight"].items()))
+    for step, s in result["steps"].items():
+        if s["error_reasons"]:
+            print(f"{step} errors: {s['error_reasons']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Logging - Strukturiertes, nicht-blockierendes Logging statt print()
+
+Module loggen über `logger = logging.getLogger(__name__)`. setup_logging() hängt einen
+QueueHandler an den Root-Logger: der Request-Pfad legt nur den Record in eine Queue,
+formatiert und nach stdout geschrieben wird im Listener-Thread. Ein langsamer
+Log-Collector (Railway, Docker) bremst so nie den Event-Loop.
+
+- LOG_LEVEL=DEBUG|INFO|WARNING - Details pro Chunk/Dokument nur auf DEBUG
+- LOG_FORMAT=text|json - json: eine Zeile pro Event inkl. Extra-Feldern und trace_id
+- Häufige Events (Download-Fortschritt, Chunks) über einen Sampler drosseln
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from config import get_settings
+from tracing import current_span
+
+settings = get_settings()
+
+# Attributes every LogRecord has - everything else was passed via extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+# Chatty libraries: only warnings unless LOG_LEVEL=DEBUG
+_NOISY_LOGGERS = ("httpx", "httpcore", "chromadb", "sentence_transformers", "urllib3", "multipart")
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _extra_fields(record: logging.LogRecord) -> Dict:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+
+
+class TextFormatter(logging.Formatter):
+    """`2025-01-01 12:00:00 INFO  rag: ✅ Found 3 chunks | assistant_id=4 chunks=3`"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-5s %(name)s: %(message)s", "%Y-%m-%d %H:%M:%S")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _extra_fields(record)
+        if fields:
+            first, _, rest = line.partition("\n")
+            line = first + " | " + " ".join(f"{key}={value}" for key, value in fields.items())
+            if rest:
+                line += "\n" + rest
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line (for log search: filter by level, logger, trace_id, fields)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            **_extra_fields(record),
+        }
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        elif record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TraceContextFilter(logging.Filter):
+    """Attach trace/span id of the current request (runs in the calling thread, before the queue)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        current = current_span()
+        if current is not None:
+            record.trace_id = current.trace.trace_id
+            record.span_id = current.span_id
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Render message and traceback in the caller's thread, but keep them apart (JSON `exc` field)"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class Sampler:
+    """Let the first event through, then at most one per `interval` seconds and/or every `every`-th
+
+    Usage: `if progress_sampler.ready(key): logger.info(...)` - one sampler per event type,
+    `key` separates independent streams (e.g. one per file being downloaded).
+    """
+
+    def __init__(self, every: Optional[int] = None, interval: Optional[float] = None):
+        self.every = every
+        self.interval = interval
+        self._state: Dict[str, list] = {}  # key -> [count, last_logged]
+        self._lock = threading.Lock()
+
+    def ready(self, key: str = "") -> bool:
+        now = time.monotonic()
+        with self._lock:
+            state = self._state.setdefault(key, [0, None])
+            state[0] += 1
+            due = state[1] is None
+            if not due and self.every is not None:
+                due = state[0] % self.every == 0
+            if not due and self.interval is not None:
+                due = now - state[1] >= self.interval
+            if due:
+                state[1] = now
+            return due
+
+    def reset(self, key: str = ""):
+        with self._lock:
+            self._state.pop(key, None)
+
+
+def setup_logging(level: Optional[str] = None, fmt: Optional[str] = None):
+    """Route all logging through a queue to stdout (idempotent, call once per process)"""
+    global _listener
+
+    if _listener is not None:
+        return
+
+    level = (level or settings.log_level).upper()
+    fmt = (fmt or settings.log_format).lower()
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(TraceContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    if level != "DEBUG":
+        for name in _NOISY_LOGGERS:
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)  # Flush what is still queued on exit
+
+
+def shutdown_logging():
+    """Write out everything still queued and stop the listener (setup_logging() may run again)"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,25 +1,52 @@
 """FastAPI Main Application - Password Auth Enabled"""
-from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, status, Request
+from fastapi import FastAPI, Depends, HTTPException, Query, status, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, update, and_
 from pydantic import BaseModel, EmailStr
 from typing import List, Optional
+from dataclasses import dataclass
 from datetime import datetime
+import asyncio
 import os
-import shutil
-import traceback
+import logging
 
 from config import get_settings
-from database import get_db, init_db, User, Assistant, Document, Message, SystemSettings
-from auth import create_magic_link, verify_magic_link, get_current_user, authenticate_user, register_user, create_jwt_token
+from logging_config import setup_logging
+
+setup_logging()  # Before the engines are imported - their startup logs already go through the queue
+
+from database import (
+    get_db, init_db, AsyncSessionLocal, User, Assistant, Document, Message, MagicLink, SystemSettings,
+    legacy_source_type
+)
+from readiness import readiness
+from llm_memory import process_memory, describe_memory_strategy
+from speculative import speculative_status
+from generation import GenerationCancelled, cancel_on_disconnect
+import metrics
+from tracing import TracingMiddleware, current_span, span
+from auth import (
+    create_magic_link, verify_magic_link, get_current_user, authenticate_user, register_user, create_jwt_token,
+    last_login_tracker, forget_user
+)
 # from rag import rag_engine, chroma_client, reload_llm  # OLD
-from rag_llamaindex import rag_engine, chroma_client, reload_llm  # NEW: LlamaIndex
+from rag_llamaindex import (  # NEW: LlamaIndex
+    rag_engine, switch_llm, warm_up, get_current_model_id, is_llm_loaded, delete_document_vectors
+)
+from model_jobs import model_jobs, switch_unsupported_reason, SwitchInProgress
+from inference_client import inference_client
+from cleanup_jobs import cleanup_jobs, new_job, public_status
+from conversation_memory import conversation_memory
+from uploads import receive_upload, UploadRejected, OPENAPI_FILE_BODY
+from extractors import file_type_for, supported_suffixes
+from download_model import download_model, check_disk_space
 from llm_models import get_all_models, get_model, DEFAULT_MODEL
 from i18n import get_translation, parse_accept_language
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 # Create FastAPI app
 app = FastAPI(
@@ -35,8 +62,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "traceparent", "X-Has-More"],
 )
 
+# Tracing - Root-Span pro Request, Server-Timing Header (optional OTLP/JSON Export)
+app.add_middleware(TracingMiddleware)
+
 
 # Pydantic Models
 class EmailRequest(BaseModel):
@@ -113,6 +144,67 @@ def is_superadmin(user: User) -> bool:
     return user.email == settings.superadmin_email
 
 
+async def get_owned_assistant(
+    assistant_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> Assistant:
+    """Dependency: assistant of the current user, 404 otherwise
+
+    One query (the user usually comes from the auth cache). FastAPI resolves each
+    dependency once per request, so routes can combine it with get_current_user freely.
+    """
+    with span("db.load"):
+        result = await db.execute(
+            select(Assistant).where(
+                Assistant.id == assistant_id,
+                Assistant.user_id == current_user.id
+            )
+        )
+        assistant = result.scalar_one_or_none()
+
+    if not assistant:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Assistant not found"
+        )
+    return assistant
+
+
+@dataclass
+class OwnedAssistant:
+    assistant: Assistant
+    document_ids: List[int]  # Processed documents only (the ones retrieval can use)
+
+
+async def get_owned_assistant_with_documents(
+    assistant_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> OwnedAssistant:
+    """Dependency: owned assistant plus its processed document ids in one joined query (chat)"""
+    with span("db.load"):
+        result = await db.execute(
+            select(Assistant, Document.id)
+            .outerjoin(Document, and_(Document.assistant_id == Assistant.id, Document.processed == True))
+            .where(
+                Assistant.id == assistant_id,
+                Assistant.user_id == current_user.id
+            )
+        )
+        rows = result.all()
+
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Assistant not found"
+        )
+    return OwnedAssistant(
+        assistant=rows[0][0],
+        document_ids=[document_id for _, document_id in rows if document_id is not None]
+    )
+
+
 async def get_current_llm_model(db: AsyncSession) -> str:
     """Get current LLM model from database"""
     result = await db.execute(
@@ -147,10 +239,29 @@ async def set_current_llm_model(db: AsyncSession, model_id: str, user_email: str
 # Startup event
 @app.on_event("startup")
 async def startup():
-    """Initialize database on startup"""
-    await init_db()
+    """Initialize database on startup and start model warm-up in background"""
+    with readiness.track("database"):
+        await init_db()
     # Create upload directory
     os.makedirs("uploads", exist_ok=True)
+    last_login_tracker.start()
+    # Deletion jobs interrupted by a restart or crash continue here (also those of other workers)
+    cleanup_jobs.start(delete_vectors=delete_document_vectors)
+
+    if settings.warmup_on_startup:
+        # Runs in a thread so the server accepts connections (and /ready) while loading
+        app.state.warmup_task = asyncio.create_task(asyncio.to_thread(warm_up))
+    else:
+        readiness.skip("vector_store", "warm-up disabled")
+        readiness.skip("embeddings", "warm-up disabled")
+        readiness.skip("llm", "warm-up disabled, loads on first request")
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Write pending last_login updates, hand running deletion jobs back"""
+    await last_login_tracker.stop()
+    await cleanup_jobs.stop()
 
 
 # Health check
@@ -164,6 +275,29 @@ async def root():
     }
 
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus metrics: RAG stage latencies, tokens, cache hits, ingestion, inference queue"""
+    content, content_type = metrics.render()
+    return Response(content=content, media_type=content_type)
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness endpoint - 503 until database, vector store, embeddings and LLM are warm"""
+    is_ready = readiness.is_ready()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if is_ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "ready": is_ready,
+            "model_id": get_current_model_id(),
+            "pid": os.getpid(),
+            "components": readiness.snapshot(),
+            "memory": process_memory()
+        }
+    )
+
+
 # Auth endpoints
 @app.post("/auth/request-magic-link")
 async def request_magic_link(
@@ -270,26 +404,8 @@ async def create_assistant(
 
 
 @app.get("/assistants/{assistant_id}", response_model=AssistantResponse)
-async def get_assistant(
-    assistant_id: int,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-):
+async def get_assistant(assistant: Assistant = Depends(get_owned_assistant)):
     """Get specific assistant"""
-    result = await db.execute(
-        select(Assistant).where(
-            Assistant.id == assistant_id,
-            Assistant.user_id == current_user.id
-        )
-    )
-    assistant = result.scalar_one_or_none()
-
-    if not assistant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assistant not found"
-        )
-
     return assistant
 
 
@@ -297,25 +413,10 @@ async def get_assistant(
 @app.get("/assistants/{assistant_id}/documents", response_model=List[DocumentResponse])
 async def get_documents(
     assistant_id: int,
-    current_user: User = Depends(get_current_user),
+    assistant: Assistant = Depends(get_owned_assistant),
     db: AsyncSession = Depends(get_db)
 ):
     """Get all documents for an assistant"""
-    # Verify ownership
-    result = await db.execute(
-        select(Assistant).where(
-            Assistant.id == assistant_id,
-            Assistant.user_id == current_user.id
-        )
-    )
-    assistant = result.scalar_one_or_none()
-
-    if not assistant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assistant not found"
-        )
-
     # Get documents (newest first)
     result = await db.execute(
         select(Document)
@@ -326,102 +427,79 @@ async def get_documents(
     return documents
 
 
-@app.post("/assistants/{assistant_id}/documents", response_model=DocumentResponse)
+@app.post("/assistants/{assistant_id}/documents", response_model=DocumentResponse, openapi_extra=OPENAPI_FILE_BODY)
 async def upload_document(
     assistant_id: int,
-    file: UploadFile = File(...),
+    request: Request,
+    assistant: Assistant = Depends(get_owned_assistant),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Upload a document (PDF only for PoC)"""
-    print(f"\n📤 === UPLOAD REQUEST RECEIVED ===")
-    print(f"Assistant ID: {assistant_id}")
-    print(f"User: {current_user.email}")
-    print(f"Filename: {file.filename}")
-    print(f"Content Type: {file.content_type}")
-
-    # Verify ownership
-    result = await db.execute(
-        select(Assistant).where(
-            Assistant.id == assistant_id,
-            Assistant.user_id == current_user.id
-        )
-    )
-    assistant = result.scalar_one_or_none()
-
-    if not assistant:
-        print(f"❌ Assistant {assistant_id} not found for user {current_user.email}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assistant not found"
-        )
+    """Upload a document (PDF, DOCX, TXT, Markdown - see extractors.py) - streamed to disk"""
+    # Ownership is checked - don't hold a pool connection while the body trickles in
+    await db.commit()
 
-    print(f"✅ Assistant verified: {assistant.name}")
+    def check_filename(filename: str):
+        logger.info("📤 Upload received", extra={
+            "assistant_id": assistant_id,
+            "user_id": current_user.id,
+            "upload_filename": filename,
+            "content_length": request.headers.get("content-length"),
+        })
+        # Check file type (before a single byte is written)
+        if file_type_for(filename) is None:
+            logger.warning("❌ Invalid file type: %s", filename)
+            raise UploadRejected(f"Unsupported file type. Supported: {', '.join(supported_suffixes())}")
+
+    # Save file: temp file + sha256 while streaming, atomic rename when complete
+    upload_dir = f"uploads/{current_user.id}/{assistant_id}"
+    os.makedirs(upload_dir, exist_ok=True)
 
-    # Check file type
-    if not file.filename.lower().endswith('.pdf'):
-        print(f"❌ Invalid file type: {file.filename}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only PDF files are supported in PoC"
+    try:
+        upload = await receive_upload(
+            request,
+            upload_dir,
+            max_bytes=settings.max_file_size_mb * 1024 * 1024,
+            check_filename=check_filename
         )
-
-    # Check file size
-    file.file.seek(0, 2)
-    file_size = file.file.tell()
-    file.file.seek(0)
-
-    print(f"📏 File size: {file_size} bytes ({file_size / 1024:.2f} KB)")
-
-    max_size = settings.max_file_size_mb * 1024 * 1024
-    if file_size > max_size:
-        print(f"❌ File too large: {file_size} > {max_size}")
+    except UploadRejected as e:
+        logger.warning("❌ Upload rejected: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large. Max size: {settings.max_file_size_mb}MB"
+            detail=str(e)
         )
 
-    # Save file
-    upload_dir = f"uploads/{current_user.id}/{assistant_id}"
-    os.makedirs(upload_dir, exist_ok=True)
-
-    file_path = f"{upload_dir}/{file.filename}"
-    print(f"💾 Saving to: {file_path}")
-
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    print(f"✅ File saved successfully")
+    file_path = upload.path
+    file_size = upload.size
+    logger.debug("💾 Saved upload to %s (%.2f KB, sha256 %s)", file_path, file_size / 1024, upload.sha256)
 
     # Create document record
     document = Document(
         assistant_id=assistant_id,
-        filename=file.filename,
+        filename=upload.filename,
         file_path=file_path,
-        file_type="pdf",
+        file_type=file_type_for(upload.filename),
         file_size=file_size,
+        sha256=upload.sha256,
         processed=False
     )
     db.add(document)
     await db.commit()
     await db.refresh(document)
-
-    print(f"✅ Document record created: ID={document.id}")
+    # The refresh opened a transaction - end it, or its connection stays checked out while embedding
+    await db.commit()
 
     # Process document in background (extract text, create embeddings)
     try:
-        print(f"🔄 Starting document processing...")
-        chunk_count = await rag_engine.processor.process_document(file_path, document.id)
+        chunk_count = await rag_engine.processor.process_document(file_path, document.id, document.file_type)
         document.processed = True
         await db.commit()
-        print(f"✅ Document {document.id} processed successfully: {chunk_count} chunks")
+        logger.info("✅ Document %s processed: %s chunks", document.id, chunk_count,
+                    extra={"document_id": document.id, "chunks": chunk_count, "bytes": file_size})
     except Exception as e:
-        print(f"❌ Error processing document {document.id}: {e}")
-        import traceback
-        print(f"Traceback: {traceback.format_exc()}")
+        logger.exception("❌ Error processing document %s: %s", document.id, e)
         # Document remains marked as unprocessed
 
-    print(f"=== UPLOAD COMPLETE ===\n")
     return document
 
 
@@ -429,27 +507,11 @@ async def upload_document(
 async def delete_document(
     assistant_id: int,
     document_id: int,
+    assistant: Assistant = Depends(get_owned_assistant),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a single document"""
-    print(f"\n🗑️  [DELETE] Starting document deletion: doc_id={document_id}, user={current_user.email}")
-
-    # Verify assistant ownership
-    result = await db.execute(
-        select(Assistant).where(
-            Assistant.id == assistant_id,
-            Assistant.user_id == current_user.id
-        )
-    )
-    assistant = result.scalar_one_or_none()
-
-    if not assistant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assistant not found"
-        )
-
     # Get document
     result = await db.execute(
         select(Document).where(
@@ -466,29 +528,23 @@ async def delete_document(
         )
 
     # Delete file from filesystem
-    print(f"   📁 [DELETE] Deleting file: {document.file_path}")
     if os.path.exists(document.file_path):
         os.remove(document.file_path)
-        print(f"   ✅ [DELETE] File deleted from filesystem")
     else:
-        print(f"   ⚠️  [DELETE] File not found on filesystem (already deleted?)")
+        logger.warning("⚠️ [DELETE] File not found on filesystem (already deleted?): %s", document.file_path)
 
-    # Delete ChromaDB collection
-    print(f"   🗄️  [DELETE] Deleting ChromaDB collection: doc_{document.id}")
+    # Delete ChromaDB collection (and the cached index)
     try:
-        collection_name = f"doc_{document.id}"
-        chroma_client.delete_collection(collection_name)
-        print(f"   ✅ [DELETE] ChromaDB collection deleted: {collection_name}")
+        delete_document_vectors(document.id)
     except Exception as e:
-        print(f"   ⚠️  [DELETE] Error deleting ChromaDB collection: {e}")
+        logger.warning("⚠️ [DELETE] Error deleting ChromaDB collection doc_%s: %s", document.id, e)
 
     # Delete from database
-    print(f"   🗃️  [DELETE] Deleting from PostgreSQL database...")
     await db.delete(document)
     await db.commit()
-    print(f"   ✅ [DELETE] Database record deleted")
 
-    print(f"✅ [DELETE] Document '{document.filename}' deleted successfully\n")
+    logger.info("🗑️ [DELETE] Document %s deleted", document.id,
+                extra={"document_id": document.id, "assistant_id": assistant_id, "user_id": current_user.id})
     return {"message": "Document deleted successfully"}
 
 
@@ -496,71 +552,42 @@ async def delete_document(
 @app.get("/assistants/{assistant_id}/messages", response_model=List[MessageResponse])
 async def get_messages(
     assistant_id: int,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    before_id: Optional[int] = Query(None, description="Cursor: only messages older than this id"),
+    limit: int = Query(50, ge=1, le=200),
+    assistant: Assistant = Depends(get_owned_assistant),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get chat history for an assistant"""
-    # Verify ownership
-    result = await db.execute(
-        select(Assistant).where(
-            Assistant.id == assistant_id,
-            Assistant.user_id == current_user.id
-        )
-    )
-    assistant = result.scalar_one_or_none()
-
-    if not assistant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assistant not found"
-        )
-
-    # Get messages
-    result = await db.execute(
-        select(Message)
-        .where(Message.assistant_id == assistant_id)
-        .order_by(Message.created_at)
-    )
+    """Get chat history for an assistant, one page at a time
+
+    Returns the newest `limit` messages (older than `before_id` if given) in chronological
+    order. Load the previous page with before_id = id of the first message; the
+    X-Has-More header tells whether there is one.
+    """
+    # Keyset pagination on the primary key (one extra row tells if there is an older page)
+    query = select(Message).where(Message.assistant_id == assistant_id)
+    if before_id is not None:
+        query = query.where(Message.id < before_id)
+    result = await db.execute(query.order_by(Message.id.desc()).limit(limit + 1))
     messages = result.scalars().all()
 
-    # Convert to MessageResponse with source_type (for old messages without metadata)
+    response.headers["X-Has-More"] = "true" if len(messages) > limit else "false"
+
     responses = []
-    for msg in messages:
-        # User messages don't have source_type
-        if msg.role == "user":
-            responses.append(MessageResponse(
-                id=msg.id,
-                role=msg.role,
-                content=msg.content,
-                created_at=msg.created_at,
-                source_type=None,
-                source_details=None
-            ))
-        else:
-            # Parse old "📚 Quellen:" format if present
-            source_type = None
-            source_details = None
-
-            if "📚 Quellen:" in msg.content:
-                # Old format - parse it
-                if "Web-Suche" in msg.content and "Dokument" in msg.content:
-                    source_type = "hybrid"
-                elif "Web-Suche" in msg.content:
-                    source_type = "hybrid"
-                elif "Dokument" in msg.content:
-                    source_type = "rag"
-            else:
-                # No source info = likely llm_only
-                source_type = "llm_only"
-
-            responses.append(MessageResponse(
-                id=msg.id,
-                role=msg.role,
-                content=msg.content,
-                created_at=msg.created_at,
-                source_type=source_type,
-                source_details=source_details
-            ))
+    for msg in reversed(messages[:limit]):
+        source_type = msg.source_type
+        if msg.role == "assistant" and source_type is None:
+            # Stored before source_type was persisted (migrate_add_message_sources.py backfills)
+            source_type = legacy_source_type(msg.content)
+
+        responses.append(MessageResponse(
+            id=msg.id,
+            role=msg.role,
+            content=msg.content,
+            created_at=msg.created_at,
+            source_type=source_type if msg.role == "assistant" else None,
+            source_details=msg.source_details
+        ))
 
     return responses
 
@@ -570,60 +597,46 @@ async def chat(
     assistant_id: int,
     message_request: MessageRequest,
     request: Request,
-    current_user: User = Depends(get_current_user),
+    owned: OwnedAssistant = Depends(get_owned_assistant_with_documents),
     db: AsyncSession = Depends(get_db)
 ):
     """Send a message and get AI response"""
     # Parse language from Accept-Language header
     accept_language = request.headers.get("Accept-Language", "de")
     language = parse_accept_language(accept_language)
-    # Verify ownership
-    result = await db.execute(
-        select(Assistant).where(
-            Assistant.id == assistant_id,
-            Assistant.user_id == current_user.id
-        )
-    )
-    assistant = result.scalar_one_or_none()
+    root_span = current_span()
+    if root_span is not None:
+        root_span.set_attribute("assistant_id", assistant_id)
 
-    if not assistant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assistant not found"
-        )
+    # Earlier turns (rolling summary + newest messages within the token budget), same transaction
+    with span("db.load"):
+        history = await conversation_memory.load(db, owned.assistant)
 
-    # Save user message
+    # Save user message - the commit also ends the transaction of the ownership query and
+    # returns the connection to the pool. Nothing below may touch db until the answer is
+    # saved: any query (or lazy load) would check out a connection for the whole generation.
     user_message = Message(
         assistant_id=assistant_id,
         role="user",
         content=message_request.content
     )
-    db.add(user_message)
-    await db.commit()
-
-    # Get all processed documents for this assistant
-    result = await db.execute(
-        select(Document).where(
-            Document.assistant_id == assistant_id,
-            Document.processed == True
-        )
-    )
-    documents = result.scalars().all()
-    document_ids = [doc.id for doc in documents]
+    with span("db.save"):
+        db.add(user_message)
+        await db.commit()
 
-    print(f"📊 Found {len(documents)} processed documents for assistant {assistant_id}")
-    print(f"📋 Document IDs: {document_ids}")
-    if documents:
-        for doc in documents:
-            print(f"   - Doc {doc.id}: {doc.filename} (processed: {doc.processed})")
+    document_ids = owned.document_ids
+    logger.debug("📊 %d processed documents for assistant %s: %s", len(document_ids), assistant_id, document_ids)
 
-    # Query using RAG
+    # Query using RAG - generation stops when the client disconnects (tab closed, question re-sent)
     try:
-        rag_result = await rag_engine.query(
-            question=message_request.content,
-            assistant_id=assistant_id,
-            document_ids=document_ids
-        )
+        async with cancel_on_disconnect(request) as cancel_token:
+            rag_result = await rag_engine.query(
+                question=message_request.content,
+                assistant_id=assistant_id,
+                document_ids=document_ids,
+                cancel_token=cancel_token,
+                history=history
+            )
         ai_response = rag_result["answer"]
 
         # Determine source type for response metadata
@@ -643,74 +656,68 @@ async def chat(
             source_type = "llm_only"
             source_details = get_translation("source.llm_only", language)
 
+    except GenerationCancelled as e:
+        # Nobody is waiting for the answer - don't store it
+        logger.info("🛑 [CHAT] Generation for assistant %s cancelled: %s", assistant_id, e)
+        return JSONResponse(status_code=499, content={"detail": "Client disconnected"})
     except Exception as e:
-        print(f"RAG error: {e}")
+        logger.exception("❌ [CHAT] RAG error for assistant %s: %s", assistant_id, e)
         ai_response = get_translation("error.processing", language, error=str(e))
         source_type = "error"
         source_details = None
 
-    # Save AI message
+    # Save AI message (with source metadata for the history) - second short transaction
     ai_message = Message(
         assistant_id=assistant_id,
         role="assistant",
-        content=ai_response
+        content=ai_response,
+        source_type=source_type,
+        source_details=source_details
+    )
+    with span("db.save"):
+        db.add(ai_message)
+        await db.commit()
+        await db.refresh(ai_message)
+
+    # Fold older turns into the summary after the answer, off the request path
+    if history.needs_summary and source_type != "error":
+        conversation_memory.schedule_summary(assistant_id, rag_engine.complete)
+
+    return MessageResponse(
+        id=ai_message.id,
+        role=ai_message.role,
+        content=ai_message.content,
+        created_at=ai_message.created_at,
+        source_type=ai_message.source_type,
+        source_details=ai_message.source_details
     )
-    db.add(ai_message)
-    await db.commit()
-    await db.refresh(ai_message)
-
-    # Add source metadata to response (not stored in DB)
-    response_dict = {
-        "id": ai_message.id,
-        "role": ai_message.role,
-        "content": ai_message.content,
-        "created_at": ai_message.created_at,
-        "source_type": source_type,
-        "source_details": source_details
-    }
-
-    return MessageResponse(**response_dict)
 
 
 @app.delete("/assistants/{assistant_id}/messages")
 async def delete_chat_history(
     assistant_id: int,
-    current_user: User = Depends(get_current_user),
+    assistant: Assistant = Depends(get_owned_assistant),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete all messages for an assistant (keep documents)"""
-    print(f"\n🗑️  [DELETE CHAT] User {current_user.email} deleting chat for assistant {assistant_id}")
-
-    # Verify ownership
+    # Delete all messages for this assistant (one DELETE, nothing loaded into the session)
     result = await db.execute(
-        select(Assistant).where(
-            Assistant.id == assistant_id,
-            Assistant.user_id == current_user.id
-        )
+        delete(Message)
+        .where(Message.assistant_id == assistant_id)
+        .execution_options(synchronize_session=False)
     )
-    assistant = result.scalar_one_or_none()
-
-    if not assistant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assistant not found"
-        )
-
-    # Delete all messages for this assistant
-    result = await db.execute(
-        select(Message).where(Message.assistant_id == assistant_id)
+    message_count = result.rowcount
+    # The summary is made of these messages - it goes with them
+    await db.execute(
+        update(Assistant)
+        .where(Assistant.id == assistant_id)
+        .values(history_summary=None, summary_until_id=0)
+        .execution_options(synchronize_session=False)
     )
-    messages = result.scalars().all()
-    message_count = len(messages)
-
-    print(f"   📊 [DELETE CHAT] Found {message_count} messages to delete")
-
-    for message in messages:
-        await db.delete(message)
-
     await db.commit()
+    conversation_memory.forget(assistant_id)
 
-    print(f"✅ [DELETE CHAT] Deleted {message_count} messages\n")
+    logger.info("🗑️ [DELETE CHAT] Deleted %d messages of assistant %s", message_count, assistant_id)
     return {"message": f"{message_count} messages deleted", "count": message_count}
 
 
@@ -720,17 +727,54 @@ async def delete_my_data(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Delete all user data (DSGVO compliance)"""
-    # Delete uploaded files
-    upload_dir = f"uploads/{current_user.id}"
-    if os.path.exists(upload_dir):
-        shutil.rmtree(upload_dir)
-
-    # Delete user (cascade will delete assistants, documents, messages)
-    await db.delete(current_user)
+    """Delete all user data (DSGVO compliance)
+
+    Database rows go away immediately with set-based DELETEs; vector collections and
+    uploaded files are removed by a background job whose status is at
+    GET /deletion-jobs/{job_id}. The job is stored in the same transaction, so it is
+    resumed after a restart or crash.
+    """
+    user_id, email = current_user.id, current_user.email
+    assistant_ids = select(Assistant.id).where(Assistant.user_id == user_id).scalar_subquery()
+
+    result = await db.execute(select(Document.id).where(Document.assistant_id.in_(assistant_ids)))
+    document_ids = result.scalars().all()
+
+    # Children first - no ORM cascade loading assistants/documents/messages into memory
+    for statement in (
+        delete(Message).where(Message.assistant_id.in_(assistant_ids)),
+        delete(Document).where(Document.assistant_id.in_(assistant_ids)),
+        delete(Assistant).where(Assistant.user_id == user_id),
+        delete(MagicLink).where(MagicLink.email == email),
+        delete(User).where(User.id == user_id),
+    ):
+        await db.execute(statement.execution_options(synchronize_session=False))
+    job = new_job(user_id=user_id, document_ids=document_ids, upload_dir=f"uploads/{user_id}")
+    db.add(job)
     await db.commit()
+    forget_user(user_id)
+
+    cleanup_jobs.run(job.id)
+    logger.info("🗑️ [DELETE USER] User %s deleted (%d documents), cleanup job %s", user_id, len(document_ids), job.id[:8])
+
+    return {
+        "message": "All your data has been deleted",
+        "cleanup_job_id": job.id,
+        "cleanup_status_url": f"/deletion-jobs/{job.id}",
+    }
+
+
+@app.get("/deletion-jobs/{job_id}")
+async def get_deletion_job(job_id: str):
+    """Status of the background cleanup after an account deletion
 
-    return {"message": "All your data has been deleted"}
+    No auth - the account is gone; the random job id is the receipt. Shows state and
+    timestamps only, nothing about the deleted account.
+    """
+    job = await cleanup_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return public_status(job)
 
 
 # Admin endpoints (nur für Superadmin)
@@ -768,8 +812,7 @@ async def get_current_model(
     model = get_model(model_id)
 
     # Check if model is loaded in RAM
-    from rag import _llm_instance, get_current_model_id
-    is_loaded_in_ram = _llm_instance is not None
+    is_loaded_in_ram = is_llm_loaded() and get_current_model_id() == model_id
     ram_model_id = get_current_model_id() if is_loaded_in_ram else None
 
     return {
@@ -784,25 +827,47 @@ async def get_current_model(
         "memory_status": {
             "loaded_in_ram": is_loaded_in_ram,
             "ram_model_id": ram_model_id,
+            "strategy": describe_memory_strategy(),
+            "process": process_memory(),
+            "speculative": speculative_status(),
             "message": f"✅ {model.name} loaded in RAM" if is_loaded_in_ram else f"⏳ {model.name} will load on first request"
-        }
+        },
+        "active_job": await model_jobs.active()
     }
 
 
-@app.post("/admin/llm/set")
+def switch_in_progress(active_job: dict, model_id: str) -> dict:
+    """Response for /admin/llm/set while a switch is queued or running"""
+    if active_job["model_id"] == model_id:
+        return {"message": f"Modellwechsel zu {active_job['model_name']} läuft bereits", **active_job}
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Modellwechsel zu {active_job['model_name']} läuft bereits - bitte warten, bis er abgeschlossen ist"
+    )
+
+
+@app.post("/admin/llm/set", status_code=status.HTTP_202_ACCEPTED)
 async def set_llm_model(
     request: SetLLMRequest,
     request_obj: Request,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user)
 ):
-    """Set LLM model (Superadmin only)"""
+    """Switch LLM model as background job: download + verify + load (Superadmin only)
+
+    Returns a job id immediately, progress via GET /admin/llm/jobs/{job_id} (any worker).
+    The active model only changes once the new one is loaded.
+    """
     if not is_superadmin(current_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Nur Superadmin hat Zugriff auf diesen Endpoint"
         )
 
+    # Several workers with their own model: a switch would only reach the worker handling this request
+    unsupported = switch_unsupported_reason(settings.web_concurrency, inference_client.enabled)
+    if unsupported:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=unsupported)
+
     # Validate model exists
     from llm_models import AVAILABLE_MODELS
     if request.model_id not in AVAILABLE_MODELS:
@@ -813,14 +878,15 @@ async def set_llm_model(
 
     model = get_model(request.model_id)
 
-    # Check if model file exists, download if not
+    # One switch at a time: the same model reports the queued/running job, another one is refused
+    active_job = await model_jobs.active()
+    if active_job:
+        return switch_in_progress(active_job, request.model_id)
+
+    # Fail fast on insufficient disk space instead of inside the job
     from pathlib import Path
     from llm_models import get_model_path
-    model_path = Path(get_model_path(request.model_id))
-
-    if not model_path.exists():
-        print(f"📥 [ADMIN] Model {model.name} not found, downloading...")
-        from download_model import download_model
+    if not Path(get_model_path(request.model_id)).exists():
         import re
 
         # Get user language from request
@@ -828,16 +894,7 @@ async def set_llm_model(
         lang = parse_accept_language(accept_language)
 
         try:
-            success = download_model(request.model_id)
-            if not success:
-                error_msg = get_translation("error.model_load", lang)
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=error_msg
-                )
-            print(f"✅ [ADMIN] Model {model.name} downloaded successfully")
-        except HTTPException:
-            raise  # Re-raise HTTPException directly
+            check_disk_space(request.model_id)
         except RuntimeError as e:
             # Disk space error - parse and translate
             error_str = str(e)
@@ -852,46 +909,61 @@ async def set_llm_model(
                 # Fallback to original error message
                 error_msg = error_str
 
-            print(f"❌ [ADMIN] Disk space error: {error_msg}")
+            logger.error("❌ [ADMIN] Disk space error: %s", error_msg)
             raise HTTPException(
                 status_code=status.HTTP_507_INSUFFICIENT_STORAGE,
                 detail=error_msg
             )
-        except Exception as e:
-            print(f"❌ [ADMIN] Error downloading model: {e}")
-            error_msg = get_translation("error.processing", lang, error=str(e))
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=error_msg
-            )
 
-    # Save to database
+    async def persist_model(model_id: str):
+        async with AsyncSessionLocal() as db:
+            await set_current_llm_model(db, model_id, current_user.email)
+
     try:
-        await set_current_llm_model(db, request.model_id, current_user.email)
-    except Exception as e:
-        print(f"❌ [ADMIN] Error saving model to database: {e}")
+        job = await model_jobs.submit(
+            request.model_id,
+            current_user.email,
+            download=download_model,
+            load=switch_llm,
+            on_success=persist_model
+        )
+    except SwitchInProgress as e:
+        # Submitted by a concurrent request since the check above
+        return switch_in_progress(e.job, request.model_id)
+    logger.info("🔄 [ADMIN] Model switch to %s queued by %s (job %s)", model.name, current_user.email, job["job_id"])
+
+    return {"message": f"Modellwechsel zu {model.name} gestartet", **job}
+
+
+@app.get("/admin/llm/jobs")
+async def get_model_jobs(current_user: User = Depends(get_current_user)):
+    """Recent model switch jobs (Superadmin only)"""
+    if not is_superadmin(current_user):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Fehler beim Speichern in Datenbank: {str(e)}"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Nur Superadmin hat Zugriff auf diesen Endpoint"
         )
 
-    # Reload LLM in memory
-    try:
-        reload_llm(request.model_id)
-        print(f"🔄 [ADMIN] LLM Model switched to: {model.name} by {current_user.email}")
-    except Exception as e:
-        print(f"❌ [ADMIN] Error reloading LLM: {e}")
-        print(f"Traceback: {traceback.format_exc()}")
+    return await model_jobs.all()
+
+
+@app.get("/admin/llm/jobs/{job_id}")
+async def get_model_job(job_id: str, current_user: User = Depends(get_current_user)):
+    """Progress of a model switch job: bytes, throughput, ETA, load state (Superadmin only)"""
+    if not is_superadmin(current_user):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Fehler beim Laden des Modells: {str(e)}"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Nur Superadmin hat Zugriff auf diesen Endpoint"
         )
 
-    return {
-        "message": f"LLM Model erfolgreich gewechselt zu: {model.name}",
-        "model_id": request.model_id,
-        "model_name": model.name
-    }
+    job = await model_jobs.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    return job
 
 
 if __name__ == "__main__":
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Measure RSS per uvicorn worker (shared vs. private) for 1, 2 and 4 workers
+
+Startet `uvicorn main:app --workers N`, wartet bis alle Worker warm sind (/ready)
+und liest danach /proc/<pid>/smaps_rollup jedes Worker-Prozesses.
+
+Usage:
+    python measure_worker_memory.py                  # 1, 2, 4 Worker
+    python measure_worker_memory.py --workers 1 2    # eigene Auswahl
+    python measure_worker_memory.py --json           # maschinenlesbar
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from llm_memory import process_memory
+
+
+def child_pids(pid: int) -> list:
+    """Direct child processes of pid (Linux /proc)"""
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # Field 4 is the parent pid; comm (field 2) may contain spaces
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (FileNotFoundError, ProcessLookupError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def wait_until_ready(port: int, workers: int, timeout: float) -> bool:
+    """Poll /ready until every worker has answered 200 (workers are picked by the kernel)"""
+    ready_pids = set()
+    deadline = time.time() + timeout
+
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=5) as response:
+                ready_pids.add(json.load(response).get("pid"))
+                if len(ready_pids) >= workers:
+                    return True
+                continue
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(1)
+
+    return False
+
+
+def measure(workers: int, port: int, timeout: float, settle: float) -> dict:
+    """Boot the API with N workers and collect per-worker memory"""
+    print(f"🚀 Starting uvicorn with {workers} worker(s) on port {port}...", file=sys.stderr)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        if not wait_until_ready(port, workers, timeout):
+            raise RuntimeError(f"Workers not ready after {timeout:.0f}s")
+
+        time.sleep(settle)  # Let lazy allocations settle
+
+        # With --workers 1 uvicorn serves from the main process, otherwise from children
+        pids = child_pids(server.pid) if workers > 1 else [server.pid]
+        per_worker = {pid: process_memory(pid) for pid in pids}
+
+        return {
+            "workers": workers,
+            "per_worker": per_worker,
+            "total_rss_mb": round(sum(m.get("rss_mb", 0) for m in per_worker.values()), 1),
+            # Sum of PSS = real memory used, shared pages counted once
+            "total_pss_mb": round(sum(m.get("pss_mb", 0) for m in per_worker.values()), 1),
+        }
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=900, help="Seconds to wait for warm-up")
+    parser.add_argument("--settle", type=float, default=5, help="Seconds to wait after ready")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    results = [measure(n, args.port, args.timeout, args.settle) for n in args.workers]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 80)
+    print(f"{'Workers':>7} {'PID':>8} {'RSS MB':>9} {'PSS MB':>9} {'Shared MB':>10} {'Private MB':>11}")
+    print("-" * 80)
+    for result in results:
+        for pid, mem in result["per_worker"].items():
+            print(f"{result['workers']:>7} {pid:>8} {mem.get('rss_mb', 0):>9.1f} {mem.get('pss_mb', 0):>9.1f} "
+                  f"{mem.get('shared_mb', 0):>10.1f} {mem.get('private_mb', 0):>11.1f}")
+        print(f"{'':>7} {'total':>8} {result['total_rss_mb']:>9.1f} {result['total_pss_mb']:>9.1f}")
+        print("-" * 80)
+
+
+if __name__ == "__main__":
+    main()
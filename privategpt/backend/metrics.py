@@ -0,0 +1,159 @@
+"""Prometheus Metrics - Latenz pro RAG-Stufe, Tokens, Cache-Treffer, Ingestion und Inference-Queue
+
+Mit mehreren uvicorn-Workern PROMETHEUS_MULTIPROC_DIR setzen (railway_startup.sh macht das),
+sonst zeigt /metrics nur den Worker, der den Scrape zufällig bearbeitet.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess
+)
+
+from tracing import span, record_span
+
+# Seconds: embedding/retrieval are milliseconds, CPU generation can take minutes
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+RAG_STAGE_SECONDS = Histogram(
+    "privategpt_rag_stage_seconds",
+    "Duration of RAGEngine.query stages (embedding, retrieval, web_search, prompt_eval, generation, total)",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+RETRIEVAL_COLLECTION_SECONDS = Histogram(
+    "privategpt_retrieval_collection_seconds",
+    "Chroma retrieval per document collection",
+    buckets=LATENCY_BUCKETS,
+)
+PROMPT_TOKENS = Histogram("privategpt_prompt_tokens", "Prompt tokens per generation", buckets=TOKEN_BUCKETS)
+COMPLETION_TOKENS = Histogram("privategpt_completion_tokens", "Completion tokens per generation", buckets=TOKEN_BUCKETS)
+TOKENS_PER_SECOND = Histogram(
+    "privategpt_generation_tokens_per_second",
+    "Decode throughput per generation (after the first token)",
+    buckets=(0.5, 1, 2, 5, 10, 20, 50, 100, 200),
+)
+GENERATIONS = Counter("privategpt_generations_total", "Generations by outcome", ["outcome"])
+CACHE_REQUESTS = Counter(
+    "privategpt_cache_requests_total",
+    "Cache lookups (hit ratio = hit / (hit + miss))",
+    ["cache", "result"],
+)
+
+INGEST_SECONDS = Histogram(
+    "privategpt_ingest_seconds",
+    "Document ingestion duration per stage (extract, embed_store, total)",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+INGEST_DOCUMENTS = Counter("privategpt_ingest_documents_total", "Ingested documents by outcome", ["outcome"])
+INGEST_BYTES = Counter("privategpt_ingest_bytes_total", "Bytes of ingested source files")
+INGEST_CHUNKS = Counter("privategpt_ingest_chunks_total", "Chunks written to the vector store")
+
+INFERENCE_WAITING = Gauge(
+    "privategpt_inference_queue_depth",
+    "Generations waiting for the inference slot",
+    multiprocess_mode="livesum",
+)
+INFERENCE_BUSY = Gauge(
+    "privategpt_inference_busy",
+    "1 while a generation holds the inference slot",
+    multiprocess_mode="livesum",
+)
+DB_CONNECTIONS_IN_USE = Gauge(
+    "privategpt_db_connections_in_use",
+    "Database connections checked out of the pool (should not grow with running generations)",
+    multiprocess_mode="livesum",
+)
+LLM_MODEL_LOADED = Gauge(
+    "privategpt_llm_model_loaded",
+    "1 for the model currently loaded in this process",
+    ["model_id"],
+    multiprocess_mode="liveall",
+)
+
+_last_model_id: Optional[str] = None
+
+
+@contextmanager
+def observe_stage(stage: str, span_name: Optional[str] = None):
+    """Time a block as one RAG stage (histogram + tracing span)"""
+    started = time.perf_counter()
+    try:
+        with span(span_name or stage):
+            yield
+    finally:
+        RAG_STAGE_SECONDS.labels(stage=stage).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def observe_ingest_stage(stage: str):
+    """Time a block as one ingestion stage"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        INGEST_SECONDS.labels(stage=stage).observe(time.perf_counter() - started)
+
+
+def observe_generation(items: Iterable, prompt_tokens: Optional[int] = None) -> Iterator:
+    """Pass streamed tokens through, recording prompt eval (time to first token),
+    generation time, token counts and tokens/sec"""
+    started = time.perf_counter()
+    started_ns = time.time_ns()
+    first_token_at = None
+    first_token_ns = None
+    count = 0
+    outcome = "error"
+
+    if prompt_tokens is not None:
+        PROMPT_TOKENS.observe(prompt_tokens)
+
+    try:
+        for item in items:
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+                first_token_ns = time.time_ns()
+                RAG_STAGE_SECONDS.labels(stage="prompt_eval").observe(first_token_at - started)
+                record_span("prompt_eval", started_ns, first_token_ns, prompt_tokens=prompt_tokens or 0)
+            count += 1
+            yield item
+        outcome = "completed"
+    except GeneratorExit:
+        outcome = "stopped"
+        raise
+    finally:
+        GENERATIONS.labels(outcome=outcome).inc()
+        if first_token_at is not None:
+            elapsed = time.perf_counter() - first_token_at
+            RAG_STAGE_SECONDS.labels(stage="generation").observe(elapsed)
+            record_span("generation", first_token_ns, time.time_ns(), completion_tokens=count, outcome=outcome)
+            COMPLETION_TOKENS.observe(count)
+            if count > 1 and elapsed > 0:
+                TOKENS_PER_SECOND.observe((count - 1) / elapsed)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def set_loaded_model(model_id: str, loaded: bool = True):
+    """Expose which model this process holds in RAM"""
+    global _last_model_id
+
+    if _last_model_id and _last_model_id != model_id:
+        LLM_MODEL_LOADED.labels(model_id=_last_model_id).set(0)
+    LLM_MODEL_LOADED.labels(model_id=model_id).set(1 if loaded else 0)
+    _last_model_id = model_id
+
+
+def render() -> Tuple[bytes, str]:
+    """Exposition payload and content type (aggregated over workers in multiprocess mode)"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Migration: Add history_summary and summary_until_id columns to assistants table
+(rolling conversation summary, see conversation_memory.py)
+Run this on Railway: python migrate_add_conversation_summary.py
+"""
+import asyncio
+import os
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import inspect, text
+
+COLUMNS = [
+    ("history_summary", "TEXT NULL"),
+    ("summary_until_id", "INTEGER NOT NULL DEFAULT 0"),  # 0 = nothing summarized yet
+]
+
+
+async def migrate():
+    """Add summary columns if they don't exist"""
+    database_url = os.getenv('DATABASE_URL', 'sqlite+aiosqlite:///./privategpt.db')
+
+    # Convert to asyncpg format
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    print("🔄 Connecting to database...")
+    engine = create_async_engine(database_url)
+
+    try:
+        async with engine.begin() as conn:
+            columns = await conn.run_sync(
+                lambda sync_conn: {c["name"] for c in inspect(sync_conn).get_columns("assistants")}
+            )
+
+            for column, definition in COLUMNS:
+                if column not in columns:
+                    print(f"✅ Adding {column} column...")
+                    await conn.execute(text(f"ALTER TABLE assistants ADD COLUMN {column} {definition}"))
+                else:
+                    print(f"⚠️  Column {column} already exists.")
+
+        print("\n✅ Migration successful!\n")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}\n")
+        return False
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    success = asyncio.run(migrate())
+    exit(0 if success else 1)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Migration: Add sha256 column to documents table
+(hash of the uploaded file, computed while streaming - see uploads.py)
+Run this on Railway: python migrate_add_document_sha256.py
+"""
+import asyncio
+import os
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import inspect, text
+
+COLUMNS = [
+    ("sha256", "VARCHAR(64) NULL"),  # Existing documents stay NULL
+]
+
+
+async def migrate():
+    """Add sha256 column if it doesn't exist"""
+    database_url = os.getenv('DATABASE_URL', 'sqlite+aiosqlite:///./privategpt.db')
+
+    # Convert to asyncpg format
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    print("🔄 Connecting to database...")
+    engine = create_async_engine(database_url)
+
+    try:
+        async with engine.begin() as conn:
+            columns = await conn.run_sync(
+                lambda sync_conn: {c["name"] for c in inspect(sync_conn).get_columns("documents")}
+            )
+
+            for column, definition in COLUMNS:
+                if column not in columns:
+                    print(f"✅ Adding {column} column...")
+                    await conn.execute(text(f"ALTER TABLE documents ADD COLUMN {column} {definition}"))
+                else:
+                    print(f"⚠️  Column {column} already exists.")
+
+        print("\n✅ Migration successful!\n")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}\n")
+        return False
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    success = asyncio.run(migrate())
+    exit(0 if success else 1)
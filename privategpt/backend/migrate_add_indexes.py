@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Migration: Add indexes for the hot queries in main.py (existing databases;
+new databases get them from the models via init_db)
+Run this on Railway: python migrate_add_indexes.py
+"""
+import asyncio
+import os
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import text
+
+# Same names as the Index() definitions in database.py
+INDEXES = [
+    ("ix_assistants_user_id", "assistants", "user_id"),
+    ("ix_documents_assistant_id_processed", "documents", "assistant_id, processed"),
+    ("ix_messages_assistant_id_id", "messages", "assistant_id, id"),
+]
+
+
+async def migrate():
+    """Create indexes if they don't exist (SQLite and PostgreSQL)"""
+    database_url = os.getenv('DATABASE_URL', 'sqlite+aiosqlite:///./privategpt.db')
+
+    # Convert to asyncpg format
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    print("🔄 Connecting to database...")
+    engine = create_async_engine(database_url)
+
+    try:
+        async with engine.begin() as conn:
+            for name, table, columns in INDEXES:
+                print(f"✅ Index {name} on {table}({columns})...")
+                await conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+
+            # Fresh statistics so the planner actually picks the new indexes
+            await conn.execute(text("ANALYZE"))
+
+        print("\n✅ Migration successful!\n")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}\n")
+        return False
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    success = asyncio.run(migrate())
+    exit(0 if success else 1)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Migration: Add source_type and source_details columns to messages table
+and backfill source_type of old assistant messages in batches
+Run this on Railway: python migrate_add_message_sources.py
+"""
+import asyncio
+import os
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import inspect, text
+
+from database import legacy_source_type
+
+BATCH_SIZE = 1000  # Rows per UPDATE transaction (short locks on a live database)
+
+
+async def migrate():
+    """Add source columns if they don't exist, then backfill source_type"""
+    database_url = os.getenv('DATABASE_URL', 'sqlite+aiosqlite:///./privategpt.db')
+
+    # Convert to asyncpg format
+    if database_url.startswith('postgresql://'):
+        database_url = database_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+    print("🔄 Connecting to database...")
+    engine = create_async_engine(database_url)
+
+    try:
+        async with engine.begin() as conn:
+            columns = await conn.run_sync(
+                lambda sync_conn: {c["name"] for c in inspect(sync_conn).get_columns("messages")}
+            )
+
+            for column in ("source_type", "source_details"):
+                if column not in columns:
+                    print(f"✅ Adding {column} column...")
+                    await conn.execute(text(f"ALTER TABLE messages ADD COLUMN {column} VARCHAR NULL"))
+                else:
+                    print(f"⚠️  Column {column} already exists.")
+
+        # Backfill in keyset batches, one transaction per batch
+        update_stmt = text("UPDATE messages SET source_type = :source_type WHERE id = :message_id")
+        last_id = 0
+        updated = 0
+
+        while True:
+            async with engine.begin() as conn:
+                result = await conn.execute(text("""
+                    SELECT id, content FROM messages
+                    WHERE role = 'assistant' AND source_type IS NULL AND id > :last_id
+                    ORDER BY id
+                    LIMIT :batch_size
+                """), {"last_id": last_id, "batch_size": BATCH_SIZE})
+                rows = result.fetchall()
+                if not rows:
+                    break
+
+                last_id = rows[-1].id
+                params = [
+                    {"source_type": source_type, "message_id": row.id}
+                    for row in rows
+                    if (source_type := legacy_source_type(row.content)) is not None
+                ]
+                if params:
+                    await conn.execute(update_stmt, params)
+                updated += len(params)
+                print(f"   ... {updated} messages backfilled (up to id {last_id})")
+
+        print(f"\n✅ Migration successful! {updated} messages backfilled.\n")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}\n")
+        return False
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    success = asyncio.run(migrate())
+    exit(0 if success else 1)
@@ -0,0 +1,241 @@
+"""Model Switch Jobs - Download + Verify + Load im Hintergrund mit Fortschrittsanzeige
+
+Der Job liegt in model_switch_jobs (database.py): der Worker, der ihn ausführt, schreibt alle
+HEARTBEAT_INTERVAL Sekunden den Fortschritt, jeder Worker kann ihn lesen. Mit mehreren Workern
+(WEB_CONCURRENCY > 1) hat jeder Worker sein eigenes Modell im RAM - ein Wechsel ist dann nur
+über den Inference-Service möglich (INFERENCE_URL), der das Modell für alle Worker hält.
+"""
+import asyncio
+import logging
+import threading
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import select, update
+
+from database import AsyncSessionLocal, ModelSwitchJob
+from llm_models import get_model, get_model_path
+
+logger = logging.getLogger(__name__)
+
+# Job states in order
+QUEUED = "queued"
+DOWNLOADING = "downloading"
+VERIFYING = "verifying"
+LOADING = "loading"
+DONE = "done"
+FAILED = "failed"
+
+FINISHED_STATES = (DONE, FAILED)
+MAX_LISTED_JOBS = 20  # Last N jobs for the admin panel
+HEARTBEAT_INTERVAL = 2.0  # Seconds between progress writes of the running job
+STALE_AFTER = timedelta(minutes=2)  # No heartbeat for this long = worker died, the job is failed
+
+
+def switch_unsupported_reason(workers: int, inference_service: bool) -> Optional[str]:
+    """Why a model switch cannot work in this deployment, None if it can"""
+    if workers > 1 and not inference_service:
+        return (f"Modellwechsel mit {workers} Workern nur über den Inference-Service möglich "
+                f"(INFERENCE_URL setzen oder WEB_CONCURRENCY=1) - sonst wechselt nur ein Worker das Modell")
+    return None
+
+
+class SwitchInProgress(Exception):
+    """Another model switch is queued or running - job: its job_to_dict()"""
+
+    def __init__(self, job: Dict):
+        super().__init__(f"Model switch to {job['model_id']} already queued or running")
+        self.job = job
+
+
+class _Progress:
+    """Download progress of the running job, updated from the download threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict = {}
+
+    def update(self, **values):
+        with self._lock:
+            self._values.update(values)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return dict(self._values)
+
+    def on_progress(self, downloaded: int, total: int):
+        """Progress callback from download_model()"""
+        with self._lock:
+            if "download_started_at" not in self._values:
+                self._values.update(download_started_at=datetime.utcnow(), resumed_bytes=downloaded)
+            self._values.update(bytes_downloaded=downloaded, total_bytes=total)
+            if total and downloaded >= total:
+                self._values["state"] = VERIFYING
+
+
+def job_to_dict(job: ModelSwitchJob) -> Dict:
+    now = job.finished_at or datetime.utcnow()
+    throughput = None
+    eta_seconds = None
+
+    if job.download_started_at is not None:
+        elapsed = max(((job.load_started_at or now) - job.download_started_at).total_seconds(), 1e-6)
+        throughput = (job.bytes_downloaded - job.resumed_bytes) / elapsed
+        if job.state == DOWNLOADING and throughput > 0 and job.total_bytes:
+            eta_seconds = round((job.total_bytes - job.bytes_downloaded) / throughput, 1)
+
+    return {
+        "job_id": job.id,
+        "model_id": job.model_id,
+        "model_name": get_model(job.model_id).name,
+        "state": job.state,
+        "requested_by": job.requested_by,
+        "bytes_downloaded": job.bytes_downloaded,
+        "total_bytes": job.total_bytes,
+        "percent": round(job.bytes_downloaded * 100 / job.total_bytes, 1) if job.total_bytes else None,
+        "throughput_mb_s": round(throughput / (1024 ** 2), 2) if throughput is not None else None,
+        "eta_seconds": eta_seconds,
+        "load_seconds": job.load_seconds,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "error": job.error,
+    }
+
+
+class ModelJobManager:
+    """Runs model switches one at a time as asyncio tasks (blocking work in threads)"""
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._lock = asyncio.Lock()  # One switch at a time - two models loading would exhaust RAM
+        self._submit_lock = asyncio.Lock()  # No request between the active() check and the insert
+
+    async def submit(
+        self,
+        model_id: str,
+        requested_by: str,
+        download: Callable[..., bool],
+        load: Callable[[str], None],
+        on_success: Callable[[str], Awaitable[None]],
+    ) -> Dict:
+        """Enqueue download + verify + load; on_success runs after the new model is active
+
+        Raises SwitchInProgress if a switch is already queued or running.
+
+        Args:
+            download: download_model(model_id, progress=...) -> bool
+            load: blocking function that loads model_id and makes it active
+            on_success: coroutine persisting the new model selection
+        """
+        async with self._submit_lock:
+            active = await self.active()
+            if active:
+                raise SwitchInProgress(active)
+            job = ModelSwitchJob(id=uuid.uuid4().hex, model_id=model_id, requested_by=requested_by, state=QUEUED)
+            async with AsyncSessionLocal() as db:
+                db.add(job)
+                await db.commit()
+        self._tasks[job.id] = asyncio.create_task(self._run(job.id, model_id, download, load, on_success))
+        return job_to_dict(job)
+
+    async def _save(self, job_id: str, **values):
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(ModelSwitchJob)
+                .where(ModelSwitchJob.id == job_id)
+                .values(updated_at=datetime.utcnow(), **values)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+    async def _heartbeat(self, job_id: str, progress: _Progress):
+        """Write download progress (and prove the job is alive) while it waits or runs"""
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            try:
+                await self._save(job_id, **progress.snapshot())
+            except Exception as e:
+                logger.warning("⚠️ [JOB %s] Progress not saved: %s", job_id[:8], e)
+
+    async def _run(self, job_id: str, model_id: str, download, load, on_success):
+        progress = _Progress()
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, progress))
+        try:
+            async with self._lock:
+                try:
+                    if not Path(get_model_path(model_id)).exists():
+                        progress.update(state=DOWNLOADING)
+                        await self._save(job_id, state=DOWNLOADING)
+                        logger.info("📥 [JOB %s] Downloading %s...", job_id[:8], model_id)
+                        success = await asyncio.to_thread(download, model_id, progress=progress.on_progress)
+                        if not success:
+                            raise RuntimeError(f"Download of {model_id} failed (see server log, partial file kept for resume)")
+
+                    load_started_at = datetime.utcnow()
+                    progress.update(state=LOADING, load_started_at=load_started_at)
+                    await self._save(job_id, **progress.snapshot())
+                    logger.info("🔄 [JOB %s] Loading %s...", job_id[:8], model_id)
+                    await asyncio.to_thread(load, model_id)
+                    load_seconds = round((datetime.utcnow() - load_started_at).total_seconds(), 2)
+
+                    await on_success(model_id)
+                    final = {"state": DONE, "load_seconds": load_seconds}
+                    logger.info("✅ [JOB %s] %s active (load %ss)", job_id[:8], model_id, load_seconds)
+                except Exception as e:
+                    final = {"state": FAILED, "error": str(e)}
+                    logger.exception("❌ [JOB %s] Model switch to %s failed: %s", job_id[:8], model_id, e)
+
+                # Stop the heartbeat first - a late progress write must not overwrite the final state
+                heartbeat.cancel()
+                await asyncio.gather(heartbeat, return_exceptions=True)
+                await self._save(job_id, finished_at=datetime.utcnow(), **final)
+        finally:
+            heartbeat.cancel()
+            self._tasks.pop(job_id, None)
+
+    @staticmethod
+    async def _expire_stale(db):
+        """Jobs whose worker stopped sending heartbeats (restart, crash) can't finish anymore"""
+        await db.execute(
+            update(ModelSwitchJob)
+            .where(
+                ModelSwitchJob.state.notin_(FINISHED_STATES),
+                ModelSwitchJob.updated_at < datetime.utcnow() - STALE_AFTER,
+            )
+            .values(state=FAILED, error="Interrupted (worker restarted)", finished_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        async with AsyncSessionLocal() as db:
+            await self._expire_stale(db)
+            job = await db.get(ModelSwitchJob, job_id)
+            return job_to_dict(job) if job else None
+
+    async def active(self) -> Optional[Dict]:
+        """The job currently queued, downloading or loading, if any"""
+        async with AsyncSessionLocal() as db:
+            await self._expire_stale(db)
+            result = await db.execute(
+                select(ModelSwitchJob)
+                .where(ModelSwitchJob.state.notin_(FINISHED_STATES))
+                .order_by(ModelSwitchJob.created_at)
+                .limit(1)
+            )
+            job = result.scalar_one_or_none()
+            return job_to_dict(job) if job else None
+
+    async def all(self) -> List[Dict]:
+        async with AsyncSessionLocal() as db:
+            await self._expire_stale(db)
+            result = await db.execute(
+                select(ModelSwitchJob).order_by(ModelSwitchJob.created_at.desc()).limit(MAX_LISTED_JOBS)
+            )
+            return [job_to_dict(job) for job in result.scalars()]
+
+
+# Global instance
+model_jobs = ModelJobManager()
@@ -0,0 +1,45 @@
+"""Password Hashing - bcrypt in einem begrenzten Thread-Pool statt im Event-Loop"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from config import get_settings
+
+settings = get_settings()
+
+
+class PasswordHasher:
+    """bcrypt hash/verify off the event loop, at most `concurrency` at a time
+
+    bcrypt releases the GIL while hashing, so the pool threads run in parallel
+    and the event loop keeps serving chat requests during a burst of logins.
+    Hashes with a different cost than `rounds` are flagged for rehash on login.
+    """
+
+    def __init__(self, rounds: int, concurrency: int):
+        self.rounds = rounds
+        self.concurrency = concurrency
+        self.context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,  # min = max = rounds: any other cost needs an update
+            bcrypt__max_rounds=rounds,
+        )
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bcrypt")
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """(valid, new_hash) - new_hash is set if the stored hash uses outdated rounds"""
+        return await self._run(self.context.verify_and_update, password, hashed)
+
+
+# Global instance
+password_hasher = PasswordHasher(rounds=settings.bcrypt_rounds, concurrency=settings.password_hash_concurrency)
@@ -0,0 +1,110 @@
+"""PDF Backends - Text pro Seite über PyPDF2 (Standard) oder C-basierte Bibliotheken
+
+Gleiches Interface für alle Backends: backend(file_path) liefert den Text Seite für Seite.
+Auswahl über PDF_BACKEND in .env; ist die Bibliothek nicht installiert, wird mit Warnung
+auf das erste installierte Backend zurückgefallen (PyPDF2, pypdfium2, pymupdf). Ohne
+installiertes Backend schlägt jede PDF-Extraktion mit einem ImportError fehl, der die
+fehlende Bibliothek nennt. Vergleich (Seiten/s, Textgleichheit): bench_pdf_extract.py
+"""
+import logging
+from typing import Callable, Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = "pypdf2"
+
+PdfBackend = Callable[[str], Iterator[str]]
+
+
+def pypdf2_pages(file_path: str) -> Iterator[str]:
+    """Pure Python (slow on text-heavy PDFs, no native dependency)"""
+    import PyPDF2
+
+    with open(file_path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+        for page in reader.pages:
+            yield page.extract_text() or ""
+
+
+def pypdfium2_pages(file_path: str) -> Iterator[str]:
+    """PDFium (Chrome's PDF engine), Apache/BSD licensed wheels"""
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(file_path)
+    try:
+        for index in range(len(pdf)):
+            page = pdf[index]
+            text_page = page.get_textpage()
+            try:
+                yield text_page.get_text_range().replace("\r\n", "\n")
+            finally:
+                text_page.close()
+                page.close()
+    finally:
+        pdf.close()
+
+
+def pymupdf_pages(file_path: str) -> Iterator[str]:
+    """MuPDF - fastest, but AGPL licensed (not in requirements.txt, install separately)"""
+    try:
+        import pymupdf
+    except ImportError:
+        import fitz as pymupdf  # PyMuPDF < 1.24
+
+    with pymupdf.open(file_path) as pdf:
+        for page in pdf:
+            yield page.get_text("text")
+
+
+PDF_BACKENDS: Dict[str, PdfBackend] = {
+    "pypdf2": pypdf2_pages,
+    "pypdfium2": pypdfium2_pages,
+    "pymupdf": pymupdf_pages,
+}
+
+_MODULES = {"pypdf2": "PyPDF2", "pypdfium2": "pypdfium2", "pymupdf": "pymupdf"}
+
+
+def is_available(name: str) -> bool:
+    if name not in PDF_BACKENDS:
+        return False
+    try:
+        __import__(_MODULES[name])
+        return True
+    except ImportError:
+        if name == "pymupdf":
+            try:
+                __import__("fitz")
+                return True
+            except ImportError:
+                pass
+        return False
+
+
+def available_backends() -> List[str]:
+    return [name for name in PDF_BACKENDS if is_available(name)]
+
+
+def _fallback(reason: str) -> PdfBackend:
+    """First installed backend (PyPDF2 before the optional ones)"""
+    installed = available_backends()
+    if not installed:
+        message = f"{reason} and no PDF backend is installed - pip install PyPDF2 (or pypdfium2)"
+        logger.error("❌ [PDF] %s", message)
+
+        def missing_backend(file_path: str) -> Iterator[str]:
+            raise ImportError(message)
+
+        return missing_backend  # Other file types keep working, PDF uploads fail with the message
+    logger.warning("⚠️ [PDF] %s, using %s", reason, installed[0])
+    return PDF_BACKENDS[installed[0]]
+
+
+def get_pdf_backend(name: str) -> PdfBackend:
+    """Configured backend, the first installed one if it is unknown or not installed"""
+    name = (name or DEFAULT_BACKEND).lower()
+    if name not in PDF_BACKENDS:
+        return _fallback(f"Unknown PDF_BACKEND {name!r} (choose from {', '.join(PDF_BACKENDS)})")
+    if not is_available(name):
+        return _fallback(f"PDF_BACKEND={name} is not installed")
+    return PDF_BACKENDS[name]
@@ -6,38 +6,36 @@ os.environ['SENTENCE_TRANSFORMERS_HOME'] = '/tmp/.cache'
 os.environ['HF_HOME'] = '/tmp/.cache'
 os.environ['TRANSFORMERS_CACHE'] = '/tmp/.cache'
 
-# Debug: Print environment variables to verify they're set
-print(f"DEBUG: SENTENCE_TRANSFORMERS_HOME = {os.environ.get('SENTENCE_TRANSFORMERS_HOME')}")
-print(f"DEBUG: HF_HOME = {os.environ.get('HF_HOME')}")
-print(f"DEBUG: TRANSFORMERS_CACHE = {os.environ.get('TRANSFORMERS_CACHE')}")
-
-from typing import List, Dict
-import PyPDF2
+import asyncio
+import logging
+import time
+from typing import List, Dict, Optional
 import chromadb
 from chromadb.config import Settings as ChromaSettings
 from chromadb.utils import embedding_functions
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-import traceback
-
-# NEU: llama-cpp-python statt httpx/Ollama
-try:
-    from llama_cpp import Llama
-    LLAMA_CPP_AVAILABLE = True
-except ImportError:
-    LLAMA_CPP_AVAILABLE = False
-    print("⚠️ llama-cpp-python not installed. Falling back to Ollama.")
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
 
 # Fallback: httpx für Ollama
 import httpx
 
 from config import get_settings
 from web_search import searxng_client, AnswerQualityDetector
-from llm_models import get_model_path, DEFAULT_MODEL, get_model
+from llm_models import get_model
+from readiness import readiness
+from inference_client import inference_client
+from conversation_memory import ConversationHistory
+from chunker import ingest_batches
+from generation import GenerationCancelled, CancellationToken, stream_local, collect_completion
+from tracing import span
+from metrics import (
+    observe_stage, observe_generation,
+    RAG_STAGE_SECONDS, RETRIEVAL_COLLECTION_SECONDS, INGEST_SECONDS, INGEST_DOCUMENTS, INGEST_BYTES, INGEST_CHUNKS
+)
+import llm_runtime
+from llm_runtime import get_llm, EMBEDDING_MODEL_NAME
 
 settings = get_settings()
-
-# Global variable to track current model
-_current_model_id = DEFAULT_MODEL
+logger = logging.getLogger(__name__)
 
 # Initialize ChromaDB - NEU: Persistent Path für Railway Volume
 chroma_db_path = os.getenv("CHROMA_DB_PATH", "./chroma_db")
@@ -46,88 +44,108 @@ chroma_client = chromadb.PersistentClient(
     settings=ChromaSettings(anonymized_telemetry=False)
 )
 
-# Initialize Embedding Function for ChromaDB
-# Using multilingual model for German/English support
-embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
-    model_name="paraphrase-multilingual-MiniLM-L12-v2"
-)
 
-# NEU: Global LLM Instance (lazy loading)
-_llm_instance = None
-
-
-def get_llm() -> Llama:
-    """Get or create LLM instance (singleton)"""
-    global _llm_instance, _current_model_id
-    if not LLAMA_CPP_AVAILABLE:
-        return None
-
-    if _llm_instance is None:
-        model_path = get_model_path(_current_model_id)
-
-        if not os.path.exists(model_path):
-            print(f"⚠️ Model not found at {model_path}")
-
-            # Try fallback to qwen2.5-0.5b (smallest model)
-            fallback_model_id = "qwen2.5-0.5b"
-            fallback_path = get_model_path(fallback_model_id)
-
-            if os.path.exists(fallback_path):
-                print(f"🔄 Falling back to {fallback_model_id}...")
-                _current_model_id = fallback_model_id
-                model_path = fallback_path
-            else:
-                print(f"❌ No models available (tried {_current_model_id} and {fallback_model_id})")
-                print("Falling back to Ollama...")
-                return None
-
-        print(f"🔄 Loading LLM model: {_current_model_id} from {model_path}...")
-        _llm_instance = Llama(
-            model_path=model_path,
-            n_ctx=settings.llm_context_size,
-            n_threads=settings.llm_threads,
-            verbose=False
-        )
-        print(f"✅ LLM model {_current_model_id} loaded successfully!")
-    return _llm_instance
+def delete_document_vectors(document_id: int):
+    """Drop the Chroma collection of a document (raises if there is none)"""
+    chroma_client.delete_collection(f"doc_{document_id}")
 
 
-def reload_llm(model_id: str):
-    """Reload LLM with different model"""
-    global _llm_instance, _current_model_id
+class RemoteEmbeddingFunction(EmbeddingFunction[Documents]):
+    """ChromaDB embedding function backed by the inference service"""
 
-    print(f"🔄 [RELOAD] Switching LLM from {_current_model_id} to {model_id}...")
+    def __call__(self, input: Documents) -> Embeddings:
+        return inference_client.embed(list(input))
 
-    # Explicitly unload current model from memory
-    if _llm_instance is not None:
-        print(f"🗑️  [RELOAD] Unloading {_current_model_id} from memory...")
-        old_instance = _llm_instance
-        _llm_instance = None
 
-        # Force garbage collection to free RAM immediately
-        del old_instance
-        import gc
-        gc.collect()
-        print(f"✅ [RELOAD] {_current_model_id} unloaded from RAM")
+# Initialize Embedding Function for ChromaDB
+# Using multilingual model for German/English support
+if inference_client.enabled:
+    embedding_function = RemoteEmbeddingFunction()
+else:
+    embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
+        model_name=EMBEDDING_MODEL_NAME
+    )
+
+# LLM lives in llm_runtime (in-process) or in inference_server.py (INFERENCE_URL)
+def reload_llm(model_id: str):
+    """Reload LLM with different model"""
+    if inference_client.enabled:
+        logger.info("🔄 [RELOAD] Switching inference service to %s...", model_id)
+        inference_client.set_model(model_id)
+    else:
+        llm_runtime.reload_llm(model_id)
 
-    _current_model_id = model_id
 
-    # Load new model (will be loaded on next get_llm() call)
-    print(f"✅ [RELOAD] LLM model switched to {model_id} (will load on next request)")
+def switch_llm(model_id: str):
+    """Load and warm model_id, then make it active (blocking)"""
+    if inference_client.enabled:
+        inference_client.switch_model(model_id)
+    else:
+        llm_runtime.switch_llm(model_id)
 
 
 def get_current_model_id() -> str:
     """Get current model ID"""
-    global _current_model_id
-    return _current_model_id
+    if inference_client.enabled and inference_client.model_id:
+        return inference_client.model_id
+    return llm_runtime.get_current_model_id()
+
+
+def is_llm_loaded() -> bool:
+    """Check if the LLM is currently loaded in RAM"""
+    if inference_client.enabled:
+        return inference_client.is_model_loaded()
+    return llm_runtime.is_llm_loaded()
+
+
+def warm_up_llm():
+    """Load LLM and run a tiny generation to page in the weights (blocking)"""
+    if inference_client.enabled:
+        inference_client.warm_up()
+    else:
+        llm_runtime.warm_up_llm()
+
+
+def _llm_available() -> bool:
+    """True if a llama-cpp model can be used (remote service or in-process)"""
+    return inference_client.enabled or get_llm() is not None
+
+
+async def _complete(prompt: str, cancel_token: Optional[CancellationToken] = None, **params) -> Dict:
+    """Run a completion on the inference service or the in-process model
+
+    Streams in a worker thread and stops between tokens once cancel_token is
+    cancelled (raises GenerationCancelled).
+    """
+    with span("llm", model_id=get_current_model_id(), remote=inference_client.enabled) as llm_span:
+        if inference_client.enabled:
+            chunks = observe_generation(inference_client.stream_complete(prompt, **params))
+        else:
+            chunks = stream_local(get_llm(), prompt, cancel_token, **params)
+        output = await asyncio.to_thread(collect_completion, chunks, cancel_token)
+        if llm_span is not None:
+            llm_span.set_attribute("completion_tokens", output["usage"]["completion_tokens"])
+        return output
+
+
+def warm_up():
+    """Warm up vector store, embedding model and LLM (blocking, run in a thread)"""
+    try:
+        with readiness.track("vector_store"):
+            chroma_client.heartbeat()
+
+        with readiness.track("embeddings", detail=EMBEDDING_MODEL_NAME):
+            embedding_function(["Warm-up"])
+    except Exception as e:
+        logger.exception("❌ [WARM-UP] Failed: %s", e)
+
+    warm_up_llm()
 
 
 def get_model_info_for_prompt() -> str:
     """Generate dynamic model information for system prompt"""
-    global _current_model_id
-
     try:
-        model = get_model(_current_model_id)
+        model = get_model(get_current_model_id())
 
         # Build model description
         model_info = f"""Du bist ein KI-Assistent basierend auf dem Modell **{model.name}** ({model.params} Parameter).
@@ -147,7 +165,7 @@ Technische Details:
 
         return model_info
     except Exception as e:
-        print(f"⚠️ [PROMPT] Error getting model info: {e}")
+        logger.warning("⚠️ [PROMPT] Error getting model info: %s", e)
         # Fallback wenn Model-Info nicht verfügbar
         return "Du bist ein deutschsprachiger KI-Assistent."
 
@@ -155,42 +173,22 @@ Technische Details:
 class DocumentProcessor:
     """Process documents and create embeddings"""
 
-    def __init__(self):
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len,
-        )
-
-    def extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file"""
-        text = ""
+    async def process_document(self, file_path: str, document_id: int, file_type: str = "pdf") -> int:
+        """Process document: extract text, split, and store in vector DB (in a worker thread)"""
+        started = time.perf_counter()
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-        except Exception as e:
-            print(f"Error extracting text from PDF: {e}")
+            chunk_count = await asyncio.to_thread(self._process_document, file_path, document_id, file_type)
+        except Exception:
+            INGEST_DOCUMENTS.labels(outcome="failed").inc()
             raise
-        return text
 
-    def split_text(self, text: str) -> List[str]:
-        """Split text into chunks"""
-        chunks = self.text_splitter.split_text(text)
-        return chunks
-
-    async def process_document(self, file_path: str, document_id: int) -> int:
-        """Process document: extract text, split, and store in vector DB"""
-        # Extract text
-        text = self.extract_text_from_pdf(file_path)
-
-        if not text.strip():
-            raise ValueError("No text could be extracted from PDF")
-
-        # Split into chunks
-        chunks = self.split_text(text)
+        INGEST_SECONDS.labels(stage="total").observe(time.perf_counter() - started)
+        INGEST_DOCUMENTS.labels(outcome="processed").inc()
+        INGEST_BYTES.inc(os.path.getsize(file_path))
+        INGEST_CHUNKS.inc(chunk_count)
+        return chunk_count
 
+    def _process_document(self, file_path: str, document_id: int, file_type: str) -> int:
         # Get or create collection for this document
         collection_name = f"doc_{document_id}"
         try:
@@ -206,24 +204,29 @@ class DocumentProcessor:
             embedding_function=embedding_function
         )
 
-        # Create embeddings and store
-        try:
-            print(f"DEBUG: About to call collection.add() for {len(chunks)} chunks...")
-            print(f"DEBUG: Cache env vars at this point:")
-            print(f"  SENTENCE_TRANSFORMERS_HOME={os.environ.get('SENTENCE_TRANSFORMERS_HOME')}")
-            print(f"  HF_HOME={os.environ.get('HF_HOME')}")
-            collection.add(
-                documents=chunks,
-                ids=[f"chunk_{i}" for i in range(len(chunks))],
-                metadatas=[{"chunk_index": i, "document_id": document_id} for i in range(len(chunks))]
-            )
-            print(f"DEBUG: collection.add() succeeded!")
-        except Exception as e:
-            print(f"ERROR in collection.add(): {e}")
-            print(f"Traceback:\n{traceback.format_exc()}")
-            raise
+        # Extract, chunk (chunker.py) and embed batch by batch - the document is never one string in memory
+        chunk_count = 0
+        embed_seconds = 0.0
+        for chunks in ingest_batches(file_path, file_type):
+            started = time.perf_counter()
+            try:
+                collection.add(
+                    documents=[chunk.text for chunk in chunks],
+                    ids=[f"chunk_{chunk.metadata['chunk_index']}" for chunk in chunks],
+                    metadatas=[{**chunk.metadata, "document_id": document_id} for chunk in chunks]
+                )
+            except Exception as e:
+                logger.exception("❌ collection.add() failed for document %s (%d chunks): %s", document_id, len(chunks), e)
+                raise
+            embed_seconds += time.perf_counter() - started
+            chunk_count += len(chunks)
+
+        INGEST_SECONDS.labels(stage="embed_store").observe(embed_seconds)
 
-        return len(chunks)
+        if not chunk_count:
+            raise ValueError(f"No text could be extracted from {file_type.upper()}")
+
+        return chunk_count
 
 
 class RAGEngine:
@@ -237,25 +240,52 @@ class RAGEngine:
         question: str,
         assistant_id: int,
         document_ids: List[int],
-        max_results: int = 3
+        max_results: Optional[int] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        history: Optional[ConversationHistory] = None
+    ) -> Dict[str, any]:
+        """Query documents and generate answer (raises GenerationCancelled if cancel_token fires)
+
+        history: earlier turns of the chat (conversation_memory.py) - used for retrieval
+        and put in front of the question in the prompt. max_results: best chunks across
+        all documents (default RETRIEVAL_MAX_CHUNKS).
+        """
+        max_results = max_results or settings.retrieval_max_chunks
+        with observe_stage("total", span_name="rag"):
+            return await self._query(question, document_ids, max_results, cancel_token, history or ConversationHistory())
+
+    async def _query(
+        self,
+        question: str,
+        document_ids: List[int],
+        max_results: int,
+        cancel_token: Optional[CancellationToken],
+        history: ConversationHistory
     ) -> Dict[str, any]:
-        """Query documents and generate answer"""
+        # Follow-ups ("und was kostet das?") need the conversation for retrieval and the answer
+        search_query = history.retrieval_query(question)
+        prompt_question = history.prompt_question(question)
 
         if not document_ids:
             # No documents, return general response
-            print(f"⚠️ No documents provided for question: {question}")
-            response = await self._generate_response_without_context(question)
+            logger.debug("⚠️ No documents provided, answering without context")
+            response = await self._generate_response_without_context(prompt_question, cancel_token)
             return {
                 "answer": response,
                 "sources": [],
                 "context_used": False
             }
 
-        # Retrieve relevant chunks from all documents
-        all_chunks = []
-        sources = []
+        # Retrieve relevant chunks from all documents: (distance, document_id, text)
+        hits = []
+
+        logger.debug("🔍 Searching in %d document(s)", len(document_ids))
 
-        print(f"🔍 Searching in {len(document_ids)} document(s) for: {question}")
+        # Embed the question once instead of once per collection
+        with observe_stage("embedding"):
+            query_embedding = await asyncio.to_thread(embedding_function, [search_query])
+
+        retrieval_started = time.perf_counter()
 
         for doc_id in document_ids:
             collection_name = f"doc_{doc_id}"
@@ -264,37 +294,44 @@ class RAGEngine:
                     name=collection_name,
                     embedding_function=embedding_function
                 )
-                print(f"✅ Found collection: {collection_name} ({collection.count()} chunks)")
 
                 # Query collection
-                results = collection.query(
-                    query_texts=[question],
-                    n_results=max_results
-                )
+                collection_started = time.perf_counter()
+                with span("retrieval.collection", collection=collection_name):
+                    results = await asyncio.to_thread(
+                        collection.query,
+                        query_embeddings=query_embedding,
+                        n_results=max_results
+                    )
+                RETRIEVAL_COLLECTION_SECONDS.observe(time.perf_counter() - collection_started)
 
                 # Add to chunks
                 if results and results['documents']:
                     for i, doc in enumerate(results['documents'][0]):
-                        all_chunks.append(doc)
-                        sources.append({
-                            "document_id": doc_id,
-                            "chunk_index": i,
-                            "distance": results['distances'][0][i] if results['distances'] else None
-                        })
-                    print(f"📄 Retrieved {len(results['documents'][0])} chunks from {collection_name}")
+                        distance = results['distances'][0][i] if results['distances'] else None
+                        hits.append((distance if distance is not None else float("inf"), doc_id, doc))
+                    logger.debug("📄 Retrieved %d chunks from %s", len(results['documents'][0]), collection_name)
                 else:
-                    print(f"⚠️ No results from {collection_name}")
+                    logger.debug("⚠️ No results from %s", collection_name)
 
             except Exception as e:
-                print(f"❌ Error querying collection {collection_name}: {e}")
+                logger.warning("❌ Error querying collection %s: %s", collection_name, e)
                 continue
 
+        RAG_STAGE_SECONDS.labels(stage="retrieval").observe(time.perf_counter() - retrieval_started)
+
+        # Best chunks across all documents; sources = the documents they come from
+        hits.sort(key=lambda hit: hit[0])
+        hits = hits[:max_results]
+        all_chunks = [doc for _, _, doc in hits]
+        sources = [{"document_id": doc_id} for doc_id in dict.fromkeys(doc_id for _, doc_id, _ in hits)]
+
         # Generate answer using LLM
         if all_chunks:
-            response = await self._generate_response_with_context(question, all_chunks)
+            response = await self._generate_response_with_context(prompt_question, all_chunks, cancel_token=cancel_token)
             context_used = True
         else:
-            response = await self._generate_response_without_context(question)
+            response = await self._generate_response_without_context(prompt_question, cancel_token)
             context_used = False
 
         # HYBRID RAG: Check if web search is needed
@@ -309,13 +346,14 @@ class RAGEngine:
             )
 
             if needs_web:
-                print(f"🌐 [HYBRID RAG] Web search triggered for better answer")
+                logger.info("🌐 [HYBRID RAG] Web search triggered for better answer")
 
                 # Generate search query
-                search_query = AnswerQualityDetector.get_search_query(question, response)
+                web_query = AnswerQualityDetector.get_search_query(search_query, response)
 
                 # Perform web search
-                web_context = await searxng_client.search_and_format(search_query)
+                with observe_stage("web_search"):
+                    web_context = await searxng_client.search_and_format(web_query)
 
                 if web_context:
                     # Regenerate answer with web context
@@ -323,21 +361,22 @@ class RAGEngine:
 
                     # Add local document chunks if available
                     if all_chunks:
-                        combined_context.extend(all_chunks[:3])  # Top 3 local chunks
+                        combined_context.extend(all_chunks)  # Same chunks as the sources
 
                     # Add web search context
                     combined_context.append(web_context)
 
                     # Generate improved answer
                     response = await self._generate_response_with_context(
-                        question,
+                        prompt_question,
                         combined_context,
-                        is_hybrid=True
+                        is_hybrid=True,
+                        cancel_token=cancel_token
                     )
                     web_search_used = True
                     web_sources = ["SearxNG Web Search"]
 
-                    print(f"✅ [HYBRID RAG] Answer enhanced with web search results")
+                    logger.info("✅ [HYBRID RAG] Answer enhanced with web search results")
 
         return {
             "answer": response,
@@ -347,11 +386,36 @@ class RAGEngine:
             "web_sources": web_sources
         }
 
+    async def complete(
+        self,
+        prompt: str,
+        cancel_token: Optional[CancellationToken] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> str:
+        """Plain completion without retrieval (also used for conversation summaries)
+
+        max_tokens/temperature: override LLM_MAX_TOKENS/LLM_TEMPERATURE (summaries only)
+        """
+        if not _llm_available():
+            raise RuntimeError("No llama-cpp model available")
+
+        output = await _complete(
+            f"<|im_start|>user\n{prompt}<|im_end|>\n<|im_start|>assistant\n",
+            cancel_token=cancel_token,
+            max_tokens=max_tokens or settings.llm_max_tokens,
+            temperature=settings.llm_temperature if temperature is None else temperature,
+            stop=["<|im_end|>", "<|im_start|>"],
+            echo=False
+        )
+        return output['choices'][0]['text'].strip()
+
     async def _generate_response_with_context(
         self,
         question: str,
         context_chunks: List[str],
-        is_hybrid: bool = False
+        is_hybrid: bool = False,
+        cancel_token: Optional[CancellationToken] = None
     ) -> str:
         """Generate response using llama-cpp-python or Ollama with context
 
@@ -359,14 +423,14 @@ class RAGEngine:
             question: User question
             context_chunks: Context from documents and/or web search
             is_hybrid: Whether this uses hybrid RAG (local + web)
+            cancel_token: Stops generation when the client disconnects
         """
 
-        # Build context
-        context = "\n\n".join(context_chunks[:5])  # Use top 5 chunks
+        # Build context - already cut to the best RETRIEVAL_MAX_CHUNKS by _query
+        context = "\n\n".join(context_chunks)
 
         # Try llama-cpp-python first
-        llm = get_llm()
-        if llm is not None:
+        if _llm_available():
             # Create prompt (Qwen2.5 ChatML Format) - Optimized for better German
             source_type = "Dokumenten und Web-Suchergebnissen" if is_hybrid else "bereitgestellten Dokumenten"
             model_info = get_model_info_for_prompt()
@@ -393,8 +457,9 @@ ANTWORT (auf Deutsch, basierend auf den Quellen):<|im_end|>
 """
 
             try:
-                output = llm(
+                output = await _complete(
                     prompt,
+                    cancel_token=cancel_token,
                     max_tokens=1024,  # Increased from 512 for longer answers
                     temperature=0.3,  # Lowered from 0.7 for more precise answers
                     top_p=0.9,  # Nucleus sampling for better quality
@@ -404,12 +469,13 @@ ANTWORT (auf Deutsch, basierend auf den Quellen):<|im_end|>
                     repeat_penalty=1.15  # Increased to prevent repetition
                 )
                 response_text = output['choices'][0]['text'].strip()
-                print(f"🤖 [WITH CONTEXT] Generated response ({len(response_text)} chars): {response_text[:100]}...")
+                logger.debug("🤖 [WITH CONTEXT] Generated response (%d chars)", len(response_text))
                 return response_text
 
+            except GenerationCancelled:
+                raise
             except Exception as e:
-                print(f"Error calling llama-cpp-python: {e}")
-                print("Falling back to Ollama...")
+                logger.warning("⚠️ Error calling llama-cpp-python: %s - falling back to Ollama", e)
 
         # Fallback to Ollama
         prompt = f"""Du bist ein hilfreicher KI-Assistent. Beantworte die Frage basierend auf den folgenden Dokumenten-Auszügen.
@@ -442,15 +508,18 @@ ANTWORT:"""
         except httpx.HTTPStatusError as e:
             return f"❌ Ollama Fehler ({e.response.status_code}): {e.response.text}"
         except Exception as e:
-            print(f"Error calling Ollama: {e}")
+            logger.error("❌ Error calling Ollama: %s", e)
             return f"Fehler bei der LLM-Anfrage: {str(e)}\n\nIst Ollama gestartet? (ollama serve)"
 
-    async def _generate_response_without_context(self, question: str) -> str:
+    async def _generate_response_without_context(
+        self,
+        question: str,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> str:
         """Generate response using llama-cpp-python or Ollama without document context"""
 
         # Try llama-cpp-python first
-        llm = get_llm()
-        if llm is not None:
+        if _llm_available():
             model_info = get_model_info_for_prompt()
 
             prompt = f"""<|im_start|>system
@@ -464,8 +533,9 @@ Sei präzise, sachlich und professionell.<|im_end|>
 """
 
             try:
-                output = llm(
+                output = await _complete(
                     prompt,
+                    cancel_token=cancel_token,
                     max_tokens=1024,  # Increased from 512
                     temperature=0.3,  # Lowered from 0.7
                     top_p=0.9,
@@ -475,12 +545,13 @@ Sei präzise, sachlich und professionell.<|im_end|>
                     repeat_penalty=1.15
                 )
                 response_text = output['choices'][0]['text'].strip()
-                print(f"🤖 [NO CONTEXT] Generated response ({len(response_text)} chars)")
+                logger.debug("🤖 [NO CONTEXT] Generated response (%d chars)", len(response_text))
                 return response_text
 
+            except GenerationCancelled:
+                raise
             except Exception as e:
-                print(f"Error calling llama-cpp-python: {e}")
-                print("Falling back to Ollama...")
+                logger.warning("⚠️ Error calling llama-cpp-python: %s - falling back to Ollama", e)
 
         # Fallback to Ollama
         try:
@@ -502,7 +573,7 @@ Sei präzise, sachlich und professionell.<|im_end|>
             return f"❌ Ollama Fehler ({e.response.status_code}): {e.response.text}"
 
         except Exception as e:
-            print(f"Error calling Ollama: {e}")
+            logger.error("❌ Error calling Ollama: %s", e)
             return f"Fehler bei der LLM-Anfrage: {str(e)}\n\nIst Ollama gestartet? (ollama serve)"
 
 
@@ -6,19 +6,28 @@ os.environ['SENTENCE_TRANSFORMERS_HOME'] = '/tmp/.cache'
 os.environ['HF_HOME'] = '/tmp/.cache'
 os.environ['TRANSFORMERS_CACHE'] = '/tmp/.cache'
 
-from typing import List, Dict
+import asyncio
+from contextlib import nullcontext
+from typing import List, Dict, Iterator, Optional
 from pathlib import Path
-import traceback
+import logging
+import threading
+import time
 
 # LlamaIndex imports
 from llama_index.core import (
     VectorStoreIndex,
-    SimpleDirectoryReader,
     StorageContext,
     Settings,
-    Document as LlamaDocument
+    QueryBundle,
+    get_response_synthesizer
 )
-from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.callbacks import CallbackManager, CBEventType, EventPayload
+from llama_index.core.callbacks.base_handler import BaseCallbackHandler
+from llama_index.core.schema import TextNode
+from llama_index.core.llms import CustomLLM, CompletionResponse, CompletionResponseGen, LLMMetadata
+from llama_index.core.llms.callbacks import llm_completion_callback
+from llama_index.core.embeddings import BaseEmbedding
 from llama_index.llms.llama_cpp import LlamaCPP
 from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from llama_index.vector_stores.chroma import ChromaVectorStore
@@ -26,13 +35,28 @@ import chromadb
 
 from config import get_settings
 from web_search import searxng_client, AnswerQualityDetector
-from llm_models import get_model_path, DEFAULT_MODEL, get_model
+from llm_models import get_model_path, get_model, wait_for_model_file, DEFAULT_MODEL, FALLBACK_MODEL
+from readiness import readiness
+from llm_memory import llama_memory_kwargs, describe_memory_strategy, process_memory
+from speculative import draft_model_kwargs
+from generation import CancellationToken, inference_slot
+from tracing import span
+from metrics import (
+    observe_stage, observe_generation, record_cache, set_loaded_model,
+    PROMPT_TOKENS, RETRIEVAL_COLLECTION_SECONDS, INGEST_SECONDS, INGEST_DOCUMENTS, INGEST_BYTES, INGEST_CHUNKS
+)
+from llm_runtime import EMBEDDING_MODEL_NAME
+from inference_client import inference_client
+from conversation_memory import ConversationHistory
+from chunker import ingest_batches
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 # Global variables
 _current_model_id = DEFAULT_MODEL
 _llm_instance = None
+_llm_lock = threading.Lock()  # Warm-up thread and requests must not load the model twice
 _chroma_client = None
 _indices = {}  # Cache indices per document
 
@@ -49,62 +73,179 @@ def get_chroma_client():
     return _chroma_client
 
 
+def delete_document_vectors(document_id: int):
+    """Drop the Chroma collection of a document and its cached index (raises if there is none)"""
+    _indices.pop(document_id, None)
+    get_chroma_client().delete_collection(f"doc_{document_id}")
+
+
+class RemoteLLM(CustomLLM):
+    """LlamaIndex LLM that forwards completions to the inference service"""
+
+    temperature: float = settings.llm_temperature
+    max_new_tokens: int = settings.llm_max_tokens
+    context_window: int = settings.llm_context_size
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(
+            context_window=self.context_window,
+            num_output=self.max_new_tokens,
+            model_name=get_current_model_id()
+        )
+
+    def _remote_complete(self, prompt: str, formatted: bool) -> CompletionResponse:
+        if not formatted:
+            prompt = self.completion_to_prompt(prompt)
+        output = inference_client.complete(
+            prompt,
+            max_tokens=self.max_new_tokens,
+            temperature=self.temperature
+        )
+        return CompletionResponse(text=output["choices"][0]["text"], raw=output)
+
+    @llm_completion_callback()
+    def complete(self, prompt: str, formatted: bool = False, **kwargs) -> CompletionResponse:
+        return self._remote_complete(prompt, formatted)
+
+    @llm_completion_callback()
+    def stream_complete(self, prompt: str, formatted: bool = False, **kwargs) -> CompletionResponseGen:
+        if not formatted:
+            prompt = self.completion_to_prompt(prompt)
+
+        def gen() -> CompletionResponseGen:
+            # Closing this generator closes the connection, which stops generation on the service
+            text = ""
+            for chunk in inference_client.stream_complete(
+                prompt,
+                max_tokens=kwargs.get("max_tokens", self.max_new_tokens),
+                temperature=kwargs.get("temperature", self.temperature)
+            ):
+                delta = chunk["choices"][0]["text"]
+                text += delta
+                yield CompletionResponse(text=text, delta=delta, raw=chunk)
+
+        return gen()
+
+
+class RemoteEmbedding(BaseEmbedding):
+    """LlamaIndex embedding model backed by the inference service (normalized like HuggingFaceEmbedding)"""
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return inference_client.embed([query], normalize=True)[0]
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return inference_client.embed([text], normalize=True)[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return inference_client.embed(texts, normalize=True)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+
+
 def get_llm():
     """Get or create LLM instance"""
+    global _llm_instance
+
+    with _llm_lock:
+        if inference_client.enabled:
+            # Model lives in inference_server.py - only the thin client is created here
+            if _llm_instance is None:
+                _llm_instance = RemoteLLM()
+                Settings.llm = _llm_instance
+            return _llm_instance
+
+        return _get_or_load_llm()
+
+
+class PromptTokenCounter(BaseCallbackHandler):
+    """Records prompt tokens of in-process LlamaCPP completions (the prompt is built inside LlamaIndex)"""
+
+    def __init__(self):
+        super().__init__(event_starts_to_ignore=[], event_ends_to_ignore=[])
+
+    def on_event_start(self, event_type, payload=None, event_id="", parent_id="", **kwargs) -> str:
+        llm = _llm_instance
+        if event_type == CBEventType.LLM and payload and EventPayload.PROMPT in payload and isinstance(llm, LlamaCPP):
+            prompt = payload[EventPayload.PROMPT]
+            if not payload.get(EventPayload.ADDITIONAL_KWARGS, {}).get("formatted"):
+                prompt = llm.completion_to_prompt(prompt)
+            PROMPT_TOKENS.observe(len(llm._model.tokenize(prompt.encode("utf-8"))))
+        return event_id
+
+    def on_event_end(self, event_type, payload=None, event_id="", **kwargs) -> None:
+        pass
+
+    def start_trace(self, trace_id=None) -> None:
+        pass
+
+    def end_trace(self, trace_id=None, trace_map=None) -> None:
+        pass
+
+
+def _build_llm(model_id: str) -> LlamaCPP:
+    """Create the llama-cpp LLM with our settings (plus draft model if speculative decoding is on)"""
+    return LlamaCPP(
+        model_path=get_model_path(model_id),
+        temperature=settings.llm_temperature,
+        max_new_tokens=settings.llm_max_tokens,
+        context_window=settings.llm_context_size,
+        model_kwargs={"n_threads": settings.llm_threads, **llama_memory_kwargs(), **draft_model_kwargs(model_id)},
+        callback_manager=CallbackManager([PromptTokenCounter()]),
+        verbose=False
+    )
+
+
+def _get_or_load_llm():
+    """Load LLM if needed (caller holds _llm_lock)"""
     global _llm_instance, _current_model_id
 
     if _llm_instance is None:
         model_path = get_model_path(_current_model_id)
 
         if not os.path.exists(model_path):
-            print(f"⚠️ Model not found at {model_path}")
+            logger.warning("⚠️ Model not found at %s", model_path)
 
             # Try fallback to qwen2.5-0.5b
-            fallback_model_id = "qwen2.5-0.5b"
+            fallback_model_id = FALLBACK_MODEL
             fallback_path = get_model_path(fallback_model_id)
 
             if os.path.exists(fallback_path):
-                print(f"🔄 Falling back to {fallback_model_id}...")
+                logger.info("🔄 Falling back to %s...", fallback_model_id)
                 _current_model_id = fallback_model_id
                 model_path = fallback_path
             else:
                 raise FileNotFoundError(f"No models available")
 
-        print(f"🔄 [LlamaIndex] Loading LLM: {_current_model_id} from {model_path}...")
+        logger.info("🔄 [LlamaIndex] Loading LLM: %s from %s (%s)...", _current_model_id, model_path, describe_memory_strategy())
 
+        started = time.perf_counter()
         try:
-            _llm_instance = LlamaCPP(
-                model_path=model_path,
-                temperature=settings.llm_temperature,
-                max_new_tokens=settings.llm_max_tokens,
-                context_window=settings.llm_context_size,
-                model_kwargs={"n_threads": settings.llm_threads},
-                verbose=False
-            )
-            print(f"✅ [LlamaIndex] LLM loaded successfully!")
+            _llm_instance = _build_llm(_current_model_id)
+            logger.info("✅ [LlamaIndex] LLM loaded successfully! Memory: %s", process_memory())
         except (ValueError, FileNotFoundError, Exception) as e:
             # If loading fails, try qwen2.5-0.5b as last resort
-            if _current_model_id != "qwen2.5-0.5b":
-                print(f"⚠️ Failed to load {_current_model_id}: {e}")
-                print(f"🔄 Trying emergency fallback to qwen2.5-0.5b...")
-                _current_model_id = "qwen2.5-0.5b"
-                model_path = get_model_path("qwen2.5-0.5b")
+            if _current_model_id != FALLBACK_MODEL:
+                logger.warning("⚠️ Failed to load %s: %s", _current_model_id, e)
+                logger.info("🔄 Trying emergency fallback to %s...", FALLBACK_MODEL)
+                _current_model_id = FALLBACK_MODEL
+                model_path = get_model_path(FALLBACK_MODEL)
 
                 if os.path.exists(model_path):
-                    _llm_instance = LlamaCPP(
-                        model_path=model_path,
-                        temperature=settings.llm_temperature,
-                        max_new_tokens=settings.llm_max_tokens,
-                        context_window=settings.llm_context_size,
-                        model_kwargs={"n_threads": settings.llm_threads},
-                        verbose=False
-                    )
-                    print(f"✅ [LlamaIndex] Emergency fallback successful!")
+                    _llm_instance = _build_llm(_current_model_id)
+                    logger.info("✅ [LlamaIndex] Emergency fallback successful!")
                 else:
                     raise FileNotFoundError(f"No models available - please wait for downloads to complete")
             else:
                 raise
 
+        # Query engines resolve the LLM from the global settings
+        Settings.llm = _llm_instance
+        # Also after a failed warm-up or a reload_llm(): /ready follows the model actually in RAM
+        readiness.ready("llm", time.perf_counter() - started, detail=_current_model_id)
+        set_loaded_model(_current_model_id)
+
     return _llm_instance
 
 
@@ -112,42 +253,139 @@ def reload_llm(model_id: str):
     """Reload LLM with different model"""
     global _llm_instance, _current_model_id
 
-    print(f"🔄 [LlamaIndex] Switching LLM from {_current_model_id} to {model_id}...")
+    logger.info("🔄 [LlamaIndex] Switching LLM from %s to %s...", _current_model_id, model_id)
 
-    if _llm_instance is not None:
-        print(f"🗑️  [LlamaIndex] Unloading {_current_model_id}...")
-        old_instance = _llm_instance
+    if inference_client.enabled:
+        inference_client.set_model(model_id)
+        logger.info("✅ [LlamaIndex] Inference service switching to %s", model_id)
+        return
+
+    with _llm_lock:
+        if _llm_instance is not None:
+            logger.info("🗑️ [LlamaIndex] Unloading %s...", _current_model_id)
+            old_instance = _llm_instance
+            _llm_instance = None
+            Settings.llm = None  # Drop the global reference too, otherwise RAM is not freed
+
+            del old_instance
+            import gc
+            gc.collect()
+            logger.info("✅ [LlamaIndex] %s unloaded", _current_model_id)
+
+        _current_model_id = model_id
+
+        # Force reload on next query
         _llm_instance = None
+        readiness.skip("llm", f"{model_id} loads on next request")
+        set_loaded_model(model_id, loaded=False)
+
+    logger.info("✅ [LlamaIndex] Model switched to %s", model_id)
+
+
+def switch_llm(model_id: str):
+    """Load and warm model_id, then make it active (blocking, run in a thread)
+
+    Unlike reload_llm(), chat requests keep using the current model until the new
+    one is ready. Both models are in RAM during the switch.
+    """
+    global _llm_instance, _current_model_id
 
+    if inference_client.enabled:
+        inference_client.switch_model(model_id)
+        _current_model_id = model_id
+        return
+
+    model_path = get_model_path(model_id)
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model not found at {model_path}")
+
+    logger.info("🔄 [LlamaIndex] Loading %s next to %s...", model_id, _current_model_id)
+    started = time.perf_counter()
+    new_instance = _build_llm(model_id)
+    new_instance._model("Hallo", max_tokens=1)  # Page in weights before taking traffic
+
+    with _llm_lock:
+        old_instance = _llm_instance
+        _llm_instance = new_instance
+        _current_model_id = model_id
+        Settings.llm = new_instance
+    readiness.ready("llm", time.perf_counter() - started, detail=model_id)
+    set_loaded_model(model_id)
+
+    if old_instance is not None:
+        # In-flight generations keep their reference until they finish
         del old_instance
         import gc
         gc.collect()
-        print(f"✅ [LlamaIndex] {_current_model_id} unloaded")
 
-    _current_model_id = model_id
+    logger.info("✅ [LlamaIndex] Switched to %s. Memory: %s", model_id, process_memory())
+
 
-    # Force reload on next query
-    _llm_instance = None
+def get_current_model_id() -> str:
+    """Get current model ID"""
+    if inference_client.enabled and inference_client.model_id:
+        return inference_client.model_id
+    return _current_model_id
 
-    print(f"✅ [LlamaIndex] Model switched to {model_id}")
+
+def is_llm_loaded() -> bool:
+    """Check if the LLM is currently loaded in RAM"""
+    if inference_client.enabled:
+        return inference_client.is_model_loaded()
+    return _llm_instance is not None
+
+
+def warm_up_llm():
+    """Load LLM and run a tiny generation to page in the weights (blocking)"""
+    if inference_client.enabled:
+        inference_client.warm_up()
+        return
+
+    try:
+        with readiness.track("llm"):
+            # On a fresh deploy the model is still downloading in the background
+            wait_for_model_file([_current_model_id, FALLBACK_MODEL], settings.warmup_model_wait_seconds)
+            llm = get_llm()
+            # LlamaCPP.complete() would generate llm_max_tokens - one token is enough
+            with inference_slot.acquire():
+                llm._model("Hallo", max_tokens=1)
+        logger.info("🔥 [WARM-UP] LLM %s ready", _current_model_id)
+    except Exception as e:
+        logger.exception("❌ [WARM-UP] LLM failed: %s", e)
+
+
+def warm_up():
+    """Warm up vector store, embedding model and LLM (blocking, run in a thread)"""
+    try:
+        with readiness.track("vector_store"):
+            get_chroma_client().heartbeat()
+
+        with readiness.track("embeddings", detail=EMBEDDING_MODEL_NAME):
+            Settings.embed_model.get_text_embedding("Warm-up")
+    except Exception as e:
+        logger.exception("❌ [WARM-UP] Failed: %s", e)
+
+    warm_up_llm()
 
 
 def setup_llamaindex():
     """Configure LlamaIndex global settings"""
     # Set embedding model (multilingual for German support)
-    Settings.embed_model = HuggingFaceEmbedding(
-        model_name="paraphrase-multilingual-MiniLM-L12-v2",
-        cache_folder="/tmp/.cache"
-    )
+    if inference_client.enabled:
+        Settings.embed_model = RemoteEmbedding(model_name=EMBEDDING_MODEL_NAME)
+    else:
+        Settings.embed_model = HuggingFaceEmbedding(
+            model_name=EMBEDDING_MODEL_NAME,
+            cache_folder="/tmp/.cache"
+        )
 
-    # Set LLM
-    Settings.llm = get_llm()
+    # LLM is loaded lazily by get_llm() / warm_up() and registered in Settings.llm there
 
-    # Set chunk size
-    Settings.chunk_size = 512
-    Settings.chunk_overlap = 50
+    # Same chunk size as chunker.py (ingestion builds its nodes there; this only affects the default node parser)
+    Settings.chunk_size = settings.chunk_max_tokens
+    Settings.chunk_overlap = settings.chunk_overlap_tokens
 
-    print("✅ [LlamaIndex] Settings configured")
+    logger.info("✅ [LlamaIndex] Settings configured")
 
 
 class DocumentProcessor:
@@ -157,9 +395,24 @@ class DocumentProcessor:
         setup_llamaindex()
         self.chroma_client = get_chroma_client()
 
-    def process_pdf(self, file_path: str, document_id: int) -> int:
-        """Process PDF and create LlamaIndex index"""
-        print(f"📄 [LlamaIndex] Processing PDF: {file_path}")
+    async def process_document(self, file_path: str, document_id: int, file_type: str = "pdf") -> int:
+        """Process an uploaded document in a worker thread (same interface as rag.DocumentProcessor)"""
+        started = time.perf_counter()
+        try:
+            chunk_count = await asyncio.to_thread(self.process_file, file_path, document_id, file_type)
+        except Exception:
+            INGEST_DOCUMENTS.labels(outcome="failed").inc()
+            raise
+
+        INGEST_SECONDS.labels(stage="total").observe(time.perf_counter() - started)
+        INGEST_DOCUMENTS.labels(outcome="processed").inc()
+        INGEST_BYTES.inc(os.path.getsize(file_path))
+        INGEST_CHUNKS.inc(chunk_count)
+        return chunk_count
+
+    def process_file(self, file_path: str, document_id: int, file_type: str) -> int:
+        """Extract (extractors.py), chunk (chunker.py) and embed a document into its LlamaIndex index"""
+        logger.debug("📄 [LlamaIndex] Processing %s: %s", file_type.upper(), file_path)
 
         try:
             # Create collection name
@@ -168,46 +421,104 @@ class DocumentProcessor:
             # Delete existing collection if exists
             try:
                 self.chroma_client.delete_collection(collection_name)
-                print(f"🗑️  Deleted existing collection: {collection_name}")
+                logger.debug("🗑️ Deleted existing collection: %s", collection_name)
             except:
                 pass
 
-            # Load document with LlamaIndex
-            documents = SimpleDirectoryReader(
-                input_files=[file_path]
-            ).load_data()
-
-            print(f"📖 [LlamaIndex] Loaded {len(documents)} document(s)")
-
             # Create ChromaDB collection
             chroma_collection = self.chroma_client.get_or_create_collection(collection_name)
 
-            # Create vector store
+            # Create vector store and an empty index, filled batch by batch
             vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
             storage_context = StorageContext.from_defaults(vector_store=vector_store)
+            index = VectorStoreIndex(nodes=[], storage_context=storage_context)
+
+            embed_seconds = 0.0
+            for chunks in ingest_batches(file_path, file_type):
+                nodes = [
+                    TextNode(
+                        text=chunk.text,
+                        metadata=chunk.metadata,
+                        # Embed exactly the chunk text (sized to the model's 128 tokens);
+                        # page/heading still go to the LLM as source hints
+                        excluded_embed_metadata_keys=list(chunk.metadata),
+                        excluded_llm_metadata_keys=[key for key in chunk.metadata if key not in ("page", "page_end", "heading")]
+                    )
+                    for chunk in chunks
+                ]
+                started = time.perf_counter()
+                index.insert_nodes(nodes)
+                embed_seconds += time.perf_counter() - started
 
-            # Create index
-            index = VectorStoreIndex.from_documents(
-                documents,
-                storage_context=storage_context,
-                show_progress=True
-            )
+            INGEST_SECONDS.labels(stage="embed_store").observe(embed_seconds)
+
+            # Count nodes (the docstore stays empty when text lives in Chroma)
+            node_count = chroma_collection.count()
+            if not node_count:
+                raise ValueError(f"No text could be extracted from {file_type.upper()}")
 
             # Cache index
             _indices[document_id] = index
-
-            # Count nodes
-            node_count = len(index.docstore.docs)
-            print(f"✅ [LlamaIndex] Created index with {node_count} nodes")
+            logger.info("✅ [LlamaIndex] Created index with %s nodes", node_count)
 
             return node_count
 
         except Exception as e:
-            print(f"❌ [LlamaIndex] Error processing PDF: {e}")
-            print(traceback.format_exc())
+            logger.exception("❌ [LlamaIndex] Error processing %s: %s", file_type.upper(), e)
             raise
 
 
+def _generation_slot(token: Optional[CancellationToken]):
+    """In-process generations share one slot; the inference service serializes on its side"""
+    return nullcontext() if inference_client.enabled else inference_slot.acquire(token)
+
+
+def _stream_text(deltas: Iterator[str], token: Optional[CancellationToken]) -> str:
+    """Join streamed text deltas, stopping between tokens once the token is cancelled"""
+    text = []
+    deltas = observe_generation(deltas)
+    try:
+        for delta in deltas:
+            if token is not None:
+                token.raise_if_cancelled()
+            text.append(delta)
+    finally:
+        deltas.close()  # Stops llama.cpp (or closes the inference service stream)
+    return "".join(text)
+
+
+def _retrieve(indices: Dict[int, VectorStoreIndex], question: str, max_results: int) -> List[tuple]:
+    """Embed the question once and query every document index with it (blocking)
+
+    Returns the best max_results (document_id, node) pairs across all documents.
+    """
+    with observe_stage("embedding"):
+        query_embedding = Settings.embed_model.get_query_embedding(question)
+    query_bundle = QueryBundle(query_str=question, embedding=query_embedding)
+
+    hits = []
+    with observe_stage("retrieval"):
+        for doc_id, index in indices.items():
+            started = time.perf_counter()
+            with span("retrieval.collection", collection=index.vector_store._collection.name):
+                nodes = index.as_retriever(similarity_top_k=max_results).retrieve(query_bundle)
+            hits.extend((doc_id, node) for node in nodes)
+            RETRIEVAL_COLLECTION_SECONDS.observe(time.perf_counter() - started)
+
+    # Best chunks across all documents
+    hits.sort(key=lambda hit: hit[1].score or 0.0, reverse=True)
+    return hits[:max_results]
+
+
+def _synthesize(question: str, nodes: list, token: Optional[CancellationToken]) -> str:
+    """Stream the answer for the retrieved nodes (blocking, run in a thread)"""
+    synthesizer = get_response_synthesizer(llm=get_llm(), streaming=True)
+    with span("llm", model_id=get_current_model_id(), remote=inference_client.enabled, nodes=len(nodes)):
+        with _generation_slot(token):
+            response = synthesizer.synthesize(question, nodes)
+            return _stream_text(response.response_gen, token)
+
+
 class RAGEngine:
     """RAG Engine with LlamaIndex"""
 
@@ -220,13 +531,35 @@ class RAGEngine:
         question: str,
         assistant_id: int,
         document_ids: List[int],
-        max_results: int = 3
+        max_results: Optional[int] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        history: Optional[ConversationHistory] = None
     ) -> Dict[str, any]:
-        """Query documents with LlamaIndex"""
+        """Query documents with LlamaIndex (raises GenerationCancelled if cancel_token fires)
+
+        history: earlier turns of the chat (conversation_memory.py) - used for retrieval
+        and put in front of the question in the prompt. max_results: best chunks across
+        all documents (default RETRIEVAL_MAX_CHUNKS).
+        """
+        max_results = max_results or settings.retrieval_max_chunks
+        with observe_stage("total", span_name="rag"):
+            return await self._query(question, document_ids, max_results, cancel_token, history or ConversationHistory())
+
+    async def _query(
+        self,
+        question: str,
+        document_ids: List[int],
+        max_results: int,
+        cancel_token: Optional[CancellationToken],
+        history: ConversationHistory
+    ) -> Dict[str, any]:
+        # Follow-ups ("und was kostet das?") need the conversation for retrieval and the answer
+        search_query = history.retrieval_query(question)
+        prompt_question = history.prompt_question(question)
 
         if not document_ids:
-            print(f"⚠️ [LlamaIndex] No documents for query: {question}")
-            response = await self._generate_without_context(question)
+            logger.debug("⚠️ [LlamaIndex] No documents, answering without context")
+            response = await self._generate_without_context(prompt_question, cancel_token)
             return {
                 "answer": response,
                 "sources": [],
@@ -234,13 +567,14 @@ class RAGEngine:
                 "web_search_used": False
             }
 
-        print(f"🔍 [LlamaIndex] Querying {len(document_ids)} document(s): {question}")
+        logger.debug("🔍 [LlamaIndex] Querying %d document(s)", len(document_ids))
 
         # Load or get cached indices
-        indices = []
+        indices = {}
         for doc_id in document_ids:
+            record_cache("index", doc_id in _indices)
             if doc_id in _indices:
-                indices.append(_indices[doc_id])
+                indices[doc_id] = _indices[doc_id]
             else:
                 # Load from ChromaDB
                 collection_name = f"doc_{doc_id}"
@@ -248,14 +582,14 @@ class RAGEngine:
                     chroma_collection = self.chroma_client.get_collection(collection_name)
                     vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
                     index = VectorStoreIndex.from_vector_store(vector_store)
-                    indices.append(index)
+                    indices[doc_id] = index
                     _indices[doc_id] = index
                 except Exception as e:
-                    print(f"❌ [LlamaIndex] Error loading index for doc {doc_id}: {e}")
+                    logger.warning("❌ [LlamaIndex] Error loading index for doc %s: %s", doc_id, e)
 
         if not indices:
-            print(f"⚠️ [LlamaIndex] No valid indices found")
-            response = await self._generate_without_context(question)
+            logger.warning("⚠️ [LlamaIndex] No valid indices found")
+            response = await self._generate_without_context(prompt_question, cancel_token)
             return {
                 "answer": response,
                 "sources": [],
@@ -263,24 +597,12 @@ class RAGEngine:
                 "web_search_used": False
             }
 
-        # Merge indices if multiple
-        if len(indices) == 1:
-            index = indices[0]
-        else:
-            # Merge multiple indices
-            from llama_index.core.composability import ComposableGraph
-            all_nodes = []
-            for idx in indices:
-                all_nodes.extend(idx.docstore.docs.values())
-
-            index = VectorStoreIndex(all_nodes)
-
-        # Query with LlamaIndex
-        query_engine = index.as_query_engine(similarity_top_k=max_results)
-        response = query_engine.query(question)
-
-        answer = str(response)
-        sources = [{"document_id": doc_id} for doc_id in document_ids]
+        # Retrieve across all document indices, then generate
+        hits = await asyncio.to_thread(_retrieve, indices, search_query, max_results)
+        nodes = [node for _, node in hits]
+        answer = await asyncio.to_thread(_synthesize, prompt_question, nodes, cancel_token)
+        # Only the documents the answer's chunks come from, best first
+        sources = [{"document_id": doc_id} for doc_id in dict.fromkeys(doc_id for doc_id, _ in hits)]
 
         # Web Search check
         web_search_used = False
@@ -292,8 +614,9 @@ class RAGEngine:
             )
 
             if needs_web:
-                print(f"🌐 [LlamaIndex] Triggering web search...")
-                web_results = await searxng_client.search(question)
+                logger.info("🌐 [LlamaIndex] Triggering web search...")
+                with observe_stage("web_search"):
+                    web_results = await searxng_client.search(search_query)
 
                 if web_results:
                     # Combine web results with document context
@@ -302,15 +625,14 @@ class RAGEngine:
                     ])
 
                     # Re-query with web context
-                    enhanced_question = f"""Frage: {question}
+                    enhanced_question = f"""Frage: {prompt_question}
 
 Zusätzliche aktuelle Informationen aus dem Internet:
 {web_context}
 
 Beantworte die Frage basierend auf den Dokumenten UND den Web-Informationen."""
 
-                    response = query_engine.query(enhanced_question)
-                    answer = str(response)
+                    answer = await asyncio.to_thread(_synthesize, enhanced_question, nodes, cancel_token)
                     web_search_used = True
 
         return {
@@ -320,18 +642,47 @@ Beantworte die Frage basierend auf den Dokumenten UND den Web-Informationen."""
             "web_search_used": web_search_used
         }
 
-    async def _generate_without_context(self, question: str) -> str:
+    async def _generate_without_context(
+        self,
+        question: str,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> str:
         """Generate answer without document context"""
-        llm = get_llm()
-
         prompt = f"""Du bist ein hilfreicher Assistent. Beantworte die folgende Frage:
 
 Frage: {question}
 
 Antwort:"""
 
-        response = llm.complete(prompt)
-        return str(response)
+        return await self.complete(prompt, cancel_token)
+
+    async def complete(
+        self,
+        prompt: str,
+        cancel_token: Optional[CancellationToken] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> str:
+        """Plain completion without retrieval (also used for conversation summaries)
+
+        max_tokens/temperature: override LLM_MAX_TOKENS/LLM_TEMPERATURE (summaries only)
+        """
+        llm = get_llm()
+        params = {key: value for key, value in (("max_tokens", max_tokens), ("temperature", temperature))
+                  if value is not None}
+
+        def generate() -> str:
+            with span("llm", model_id=get_current_model_id(), remote=inference_client.enabled):
+                with _generation_slot(cancel_token):
+                    if params and isinstance(llm, LlamaCPP):
+                        # LlamaCPP.stream_complete() ignores per-call kwargs (always max_new_tokens)
+                        stream = llm._model(prompt=llm.completion_to_prompt(prompt), stream=True, **params)
+                        deltas = (chunk["choices"][0]["text"] for chunk in stream)
+                    else:
+                        deltas = (response.delta for response in llm.stream_complete(prompt, **params))
+                    return _stream_text(deltas, cancel_token).strip()
+
+        return await asyncio.to_thread(generate)
 
 
 # Global instance
@@ -21,13 +21,51 @@ python3 migrate_add_password.py
 echo "✉️  Checking email_verified column..."
 python3 migrate_add_email_verified.py
 
+# 2.2.1. Persist source_type/source_details of chat messages (backfills old rows)
+echo "📚 Checking message source columns..."
+python3 migrate_add_message_sources.py
+
+# 2.2.2. Rolling conversation summary per assistant
+echo "🧠 Checking conversation summary columns..."
+python3 migrate_add_conversation_summary.py
+
+# 2.2.3. Content hash of uploaded documents
+echo "🔏 Checking document sha256 column..."
+python3 migrate_add_document_sha256.py
+
+# 2.2.4. Indexes for the hot queries (assistants.user_id, documents, messages)
+echo "📇 Checking indexes..."
+python3 migrate_add_indexes.py
+
 # 2.3. Reset password for michael.dabrock@web.de (one-time)
 echo "🔑 Resetting password for michael.dabrock@web.de..."
 python3 migrate_reset_password.py
 
+# 2.4. Optional: Start local inference service (one model shared by all API workers)
+if [ -n "$INFERENCE_URL" ]; then
+    echo "🧠 Starting inference service at $INFERENCE_URL..."
+    case "$INFERENCE_URL" in
+        unix:*)
+            nohup uvicorn inference_server:app --uds "${INFERENCE_URL#unix:}" > /tmp/inference.log 2>&1 &
+            ;;
+        *)
+            nohup uvicorn inference_server:app --host 127.0.0.1 --port "${INFERENCE_URL##*:}" > /tmp/inference.log 2>&1 &
+            ;;
+    esac
+    echo "   Inference service running in background (PID: $!)"
+    echo "   Check progress: tail -f /tmp/inference.log"
+fi
+
 # 3. Start FastAPI Server (models will continue downloading in background)
 echo "🚀 Starting FastAPI server..."
 PORT=${PORT:-8000}
 echo "   Binding to port $PORT"
 echo "   Note: LLM models are downloading in background"
-uvicorn main:app --host 0.0.0.0 --port $PORT
+# WEB_CONCURRENCY > 1: Worker teilen sich die mmap'ten GGUF-Gewichte über den Page Cache (siehe MULTI_WORKER_SETUP.md)
+echo "   Workers: ${WEB_CONCURRENCY:-1}"
+# Mehrere Worker: /metrics aggregiert über alle Worker (prometheus_client Multiprocess-Modus)
+if [ "${WEB_CONCURRENCY:-1}" -gt 1 ]; then
+    export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+uvicorn main:app --host 0.0.0.0 --port $PORT --workers ${WEB_CONCURRENCY:-1}
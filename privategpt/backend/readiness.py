@@ -0,0 +1,90 @@
+"""Readiness Tracking - Komponenten-Status für Warm-up und /ready Endpoint"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+
+# Komponenten, die warm sein müssen bevor Traffic geroutet wird
+COMPONENTS = ("database", "vector_store", "embeddings", "llm")
+
+# Status-Werte, die als "bereit" zählen ("skipped" = Warm-up deaktiviert, lädt lazy)
+READY_STATES = ("ready", "skipped")
+
+
+class ReadinessTracker:
+    """Thread-safe registry of component load states and timings"""
+
+    def __init__(self, components: Iterable[str]):
+        self._lock = threading.Lock()
+        self._components: Dict[str, Dict] = {
+            name: self._initial_state() for name in components
+        }
+
+    @staticmethod
+    def _initial_state() -> Dict:
+        return {
+            "status": "pending",
+            "load_seconds": None,
+            "detail": None,
+            "error": None,
+            "updated_at": None,
+        }
+
+    def _update(self, name: str, **fields):
+        with self._lock:
+            state = self._components.setdefault(name, self._initial_state())
+            state.update(fields)
+            state["updated_at"] = time.time()
+
+    def start(self, name: str):
+        """Mark component as loading"""
+        self._update(name, status="loading", load_seconds=None, error=None)
+
+    def ready(self, name: str, load_seconds: Optional[float] = None, detail: Optional[str] = None):
+        """Mark component as ready"""
+        if load_seconds is not None:
+            load_seconds = round(load_seconds, 3)
+        self._update(name, status="ready", load_seconds=load_seconds, detail=detail, error=None)
+
+    def failed(self, name: str, error: Exception, load_seconds: Optional[float] = None):
+        """Mark component as failed"""
+        if load_seconds is not None:
+            load_seconds = round(load_seconds, 3)
+        self._update(name, status="failed", load_seconds=load_seconds, error=str(error))
+
+    def skip(self, name: str, detail: Optional[str] = None):
+        """Mark component as skipped (loaded lazily on first request)"""
+        self._update(name, status="skipped", detail=detail, error=None)
+
+    def reset(self, name: str):
+        """Reset component to pending (e.g. after model switch)"""
+        with self._lock:
+            self._components[name] = self._initial_state()
+            self._components[name]["updated_at"] = time.time()
+
+    @contextmanager
+    def track(self, name: str, detail: Optional[str] = None):
+        """Context manager: mark loading, then ready/failed with elapsed time"""
+        started = time.perf_counter()
+        self.start(name)
+        try:
+            yield
+        except Exception as e:
+            self.failed(name, e, time.perf_counter() - started)
+            raise
+        self.ready(name, time.perf_counter() - started, detail)
+
+    def is_ready(self) -> bool:
+        """True if all components are ready (or skipped)"""
+        with self._lock:
+            return all(c["status"] in READY_STATES for c in self._components.values())
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Copy of the current component states"""
+        with self._lock:
+            return {name: dict(state) for name, state in self._components.items()}
+
+
+# Global instance
+readiness = ReadinessTracker(COMPONENTS)
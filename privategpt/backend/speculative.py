@@ -0,0 +1,149 @@
+"""Speculative Decoding - Kleines Draft-Modell schlägt Tokens vor, das gewählte Modell verifiziert sie
+
+Aktiv mit LLM_SPECULATIVE_DECODING=true für Modelle mit draft_model_id in llm_models.py.
+Die Ausgabe bleibt identisch zum normalen Sampling: jedes Token wird weiterhin vom großen
+Modell gesampelt, passende Draft-Tokens sparen nur die sequentiellen Forward-Passes.
+"""
+import logging
+import os
+from typing import Dict, Optional
+
+try:
+    import numpy as np
+    from llama_cpp import Llama
+    from llama_cpp.llama_speculative import LlamaDraftModel
+    SPECULATIVE_AVAILABLE = True
+except ImportError:
+    Llama = None
+    LlamaDraftModel = object
+    SPECULATIVE_AVAILABLE = False
+
+from config import get_settings
+from llm_models import get_model, get_model_path
+from llm_memory import llama_memory_kwargs
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# German probe text: draft and target must split it into identical token ids
+_TOKENIZER_PROBE = "<|im_start|>system\nBeantworte AUSSCHLIESSLICH auf Deutsch: Größe, Übersicht, Straße.<|im_end|>"
+
+# Draft model attached to the current LLM (for stats)
+_active_draft = None
+
+
+class SmallModelDraft(LlamaDraftModel):
+    """Greedy drafts from a small llama-cpp model, with acceptance statistics
+
+    llama-cpp-python calls the draft model with all verified tokens so far. The
+    tokens the target model accepted from the previous draft are exactly the ones
+    that reappear at the end of the next input, which is how acceptance is counted.
+    """
+
+    def __init__(self, model_id: str, llama: "Llama", num_pred_tokens: int):
+        self.model_id = model_id
+        self.llama = llama
+        self.num_pred_tokens = num_pred_tokens
+        self.rounds = 0
+        self.proposed = 0  # Draft tokens the target model has verified
+        self.accepted = 0  # ... and accepted
+        self._last_input_len = 0
+        self._last_token = None
+        self._last_draft: list = []
+
+    def __call__(self, input_ids: "np.ndarray", /, **kwargs) -> "np.ndarray":
+        self._count_accepted(input_ids)
+
+        draft = []
+        # generate() reuses the draft's KV cache for the common prefix
+        for token in self.llama.generate(input_ids.tolist(), top_k=1, temp=0.0, reset=True):
+            draft.append(token)
+            if len(draft) >= self.num_pred_tokens:
+                break
+
+        self._last_input_len = len(input_ids)
+        self._last_token = int(input_ids[-1])
+        self._last_draft = draft
+        return np.array(draft, dtype=np.intc)
+
+    def _count_accepted(self, input_ids: "np.ndarray"):
+        # A new generation starts with a different prefix - the old draft was never verified
+        if not self._last_draft or len(input_ids) <= self._last_input_len:
+            return
+        if int(input_ids[self._last_input_len - 1]) != self._last_token:
+            return
+
+        accepted = 0
+        for drafted, verified in zip(self._last_draft, input_ids[self._last_input_len:]):
+            if drafted != int(verified):
+                break
+            accepted += 1
+
+        self.rounds += 1
+        self.proposed += len(self._last_draft)
+        self.accepted += accepted
+
+    def stats(self) -> Dict:
+        return {
+            "draft_model_id": self.model_id,
+            "draft_tokens": self.num_pred_tokens,
+            "rounds": self.rounds,
+            "proposed_tokens": self.proposed,
+            "accepted_tokens": self.accepted,
+            "acceptance_rate": round(self.accepted / self.proposed, 3) if self.proposed else None,
+        }
+
+
+def tokenizers_match(target_path: str, draft: "Llama") -> bool:
+    """Compare vocab size, EOS and a German probe (loads only the target's vocabulary)"""
+    target = Llama(model_path=target_path, vocab_only=True, verbose=False)
+    probe = _TOKENIZER_PROBE.encode("utf-8")
+    return (
+        target.n_vocab() == draft.n_vocab()
+        and target.token_eos() == draft.token_eos()
+        and target.tokenize(probe, special=True) == draft.tokenize(probe, special=True)
+    )
+
+
+def load_draft_model(model_id: str) -> Optional[SmallModelDraft]:
+    """Draft model for model_id, or None if disabled, not configured or incompatible"""
+    if not settings.llm_speculative_decoding or not SPECULATIVE_AVAILABLE:
+        return None
+
+    draft_model_id = get_model(model_id).draft_model_id
+    if not draft_model_id or draft_model_id == model_id:
+        return None
+
+    draft_path = get_model_path(draft_model_id)
+    if not os.path.exists(draft_path):
+        logger.warning("⚠️ [SPECULATIVE] Draft model %s not found at %s, decoding without draft", draft_model_id, draft_path)
+        return None
+
+    logger.info("🔄 [SPECULATIVE] Loading draft model %s for %s...", draft_model_id, model_id)
+    draft = Llama(
+        model_path=draft_path,
+        n_ctx=settings.llm_context_size,
+        n_threads=settings.llm_threads,
+        verbose=False,
+        **llama_memory_kwargs()
+    )
+
+    if not tokenizers_match(get_model_path(model_id), draft):
+        logger.warning("⚠️ [SPECULATIVE] %s tokenizer differs from %s, decoding without draft", draft_model_id, model_id)
+        return None
+
+    return SmallModelDraft(draft_model_id, draft, settings.llm_draft_tokens)
+
+
+def draft_model_kwargs(model_id: str) -> Dict:
+    """Keyword arguments for llama_cpp.Llama enabling speculative decoding (empty if off)"""
+    global _active_draft
+
+    draft = load_draft_model(model_id)
+    _active_draft = draft
+    return {"draft_model": draft} if draft is not None else {}
+
+
+def speculative_status() -> Optional[Dict]:
+    """Acceptance statistics of the active draft model (None if not active)"""
+    return _active_draft.stats() if _active_draft is not None else None
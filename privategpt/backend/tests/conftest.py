@@ -0,0 +1,17 @@
+"""pytest setup - Backend-Module importierbar machen, Pflicht-Settings für config.py setzen
+
+Ausführen aus privategpt/backend:
+    python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Settings() requires these (no .env in CI)
+os.environ.setdefault("RESEND_API_KEY", "test")
+os.environ.setdefault("JWT_SECRET", "test")
+# Not ./privategpt.db of a dev setup - tests that touch the database get a throwaway SQLite file
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='privategpt-tests-')}/test.db")
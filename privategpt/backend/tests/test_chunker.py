@@ -0,0 +1,47 @@
+"""TokenChunker with a fake tokenizer - chunks stay within the budget and cover the text exactly"""
+from chunker import SPECIAL_TOKENS, TokenChunker, UNIT_SEPARATOR
+from extractors import TextUnit
+
+MAX_TOKENS = 24
+BUDGET = MAX_TOKENS - SPECIAL_TOKENS
+
+
+def sentencepiece_like(texts):
+    """Like XLM-R: one word-prefix token per word, one token per character, three for "€" """
+    return [sum(1 + sum(3 if char == "€" else 1 for char in word) for word in text.split()) for text in texts]
+
+
+def make_chunker(overlap: int = 0) -> TokenChunker:
+    return TokenChunker(max_tokens=MAX_TOKENS, overlap_tokens=overlap, count_tokens=sentencepiece_like)
+
+
+def test_chunks_respect_budget_and_offsets():
+    units = [
+        TextUnit("Die Miete ist am dritten Werktag fällig. Die Kaution beträgt drei Monatsmieten.", {"page": 1}),
+        TextUnit("Kündigung mit drei Monaten Frist. " * 6, {"page": 2}),
+    ]
+    document = UNIT_SEPARATOR.join(unit.text for unit in units)
+
+    chunks = list(make_chunker(overlap=6).chunks(units))
+
+    assert len(chunks) > 2
+    for chunk in chunks:
+        assert sentencepiece_like([chunk.text])[0] <= BUDGET
+        assert document[chunk.metadata["char_start"]:chunk.metadata["char_end"]] == chunk.text
+    assert chunks[0].metadata["page"] == 1
+    assert chunks[-1].metadata["page"] == 2
+
+
+def test_overlong_words_are_split_into_fitting_windows():
+    """budget characters of "€" are 3 x budget tokens - windows are shrunk until they fit"""
+    url = "https://example.com/" + "a" * 60
+    prices = "€" * 40
+    text = f"Siehe {url} und {prices} Ende"
+
+    chunks = list(make_chunker().chunks([TextUnit(text, {"page": 1})]))
+
+    for chunk in chunks:
+        assert sentencepiece_like([chunk.text])[0] <= BUDGET
+        assert chunk.metadata["token_count"] <= BUDGET
+    # Nothing is lost: the chunks (no overlap) cover every non-space character once
+    assert "".join(chunk.text for chunk in chunks).replace(" ", "") == text.replace(" ", "")
@@ -0,0 +1,89 @@
+"""Deletion jobs against SQLite - only a missing collection is a warning, other errors retry"""
+import asyncio
+import json
+
+import pytest
+
+from cleanup_jobs import DONE, FAILED, CleanupJobManager, new_job
+from database import AsyncSessionLocal, DeletionJob, init_db
+
+
+class MissingCollection(ValueError):
+    pass
+
+
+def run_job(tmp_path, delete_vectors, document_ids=(1, 2)):
+    """Insert a job for an upload dir with one file, run it once, return the stored row"""
+    upload_dir = tmp_path / "uploads"
+    upload_dir.mkdir(exist_ok=True)
+    (upload_dir / "vertrag.pdf").write_bytes(b"%PDF")
+
+    async def scenario():
+        await init_db()
+        job = new_job(user_id=7, document_ids=list(document_ids), upload_dir=str(upload_dir))
+        async with AsyncSessionLocal() as db:
+            db.add(job)
+            await db.commit()
+
+        manager = CleanupJobManager()
+        manager._delete_vectors = delete_vectors
+        await manager._run(job.id)
+        return await manager.get(job.id)
+
+    return asyncio.run(scenario()), upload_dir
+
+
+def test_already_dropped_collection_is_a_warning(tmp_path):
+    def delete_vectors(document_id):
+        if document_id == 2:
+            raise MissingCollection(f"Collection doc_{document_id} does not exist.")
+
+    job, upload_dir = run_job(tmp_path, delete_vectors)
+
+    assert job.state == DONE
+    assert (job.collections_deleted, job.warnings) == (1, 1)
+    assert not upload_dir.exists()
+
+
+@pytest.mark.parametrize("error", [ConnectionError("Chroma unreachable"), PermissionError("read-only volume")])
+def test_other_errors_fail_the_attempt(tmp_path, error):
+    deleted = []
+
+    def delete_vectors(document_id):
+        if document_id == 2:
+            raise error
+        deleted.append(document_id)
+
+    job, upload_dir = run_job(tmp_path, delete_vectors)
+
+    assert job.state == FAILED
+    assert str(error) in job.error
+    assert job.attempts == 1  # Claimable again by the sweep
+    assert upload_dir.exists()  # Nothing reported as deleted that is still there
+    assert json.loads(job.document_ids) == [1, 2]
+    assert deleted == [1]
+
+
+def test_failed_job_is_retried(tmp_path):
+    outage = {"active": True}
+
+    def delete_vectors(document_id):
+        if outage["active"]:
+            raise ConnectionError("Chroma unreachable")
+
+    job, upload_dir = run_job(tmp_path, delete_vectors)
+    assert job.state == FAILED
+
+    outage["active"] = False
+
+    async def retry():
+        manager = CleanupJobManager()
+        manager._delete_vectors = delete_vectors
+        await manager._run(job.id)
+        async with AsyncSessionLocal() as db:
+            return await db.get(DeletionJob, job.id)
+
+    job = asyncio.run(retry())
+    assert job.state == DONE
+    assert job.attempts == 2
+    assert not upload_dir.exists()
@@ -0,0 +1,157 @@
+"""fetch_file against a local HTTP server with Range support and injected disconnects"""
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from download_model import ChecksumMismatchError, fetch_file
+
+SIZE = 300 * 1024
+SEGMENT_SIZE = 64 * 1024  # -> 4 parallel segments
+
+
+class RangeServer:
+    """Serves `data` with HTTP Range; the first `drop` range responses stop halfway"""
+
+    def __init__(self, data: bytes, drop: int = 0, delay: float = 0.0, port: int = 0):
+        self.data = data
+        self.drop = drop
+        self.delay = delay
+        self.ranges = []  # (start, end) of every range request except the 1-byte probe
+        self.served = 0  # Payload bytes sent for those requests
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                first, last = self.headers["Range"].split("=", 1)[1].split("-")
+                start, end = int(first), int(last or len(server.data) - 1)
+                body = server.data[start:end + 1]
+                probe = (start, end) == (0, 0)
+
+                with server.lock:
+                    cut = not probe and server.drop > 0
+                    if cut:
+                        server.drop -= 1
+                    if not probe:
+                        server.ranges.append((start, end))
+
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(server.data)}")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if server.delay and not probe:
+                    threading.Event().wait(server.delay)
+                sent = body[:len(body) // 2] if cut else body
+                self.wfile.write(sent)
+                with server.lock:
+                    if not probe:
+                        server.served += len(sent)
+                if cut:
+                    self.close_connection = True
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/model.gguf"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def data():
+    return os.urandom(SIZE)
+
+
+def fetch(server, dest, **kwargs):
+    kwargs.setdefault("expected_sha256", hashlib.sha256(server.data).hexdigest())
+    return fetch_file(server.url, dest, min_segment_size=SEGMENT_SIZE, retry_delay=0.01, timeout=5.0, **kwargs)
+
+
+def test_reconnects_resume_and_verify(tmp_path, data):
+    server = RangeServer(data, drop=4)
+    dest = tmp_path / "model.gguf"
+    try:
+        fetch(server, dest)
+    finally:
+        server.close()
+
+    assert dest.read_bytes() == data
+    assert not (tmp_path / "model.gguf.part").exists()
+    assert not (tmp_path / "model.gguf.part.json").exists()
+    # Reconnects continue at the byte where the dropped response stopped
+    starts = {start for start, _ in server.ranges}
+    assert len(server.ranges) == 8
+    assert len(starts) == 8
+    assert server.served == SIZE
+
+
+def test_resume_after_restart(tmp_path, data):
+    dest = tmp_path / "model.gguf"
+
+    server = RangeServer(data, drop=4)
+    try:
+        with pytest.raises(IOError):
+            fetch(server, dest, max_retries=0)
+    finally:
+        server.close()
+    assert (tmp_path / "model.gguf.part.json").exists()
+    assert not dest.exists()
+
+    # "Next process" (same URL): only the missing halves are requested again
+    server = RangeServer(data, port=server.httpd.server_port)
+    try:
+        fetch(server, dest)
+    finally:
+        server.close()
+    assert dest.read_bytes() == data
+    assert server.served == SIZE // 2
+    assert all(start % (SIZE // 4) for start, _ in server.ranges)
+
+
+def test_checksum_mismatch_discards_partial_file(tmp_path, data):
+    server = RangeServer(data)
+    dest = tmp_path / "model.gguf"
+    try:
+        with pytest.raises(ChecksumMismatchError):
+            fetch(server, dest, expected_sha256="0" * 64)
+    finally:
+        server.close()
+
+    assert not dest.exists()
+    assert not (tmp_path / "model.gguf.part").exists()
+    assert not (tmp_path / "model.gguf.part.json").exists()
+
+
+def test_concurrent_downloads_of_same_target(tmp_path, data):
+    """Startup download + admin job: the second one waits and reuses the finished file"""
+    server = RangeServer(data, delay=0.2)
+    dest = tmp_path / "model.gguf"
+    errors = []
+
+    def download():
+        try:
+            fetch(server, dest)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=download) for _ in range(2)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+    finally:
+        server.close()
+
+    assert not errors
+    assert dest.read_bytes() == data
+    assert server.served == SIZE  # Downloaded once, never truncated and restarted
@@ -0,0 +1,141 @@
+"""Generation slot release on client disconnect and request cancellation (fake llama.cpp model)
+
+Drives the chat path of rag.py/_complete: cancel_on_disconnect() around a streamed
+completion collected in a worker thread while holding the shared inference slot.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from generation import (
+    GenerationCancelled, cancel_on_disconnect, collect_completion, inference_slot, stream_local
+)
+
+TOKEN_DELAY = 0.01  # Seconds per fake token
+
+
+class FakeLlama:
+    """Stands in for llama_cpp.Llama: streams `tokens` chunks, TOKEN_DELAY apart"""
+
+    def __init__(self, tokens: int = 500):
+        self.tokens = tokens
+        self.generated = 0
+        self.closed = False
+        self.started = threading.Event()
+
+    def tokenize(self, data: bytes):
+        return data.split()
+
+    def __call__(self, prompt: str, stream: bool = False, **params):
+        assert stream
+        return self._stream()
+
+    def _stream(self):
+        self.started.set()
+        try:
+            for index in range(self.tokens):
+                time.sleep(TOKEN_DELAY)
+                self.generated += 1
+                finish_reason = "length" if index == self.tokens - 1 else None
+                yield {"choices": [{"text": f"t{index} ", "finish_reason": finish_reason}]}
+        finally:
+            self.closed = True
+
+
+class FakeRequest:
+    """Starlette Request stand-in: disconnected once `disconnect_when()` is true"""
+
+    def __init__(self, disconnect_when=lambda: False):
+        self.disconnect_when = disconnect_when
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnect_when()
+
+
+async def chat(request: FakeRequest, llm: FakeLlama) -> str:
+    """Same shape as main.chat -> rag._complete"""
+    async with cancel_on_disconnect(request) as cancel_token:
+        chunks = stream_local(llm, "Frage", cancel_token, max_tokens=llm.tokens)
+        output = await asyncio.to_thread(collect_completion, chunks, cancel_token)
+    return output["choices"][0]["text"]
+
+
+async def wait_until_free(timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while inference_slot.busy or inference_slot.waiting:
+        assert time.monotonic() < deadline, "inference slot still held"
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture(autouse=True)
+def free_slot():
+    assert not inference_slot.busy
+    yield
+    asyncio.run(wait_until_free())
+
+
+def test_disconnect_mid_stream_releases_slot():
+    async def scenario():
+        llm = FakeLlama()
+        request = FakeRequest(lambda: llm.generated >= 10)
+
+        with pytest.raises(GenerationCancelled):
+            await chat(request, llm)
+
+        assert llm.closed
+        assert llm.generated < llm.tokens
+        assert not inference_slot.busy
+
+        # The next request gets the slot right away and runs to completion
+        follower = FakeLlama(tokens=20)
+        text = await asyncio.wait_for(chat(FakeRequest(), follower), timeout=2.0)
+        assert text.split() == [f"t{i}" for i in range(20)]
+
+    asyncio.run(scenario())
+
+
+def test_disconnect_while_queued_gives_up_without_generating():
+    async def scenario():
+        holder = FakeLlama(tokens=100)
+        holding = asyncio.create_task(chat(FakeRequest(), holder))
+        await asyncio.to_thread(holder.started.wait, 2.0)
+
+        queued = FakeLlama()
+        gone = threading.Event()
+        waiting = asyncio.create_task(chat(FakeRequest(gone.is_set), queued))
+        while inference_slot.waiting == 0:
+            await asyncio.sleep(0.01)
+        gone.set()
+
+        with pytest.raises(GenerationCancelled):
+            await asyncio.wait_for(waiting, timeout=2.0)
+        assert not queued.started.is_set()
+        assert inference_slot.waiting == 0
+
+        # The request holding the slot is not affected
+        assert len((await holding).split()) == holder.tokens
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_request_task_stops_generation():
+    async def scenario():
+        llm = FakeLlama()
+        task = asyncio.create_task(chat(FakeRequest(), llm))
+        await asyncio.to_thread(llm.started.wait, 2.0)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # The worker thread notices the cancelled token before the next token
+        await wait_until_free()
+        assert llm.closed
+        assert llm.generated < llm.tokens
+
+        follower = FakeLlama(tokens=5)
+        await asyncio.wait_for(chat(FakeRequest(), follower), timeout=2.0)
+
+    asyncio.run(scenario())
@@ -0,0 +1,48 @@
+"""Model switch jobs against SQLite - one switch queued or running at a time"""
+import asyncio
+import threading
+
+import pytest
+
+from database import init_db
+from llm_models import DEFAULT_MODEL, FALLBACK_MODEL
+from model_jobs import DONE, QUEUED, ModelJobManager, SwitchInProgress
+
+
+def test_second_switch_is_refused_while_the_first_is_queued_or_running():
+    release = threading.Event()
+
+    def download(model_id, progress=None):
+        return True
+
+    def load(model_id):
+        release.wait(5)
+
+    async def on_success(model_id):
+        pass
+
+    async def scenario():
+        await init_db()
+        manager = ModelJobManager()
+        first = await manager.submit(DEFAULT_MODEL, "admin@example.com", download, load, on_success)
+        assert first["state"] == QUEUED
+        assert (await manager.active())["job_id"] == first["job_id"]  # Counts before it starts
+
+        # Same or other model, right after the first request
+        for model_id in (DEFAULT_MODEL, FALLBACK_MODEL):
+            with pytest.raises(SwitchInProgress) as refused:
+                await manager.submit(model_id, "admin@example.com", download, load, on_success)
+            assert refused.value.job["job_id"] == first["job_id"]
+
+        release.set()
+        while (await manager.get(first["job_id"]))["state"] != DONE:
+            await asyncio.sleep(0.01)
+        assert await manager.active() is None
+
+        # Finished - the next switch is accepted
+        second = await manager.submit(FALLBACK_MODEL, "admin@example.com", download, load, on_success)
+        assert second["job_id"] != first["job_id"]
+        while (await manager.get(second["job_id"]))["state"] != DONE:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
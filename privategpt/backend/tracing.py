@@ -0,0 +1,254 @@
+"""Request Tracing - Leichtgewichtige Spans pro Request, Server-Timing Header und OTLP/JSON Export
+
+Jeder HTTP-Request bekommt einen Root-Span (TracingMiddleware). Stufen darin öffnen
+Kind-Spans mit `with span("retrieval"):` - auch in asyncio.to_thread(), weil der
+Kontext mitkopiert wird. Am Ende:
+- `Server-Timing: embedding;dur=41.2, retrieval;dur=12.9, generation;dur=68120.4, total;dur=68290.1`
+- optional Export als OpenTelemetry OTLP/JSON (Datei mit einer Zeile pro Trace und/oder Collector)
+"""
+import contextvars
+import json
+import logging
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import httpx
+
+from config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Requests that are not traced (probes and scrapes would flood the export)
+UNTRACED_PATHS = {"/ready", "/health", "/metrics"}
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+class Span:
+    """One timed operation (fields map 1:1 to OTLP spans)"""
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict, kind: int = 1):
+        self.trace = trace
+        self.kind = kind  # OTLP SpanKind: 1 = internal, 2 = server
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def end(self, end_ns: Optional[int] = None):
+        self.end_ns = end_ns or time.time_ns()
+        self.trace.add(self)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_otlp(self) -> Dict:
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class Trace:
+    """All finished spans of one request (appended from request and worker threads)"""
+
+    def __init__(self, service_name: str, trace_id: Optional[str] = None, remote_parent_id: Optional[str] = None):
+        self.service_name = service_name
+        self.trace_id = trace_id or secrets.token_hex(16)
+        self.remote_parent_id = remote_parent_id  # From an incoming traceparent header
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def server_timing(self, root: Span) -> str:
+        """Server-Timing header: summed duration per stage name, plus total"""
+        with self._lock:
+            spans = [s for s in self.spans if s is not root]
+
+        durations: Dict[str, float] = {}
+        for span in spans:
+            durations[span.name] = durations.get(span.name, 0.0) + span.duration_ms
+
+        entries = [f"{name};dur={ms:.1f}" for name, ms in durations.items()]
+        entries.append(f"total;dur={root.duration_ms:.1f}")
+        return ", ".join(entries)
+
+    def to_otlp(self) -> Dict:
+        """ExportTraceServiceRequest in OTLP/JSON encoding"""
+        with self._lock:
+            spans = [span.to_otlp() for span in self.spans]
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    _otlp_attribute("service.name", self.service_name),
+                    _otlp_attribute("process.pid", os.getpid()),
+                ]},
+                "scopeSpans": [{"scope": {"name": "privategpt.tracing"}, "spans": spans}],
+            }]
+        }
+
+
+def _otlp_attribute(key: str, value) -> Dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+# Current span of this request (copied into asyncio tasks and to_thread workers)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def traceparent_headers() -> Dict[str, str]:
+    """W3C traceparent for outgoing calls (continues the trace in the inference service)"""
+    current = _current_span.get()
+    if current is None:
+        return {}
+    return {"traceparent": f"00-{current.trace.trace_id}-{current.span_id}-01"}
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Child span of the current request; no-op outside a traced request"""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(parent.trace, name, parent.span_id, attributes)
+    reset_token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(reset_token)
+        child.end()
+
+
+def record_span(name: str, start_ns: int, end_ns: int, **attributes):
+    """Add an already measured span (e.g. prompt eval inside a token stream)"""
+    parent = _current_span.get()
+    if parent is None:
+        return
+    child = Span(parent.trace, name, parent.span_id, attributes)
+    child.start_ns = start_ns
+    child.end(end_ns)
+
+
+class _Exporter:
+    """Background export so requests never wait on disk or the collector"""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=1000)
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.Client] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.trace_export_path or settings.trace_otlp_endpoint)
+
+    def submit(self, trace: Trace):
+        if not self.enabled:
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+            self._thread.start()
+        try:
+            self._queue.put_nowait(trace.to_otlp())
+        except queue.Full:
+            logger.warning("⚠️ [TRACING] Export queue full, dropping trace")
+
+    def _run(self):
+        while True:
+            payload = self._queue.get()
+            try:
+                if settings.trace_export_path:
+                    with open(settings.trace_export_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(payload) + "\n")
+                if settings.trace_otlp_endpoint:
+                    if self._client is None:
+                        self._client = httpx.Client(timeout=5.0)
+                    self._client.post(settings.trace_otlp_endpoint, json=payload).raise_for_status()
+            except Exception as e:
+                logger.warning("⚠️ [TRACING] Export failed: %s", e, exc_info=True)
+
+
+_exporter = _Exporter()
+
+
+class TracingMiddleware:
+    """ASGI middleware: root span per request, Server-Timing + traceparent on the response"""
+
+    def __init__(self, app, service_name: str = "privategpt-api"):
+        self.app = app
+        self.service_name = service_name
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in UNTRACED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        match = _TRACEPARENT.match(headers.get(b"traceparent", b"").decode("latin-1"))
+        trace = Trace(self.service_name, *match.groups()) if match else Trace(self.service_name)
+
+        root = Span(trace, f"{scope['method']} {scope['path']}", trace.remote_parent_id, {
+            "http.method": scope["method"],
+            "http.target": scope["path"],
+        }, kind=2)
+        reset_token = _current_span.set(root)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                root.set_attribute("http.status_code", message["status"])
+                response_headers = list(message.get("headers", []))
+                response_headers.append((b"server-timing", trace.server_timing(root).encode("latin-1")))
+                response_headers.append((b"traceparent", f"00-{trace.trace_id}-{root.span_id}-01".encode("latin-1")))
+                response_headers.append((b"timing-allow-origin", settings.frontend_url.encode("latin-1")))
+                message = {**message, "headers": response_headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except BaseException as e:
+            root.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(reset_token)
+            root.end()
+            _exporter.submit(trace)
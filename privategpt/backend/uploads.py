@@ -0,0 +1,175 @@
+"""Streaming Upload - multipart-Body in Chunks direkt auf die Platte, ohne Spooling durch UploadFile
+
+Parst request.stream() inkrementell (python-multipart, wie Starlette intern), schreibt das
+Datei-Feld in eine Temp-Datei im Zielordner (Schreiben + SHA-256 im Thread, der Event-Loop
+blockiert nicht), bricht ab sobald die Maximalgröße überschritten ist und benennt die Datei
+erst nach vollständigem Empfang atomar um - halbe Uploads liegen nie unter dem Zielnamen.
+"""
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from multipart.multipart import MultipartParser, parse_options_header
+from starlette.requests import Request
+
+MULTIPART_OVERHEAD = 16 * 1024  # Boundaries and part headers on top of the file itself
+
+# Request body for the OpenAPI docs (the endpoint reads the body itself, FastAPI can't infer it)
+OPENAPI_FILE_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+
+class UploadRejected(Exception):
+    """Upload refused (too large, wrong type, no file) - message is the HTTP detail"""
+
+
+@dataclass
+class StoredUpload:
+    filename: str
+    path: str
+    size: int
+    sha256: str
+    content_type: Optional[str]
+
+
+def safe_filename(filename: str) -> str:
+    """Last path component only - the name ends up in the upload directory"""
+    name = os.path.basename(filename.replace("\\", "/")).strip()
+    if name in ("", ".", ".."):
+        raise UploadRejected("Invalid file name")
+    return name
+
+
+class _TempFile:
+    """Hidden temp file next to the target (same filesystem, so os.replace is atomic)"""
+
+    def __init__(self, directory: str):
+        fd, self.path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+        self._file = os.fdopen(fd, "wb")
+        self._hash = hashlib.sha256()
+
+    def write(self, chunks: List[bytes]):
+        for chunk in chunks:
+            self._hash.update(chunk)
+            self._file.write(chunk)
+
+    def commit(self, target: str) -> str:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.path, target)
+        return self._hash.hexdigest()
+
+    def discard(self):
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+async def receive_upload(
+    request: Request,
+    directory: str,
+    max_bytes: int,
+    check_filename: Callable[[str], None],
+    field: str = "file",
+) -> StoredUpload:
+    """Stream the file field of a multipart request into directory
+
+    check_filename runs on the name before any data is written (raise to refuse it).
+    Raises UploadRejected if the body exceeds max_bytes or contains no file.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise UploadRejected("Expected multipart/form-data")
+
+    # Declared length already too large: refuse before reading a single byte
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD:
+        raise UploadRejected(f"File too large. Max size: {max_bytes // (1024 * 1024)}MB")
+
+    # Parser callbacks only record events, they are handled after each write()
+    events: List[tuple] = []
+    header: Dict[str, bytes] = {"field": b"", "value": b""}
+    headers: Dict[bytes, bytes] = {}
+
+    def on_header_field(data: bytes, start: int, end: int):
+        header["field"] += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int):
+        header["value"] += data[start:end]
+
+    def on_header_end():
+        headers[header["field"].lower()] = header["value"]
+        header["field"] = header["value"] = b""
+
+    def on_headers_finished():
+        events.append(("headers", dict(headers)))
+        headers.clear()
+
+    callbacks = {
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": lambda data, start, end: events.append(("data", data[start:end])),
+        "on_part_end": lambda: events.append(("end", None)),
+    }
+    parser = MultipartParser(params[b"boundary"], callbacks)
+
+    temp: Optional[_TempFile] = None
+    filename = part_content_type = None
+    receiving = done = False
+    size = 0
+
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            pending = []
+            for kind, value in events:
+                if kind == "headers" and not done:
+                    _, options = parse_options_header(value.get(b"content-disposition", b""))
+                    if options.get(b"name") == field.encode() and b"filename" in options:
+                        filename = safe_filename(options[b"filename"].decode("utf-8", "replace"))
+                        check_filename(filename)
+                        part_content_type = value.get(b"content-type", b"").decode("latin-1") or None
+                        temp = await asyncio.to_thread(_TempFile, directory)
+                        receiving = True
+                elif kind == "data" and receiving:
+                    size += len(value)
+                    if size > max_bytes:
+                        raise UploadRejected(f"File too large. Max size: {max_bytes // (1024 * 1024)}MB")
+                    pending.append(value)
+                elif kind == "end" and receiving:
+                    receiving, done = False, True
+            events.clear()
+            if pending:
+                await asyncio.to_thread(temp.write, pending)
+
+        parser.finalize()
+        if not done:
+            raise UploadRejected("No file uploaded")
+
+        path = os.path.join(directory, filename)
+        sha256 = await asyncio.to_thread(temp.commit, path)
+    except BaseException:
+        # Too large, refused, client gone or cancelled - no partial file stays behind
+        if temp is not None:
+            temp.discard()
+        raise
+
+    return StoredUpload(filename=filename, path=path, size=size, sha256=sha256, content_type=part_content_type)
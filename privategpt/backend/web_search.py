@@ -1,12 +1,15 @@
 """Web Search Integration mit SearxNG und DuckDuckGo Fallback für Hybrid RAG"""
 import httpx
+import logging
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 import re
 import json
 from config import get_settings
+from tracing import span
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 class SearxNGSearch:
@@ -26,6 +29,23 @@ class SearxNGSearch:
         """
         Suche mit SearxNG
 
+        Args:
+            query: Suchanfrage
+            max_results: Max. Anzahl Ergebnisse (default: aus config)
+
+        Returns:
+            Liste von Suchergebnissen mit title, url, content
+        """
+        with span("web_search.searxng", query=query) as search_span:
+            results = await self._search(query, max_results)
+            if search_span is not None:
+                search_span.set_attribute("results", len(results))
+            return results
+
+    async def _search(self, query: str, max_results: int = None) -> List[Dict[str, str]]:
+        """
+        Suche mit SearxNG (Instanzen der Reihe nach, dann DuckDuckGo)
+
         Args:
             query: Suchanfrage
             max_results: Max. Anzahl Ergebnisse (default: aus config)
@@ -35,7 +55,7 @@ class SearxNGSearch:
         """
         max_results = max_results or self.max_results
 
-        print(f"🌐 [WEB SEARCH] Searching SearxNG for: {query}")
+        logger.debug("🌐 [WEB SEARCH] Searching SearxNG for: %s", query)
 
         # Liste von öffentlichen SearxNG-Instanzen (Fallback)
         searxng_instances = [
@@ -55,51 +75,53 @@ class SearxNGSearch:
         # Versuche verschiedene Instanzen
         for instance_url in searxng_instances:
             try:
-                async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                    print(f"   🔄 Trying: {instance_url}")
-
-                    # SearxNG API Anfrage
-                    response = await client.get(
-                        f"{instance_url}/search",
-                        params={
-                            "q": query,
-                            "format": "json",
-                            "language": "de",  # Deutsche Ergebnisse bevorzugen
-                            "time_range": "year",  # Aktuelle Ergebnisse
-                            "safesearch": "1"
-                        },
-                        headers=headers
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-
-                    results = []
-                    for item in data.get("results", [])[:max_results]:
-                        result = {
-                            "title": item.get("title", ""),
-                            "url": item.get("url", ""),
-                            "content": item.get("content", ""),
-                            "engine": item.get("engine", "unknown")
-                        }
-                        results.append(result)
-                        print(f"   📄 {result['title'][:60]}... ({result['engine']})")
-
-                    print(f"✅ [WEB SEARCH] Found {len(results)} results from {instance_url}")
-                    return results
+                with span("web_search.instance", url=instance_url):
+                    async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+                        logger.debug("🔄 Trying: %s", instance_url)
+
+                        # SearxNG API Anfrage
+                        response = await client.get(
+                            f"{instance_url}/search",
+                            params={
+                                "q": query,
+                                "format": "json",
+                                "language": "de",  # Deutsche Ergebnisse bevorzugen
+                                "time_range": "year",  # Aktuelle Ergebnisse
+                                "safesearch": "1"
+                            },
+                            headers=headers
+                        )
+                        response.raise_for_status()
+                        data = response.json()
+
+                        results = []
+                        for item in data.get("results", [])[:max_results]:
+                            result = {
+                                "title": item.get("title", ""),
+                                "url": item.get("url", ""),
+                                "content": item.get("content", ""),
+                                "engine": item.get("engine", "unknown")
+                            }
+                            results.append(result)
+                            logger.debug("📄 %s... (%s)", result['title'][:60], result['engine'])
+
+                        logger.info("✅ [WEB SEARCH] Found %d results from %s", len(results), instance_url)
+                        return results
 
             except httpx.TimeoutException:
-                print(f"   ⏱️ Timeout at {instance_url}, trying next...")
+                logger.warning("⏱️ Timeout at %s, trying next...", instance_url)
                 continue
             except httpx.HTTPStatusError as e:
-                print(f"   ❌ HTTP {e.response.status_code} at {instance_url}, trying next...")
+                logger.warning("❌ HTTP %s at %s, trying next...", e.response.status_code, instance_url)
                 continue
             except Exception as e:
-                print(f"   ❌ Error at {instance_url}: {e}, trying next...")
+                logger.warning("❌ Error at %s: %s, trying next...", instance_url, e)
                 continue
 
         # Alle SearxNG-Instanzen fehlgeschlagen - Fallback zu DuckDuckGo
-        print(f"❌ [WEB SEARCH] All SearxNG instances failed, trying DuckDuckGo fallback...")
-        return await self._duckduckgo_fallback(query, max_results)
+        logger.warning("❌ [WEB SEARCH] All SearxNG instances failed, trying DuckDuckGo fallback...")
+        with span("web_search.duckduckgo"):
+            return await self._duckduckgo_fallback(query, max_results)
 
     async def _duckduckgo_fallback(self, query: str, max_results: int) -> List[Dict[str, str]]:
         """
@@ -113,7 +135,7 @@ class SearxNGSearch:
             Liste von Suchergebnissen
         """
         try:
-            print(f"   🦆 Trying DuckDuckGo HTML search...")
+            logger.debug("🦆 Trying DuckDuckGo HTML search...")
 
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -159,21 +181,21 @@ class SearxNGSearch:
                                 "engine": "duckduckgo"
                             }
                             results.append(result)
-                            print(f"   📄 {title[:60]}... (duckduckgo)")
+                            logger.debug("📄 %s... (duckduckgo)", title[:60])
 
                     except Exception as e:
-                        print(f"   ⚠️ Error parsing result: {e}")
+                        logger.debug("⚠️ Error parsing result: %s", e)
                         continue
 
                 if results:
-                    print(f"✅ [WEB SEARCH] Found {len(results)} results from DuckDuckGo")
+                    logger.info("✅ [WEB SEARCH] Found %d results from DuckDuckGo", len(results))
                     return results
                 else:
-                    print(f"❌ [WEB SEARCH] No results from DuckDuckGo")
+                    logger.warning("❌ [WEB SEARCH] No results from DuckDuckGo")
                     return []
 
         except Exception as e:
-            print(f"❌ [WEB SEARCH] DuckDuckGo fallback failed: {e}")
+            logger.error("❌ [WEB SEARCH] DuckDuckGo fallback failed: %s", e)
             return []
 
     def format_search_results(self, results: List[Dict[str, str]]) -> str:
@@ -305,18 +327,18 @@ class AnswerQualityDetector:
 
         # Entscheidungslogik
         if uncertainty_detected:
-            print(f"🔍 [QUALITY] Uncertainty detected in answer → Web-Search triggered")
+            logger.info("🔍 [QUALITY] Uncertainty detected in answer → Web-Search triggered")
             return True
 
         if temporal_query:
-            print(f"🔍 [QUALITY] Temporal query detected → Web-Search triggered")
+            logger.info("🔍 [QUALITY] Temporal query detected → Web-Search triggered")
             return True
 
         if no_context and too_short:
-            print(f"🔍 [QUALITY] No documents and short answer → Web-Search triggered")
+            logger.info("🔍 [QUALITY] No documents and short answer → Web-Search triggered")
             return True
 
-        print(f"🔍 [QUALITY] No Web-Search needed (has_docs={has_documents}, len={len(answer)})")
+        logger.debug("🔍 [QUALITY] No Web-Search needed (has_docs=%s, len=%d)", has_documents, len(answer))
         return False
 
     @staticmethod
@@ -58,8 +58,12 @@ export const documentAPI = {
 };
 
 // Chat API
+export const MESSAGES_PAGE_SIZE = 50;
+
 export const chatAPI = {
-  getMessages: (assistantId) => api.get(`/assistants/${assistantId}/messages`),
+  // Neueste Seite; ältere Seiten mit beforeId = id der ersten geladenen Nachricht (Header X-Has-More)
+  getMessages: (assistantId, { beforeId, limit = MESSAGES_PAGE_SIZE } = {}) =>
+    api.get(`/assistants/${assistantId}/messages`, { params: { before_id: beforeId, limit } }),
   sendMessage: (assistantId, content) =>
     api.post(`/assistants/${assistantId}/chat`, { content }),
   deleteMessages: (assistantId) => api.delete(`/assistants/${assistantId}/messages`),
@@ -76,6 +80,7 @@ export const adminAPI = {
   getModels: () => api.get('/admin/llm/models'),
   getCurrentModel: () => api.get('/admin/llm/current'),
   setModel: (modelId) => api.post('/admin/llm/set', { model_id: modelId }),
+  getJob: (jobId) => api.get(`/admin/llm/jobs/${jobId}`),
 };
 
 export default api;
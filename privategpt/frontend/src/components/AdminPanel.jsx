@@ -11,6 +11,7 @@ function AdminPanel({ onClose }) {
   const [switching, setSwitching] = useState(false);
   const [error, setError] = useState('');
   const [success, setSuccess] = useState('');
+  const [job, setJob] = useState(null);
 
   useEffect(() => {
     loadData();
@@ -44,6 +45,20 @@ function AdminPanel({ onClose }) {
       setSuccess('');
 
       const response = await adminAPI.setModel(modelId);
+      let jobStatus = response.data;
+      setJob(jobStatus);
+
+      // Poll the background job until the new model is loaded (or failed)
+      while (jobStatus.state !== 'done' && jobStatus.state !== 'failed') {
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        const jobRes = await adminAPI.getJob(jobStatus.job_id);
+        jobStatus = jobRes.data;
+        setJob(jobStatus);
+      }
+
+      if (jobStatus.state === 'failed') {
+        throw new Error(jobStatus.error);
+      }
 
       setSuccess(response.data.message);
 
@@ -59,6 +74,7 @@ function AdminPanel({ onClose }) {
       setError(`${t('common.error')}: ${errorMessage}`);
     } finally {
       setSwitching(false);
+      setJob(null);
     }
   };
 
@@ -142,6 +158,19 @@ function AdminPanel({ onClose }) {
                 </div>
               </div>
 
+              {/* Model switch progress */}
+              {job && (
+                <div className="admin-success">
+                  {job.model_name}: {t(`admin.jobState.${job.state}`, job.state)}
+                  {job.state === 'downloading' && job.percent !== null && (
+                    <> - {job.percent}%
+                      {job.throughput_mb_s !== null && ` (${job.throughput_mb_s} MB/s)`}
+                      {job.eta_seconds !== null && `, ${t('admin.eta', 'Restzeit')}: ${Math.ceil(job.eta_seconds)}s`}
+                    </>
+                  )}
+                </div>
+              )}
+
               {/* Messages */}
               {error && <div className="admin-error">{error}</div>}
               {success && <div className="admin-success">{success}</div>}
@@ -35,9 +35,9 @@ const resources = {
       // Dashboard - Documents
       documents: {
         title: 'Dokumente',
-        upload: 'PDF hochladen',
+        upload: 'Dokument hochladen',
         uploading: 'Lädt hoch...',
-        empty: 'Noch keine PDFs hochgeladen',
+        empty: 'Noch keine Dokumente hochgeladen',
         deleteAll: 'Alle Daten löschen',
         confirmDelete: 'Dokument "{{filename}}" wirklich löschen?',
         confirmDeleteAll: 'Wirklich ALLE Daten löschen? (inkl. Dokumente & Chats)',
@@ -50,6 +50,7 @@ const resources = {
         send: 'Senden',
         deleteChat: 'Chat-Verlauf löschen',
         confirmDeleteChat: 'Chat-Verlauf wirklich löschen? (Dokumente bleiben erhalten)',
+        loadOlder: 'Ältere Nachrichten laden',
 
         // Chat Export
         export: {
@@ -64,7 +65,7 @@ const resources = {
           intro: 'Ich kann:',
           feature1: 'Deine Dokumente analysieren',
           feature2: 'Im Internet recherchieren (ohne Deine Daten preiszugeben)',
-          feature3: 'Fragen basierend auf hochgeladenen PDFs beantworten',
+          feature3: 'Fragen basierend auf hochgeladenen Dokumenten beantworten (PDF, Word, Text, Markdown)',
           privacy: 'Deine Daten bleiben privat und werden nicht an Dritte weitergegeben.',
         },
 
@@ -81,7 +82,7 @@ const resources = {
 
       // Toasts
       toast: {
-        uploadSuccess: 'PDF erfolgreich hochgeladen & verarbeitet!',
+        uploadSuccess: 'Dokument erfolgreich hochgeladen & verarbeitet!',
         uploadError: 'Upload fehlgeschlagen',
         deleteSuccess: 'Dokument erfolgreich gelöscht',
         deleteError: 'Löschen fehlgeschlagen',
@@ -100,6 +101,15 @@ const resources = {
         active: 'Aktiv',
         select: 'Auswählen',
         switching: 'Wechsle...',
+        jobState: {
+          queued: 'In Warteschlange',
+          downloading: 'Download',
+          verifying: 'Prüfe Checksumme',
+          loading: 'Lade Modell',
+          done: 'Fertig',
+          failed: 'Fehlgeschlagen',
+        },
+        eta: 'Restzeit',
         parameters: 'Parameter',
         quality: {
           low: 'Niedrig',
@@ -158,9 +168,9 @@ const resources = {
       // Dashboard - Documents
       documents: {
         title: 'Documents',
-        upload: 'Upload PDF',
+        upload: 'Upload document',
         uploading: 'Uploading...',
-        empty: 'No PDFs uploaded yet',
+        empty: 'No documents uploaded yet',
         deleteAll: 'Delete All Data',
         confirmDelete: 'Really delete document "{{filename}}"?',
         confirmDeleteAll: 'Really delete ALL data? (including documents & chats)',
@@ -173,6 +183,7 @@ const resources = {
         send: 'Send',
         deleteChat: 'Delete Chat History',
         confirmDeleteChat: 'Really delete chat history? (Documents remain)',
+        loadOlder: 'Load older messages',
 
         // Chat Export
         export: {
@@ -187,7 +198,7 @@ const resources = {
           intro: 'I can:',
           feature1: 'Analyze your documents',
           feature2: 'Research on the internet (without exposing your data)',
-          feature3: 'Answer questions based on uploaded PDFs',
+          feature3: 'Answer questions based on uploaded documents (PDF, Word, text, Markdown)',
           privacy: 'Your data remains private and is not shared with third parties.',
         },
 
@@ -204,7 +215,7 @@ const resources = {
 
       // Toasts
       toast: {
-        uploadSuccess: 'PDF successfully uploaded & processed!',
+        uploadSuccess: 'Document successfully uploaded & processed!',
         uploadError: 'Upload failed',
         deleteSuccess: 'Document successfully deleted',
         deleteError: 'Delete failed',
@@ -223,6 +234,15 @@ const resources = {
         active: 'Active',
         select: 'Select',
         switching: 'Switching...',
+        jobState: {
+          queued: 'Queued',
+          downloading: 'Downloading',
+          verifying: 'Verifying checksum',
+          loading: 'Loading model',
+          done: 'Done',
+          failed: 'Failed',
+        },
+        eta: 'Remaining',
         parameters: 'Parameters',
         quality: {
           low: 'Low',
@@ -281,9 +301,9 @@ const resources = {
       // Dashboard - Documents
       documents: {
         title: 'Documentos',
-        upload: 'Subir PDF',
+        upload: 'Subir documento',
         uploading: 'Subiendo...',
-        empty: 'Aún no se han subido PDFs',
+        empty: 'Aún no se han subido documentos',
         deleteAll: 'Eliminar Todos los Datos',
         confirmDelete: '¿Realmente eliminar el documento "{{filename}}"?',
         confirmDeleteAll: '¿Realmente eliminar TODOS los datos? (incluidos documentos y chats)',
@@ -296,6 +316,7 @@ const resources = {
         send: 'Enviar',
         deleteChat: 'Eliminar Historial de Chat',
         confirmDeleteChat: '¿Realmente eliminar el historial de chat? (Los documentos permanecen)',
+        loadOlder: 'Cargar mensajes anteriores',
 
         // Chat Export
         export: {
@@ -310,7 +331,7 @@ const resources = {
           intro: 'Puedo:',
           feature1: 'Analizar tus documentos',
           feature2: 'Investigar en internet (sin exponer tus datos)',
-          feature3: 'Responder preguntas basadas en PDFs subidos',
+          feature3: 'Responder preguntas basadas en documentos subidos (PDF, Word, texto, Markdown)',
           privacy: 'Tus datos permanecen privados y no se comparten con terceros.',
         },
 
@@ -327,7 +348,7 @@ const resources = {
 
       // Toasts
       toast: {
-        uploadSuccess: '¡PDF subido y procesado con éxito!',
+        uploadSuccess: '¡Documento subido y procesado con éxito!',
         uploadError: 'Error al subir',
         deleteSuccess: 'Documento eliminado con éxito',
         deleteError: 'Error al eliminar',
@@ -346,6 +367,15 @@ const resources = {
         active: 'Activo',
         select: 'Seleccionar',
         switching: 'Cambiando...',
+        jobState: {
+          queued: 'En cola',
+          downloading: 'Descargando',
+          verifying: 'Verificando checksum',
+          loading: 'Cargando modelo',
+          done: 'Listo',
+          failed: 'Fallido',
+        },
+        eta: 'Tiempo restante',
         parameters: 'Parámetros',
         quality: {
           low: 'Bajo',
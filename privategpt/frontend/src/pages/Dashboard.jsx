@@ -17,6 +17,8 @@ export default function Dashboard() {
   const [assistant, setAssistant] = useState(null);
   const [documents, setDocuments] = useState([]);
   const [messages, setMessages] = useState([]);
+  const [hasOlderMessages, setHasOlderMessages] = useState(false);
+  const [loadingOlder, setLoadingOlder] = useState(false);
   const [inputMessage, setInputMessage] = useState('');
   const [uploading, setUploading] = useState(false);
   const [sending, setSending] = useState(false);
@@ -26,10 +28,11 @@ export default function Dashboard() {
   const [toasts, setToasts] = useState([]); // Toast notifications
   const messagesEndRef = useRef(null);
 
-  // Auto-Scroll
+  // Auto-Scroll (nur bei neuen Nachrichten, nicht beim Nachladen älterer)
+  const lastMessageId = messages[messages.length - 1]?.id;
   useEffect(() => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
-  }, [messages]);
+  }, [lastMessageId]);
 
   // Check if user is admin
   useEffect(() => {
@@ -84,10 +87,27 @@ export default function Dashboard() {
     setDocuments(res.data || []);
   };
 
+  // Lädt die neueste Seite; bereits geladene ältere Nachrichten bleiben erhalten
   const loadMessages = async () => {
     if (!assistant) return;
     const res = await chatAPI.getMessages(assistant.id);
-    setMessages(res.data || []);
+    const page = res.data || [];
+    setMessages(prev => page.length === 0 ? [] : [...prev.filter(m => m.id < page[0].id), ...page]);
+    setHasOlderMessages(prev => prev || res.headers['x-has-more'] === 'true');
+  };
+
+  const loadOlderMessages = async () => {
+    if (!assistant || messages.length === 0 || loadingOlder) return;
+    setLoadingOlder(true);
+    try {
+      const res = await chatAPI.getMessages(assistant.id, { beforeId: messages[0].id });
+      setMessages(prev => [...(res.data || []), ...prev]);
+      setHasOlderMessages(res.headers['x-has-more'] === 'true');
+    } catch (err) {
+      console.error('Loading older messages failed:', err);
+    } finally {
+      setLoadingOlder(false);
+    }
   };
 
   const handleFileUpload = async (e) => {
@@ -132,6 +152,7 @@ export default function Dashboard() {
     try {
       await chatAPI.deleteMessages(assistant.id);
       setMessages([]);
+      setHasOlderMessages(false);
       addToast(t('toast.chatDeleted'), 'success');
     } catch (err) {
       addToast(err.response?.data?.detail || t('toast.deleteError'), 'error');
@@ -219,7 +240,7 @@ export default function Dashboard() {
             <label className="upload-btn">
               <Upload size={18} />
               {uploading ? t('documents.uploading') : t('documents.upload')}
-              <input type="file" accept=".pdf" onChange={handleFileUpload} hidden disabled={uploading} />
+              <input type="file" accept=".pdf,.docx,.txt,.md,.markdown" onChange={handleFileUpload} hidden disabled={uploading} />
             </label>
           </section>
 
@@ -283,13 +304,19 @@ export default function Dashboard() {
                 </div>
               </div>
             ) : (
-              messages.map(msg => (
+              <>
+              {hasOlderMessages && (
+                <button onClick={loadOlderMessages} className="btn-load-older" disabled={loadingOlder}>
+                  {loadingOlder ? <Loader2 size={16} className="spinner" /> : t('chat.loadOlder')}
+                </button>
+              )}
+              {messages.map(msg => (
                 <div key={msg.id} className={`message ${msg.role}`}>
                   <div className="message-avatar">{msg.role === 'user' ? t('chat.you', 'Du') : 'AI'}</div>
                   <div className="message-content">
                     <div className="message-text">{msg.content}</div>
                     <div className="message-footer">
-                      {msg.role === 'assistant' && msg.source_type && (
+                      {msg.role === 'assistant' && msg.source_type && msg.source_type !== 'error' && (
                         <div className={`source-badge source-${msg.source_type}`}>
                           {msg.source_type === 'llm_only' && `🤖 ${t('chat.sources.llmOnly')}`}
                           {msg.source_type === 'rag' && `📄 ${msg.source_details || t('chat.sources.rag', { count: 1 })}`}
@@ -302,7 +329,8 @@ export default function Dashboard() {
                     </div>
                   </div>
                 </div>
-              ))
+              ))}
+              </>
             )}
             {sending && (
               <div className="message assistant">